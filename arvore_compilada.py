@@ -0,0 +1,94 @@
+import hashlib
+
+import numpy as np
+
+# Até este número de linhas a árvore é percorrida em Python puro, que é mais
+# rápido que as operações vetorizadas para filas de prontos pequenas.
+LIMITE_AVALIACAO_ESCALAR = 16
+
+
+class ArvoreCompilada:
+    """
+    Árvore de decisão achatada em arrays de nós, avaliada só com NumPy.
+
+    Dá a mesma probabilidade da classe "escolhida" que o DecisionTreeClassifier
+    de origem, sem depender de scikit-learn nem de pandas durante a simulação. Nas folhas,
+    esquerda e direita apontam para o próprio nó, então percorrer a árvore por
+    'profundidade' níveis sempre termina numa folha.
+    """
+    def __init__(self, feature, limiar, esquerda, direita, probabilidade, profundidade):
+        self.feature = np.asarray(feature, dtype=np.intp)
+        self.limiar = np.asarray(limiar, dtype=np.float64)
+        self.esquerda = np.asarray(esquerda, dtype=np.intp)
+        self.direita = np.asarray(direita, dtype=np.intp)
+        self.probabilidade = np.asarray(probabilidade, dtype=np.float64)
+        self.profundidade = int(profundidade)
+        # Cópias em listas para o caminho escalar
+        self._nos = list(zip(self.feature.tolist(), self.limiar.tolist(),
+                             self.esquerda.tolist(), self.direita.tolist()))
+        self._probabilidades = self.probabilidade.tolist()
+
+    @classmethod
+    def de_modelo(cls, modelo, classe_escolhida=1):
+        """Compila um DecisionTreeClassifier já treinado."""
+        arvore = modelo.tree_
+        folhas = arvore.children_left < 0
+        nos = np.arange(arvore.node_count)
+
+        valores = arvore.value[:, 0, :]
+        coluna = list(modelo.classes_).index(classe_escolhida)
+        probabilidade = valores[:, coluna] / valores.sum(axis=1)
+
+        return cls(
+            feature=np.where(folhas, 0, arvore.feature),
+            limiar=arvore.threshold,
+            esquerda=np.where(folhas, nos, arvore.children_left),
+            direita=np.where(folhas, nos, arvore.children_right),
+            probabilidade=probabilidade,
+            profundidade=arvore.max_depth,
+        )
+
+    @classmethod
+    def carregar(cls, caminho):
+        with np.load(caminho) as dados:
+            return cls(**{nome: dados[nome] for nome in dados.files})
+
+    def salvar(self, caminho):
+        np.savez(caminho, feature=self.feature, limiar=self.limiar, esquerda=self.esquerda,
+                 direita=self.direita, probabilidade=self.probabilidade,
+                 profundidade=self.profundidade)
+
+    def impressao_digital(self):
+        """Hash estável (SHA-256) dos nós da árvore: duas árvores com o mesmo hash decidem igual."""
+        hash_ = hashlib.sha256(str(self.profundidade).encode())
+        for array in (self.feature, self.limiar, self.esquerda, self.direita, self.probabilidade):
+            # Tipos fixos: intp tem 4 bytes em plataformas de 32 bits
+            hash_.update(np.asarray(array, dtype="<i8" if array.dtype.kind == "i" else "<f8").tobytes())
+        return hash_.hexdigest()
+
+    def probabilidade_escolhida(self, x):
+        """Probabilidade da classe "escolhida" para cada linha de x."""
+        # O scikit-learn compara as entradas convertidas para float32
+        x = np.asarray(x, dtype=np.float32)
+        if len(x) <= LIMITE_AVALIACAO_ESCALAR:
+            return np.array([self._avaliar_linha(linha) for linha in x.tolist()])
+
+        linhas = np.arange(len(x))
+        no = np.zeros(len(x), dtype=np.intp)
+        for _ in range(self.profundidade):
+            vai_esquerda = x[linhas, self.feature[no]] <= self.limiar[no]
+            no = np.where(vai_esquerda, self.esquerda[no], self.direita[no])
+        return self.probabilidade[no]
+
+    def _avaliar_linha(self, linha):
+        nos = self._nos
+        no = 0
+        for _ in range(self.profundidade):
+            feature, limiar, esquerda, direita = nos[no]
+            no = esquerda if linha[feature] <= limiar else direita
+        return self._probabilidades[no]
+
+    def predict_proba(self, x):
+        """Mesma interface do scikit-learn: colunas [não escolhida, escolhida]."""
+        p = self.probabilidade_escolhida(x)
+        return np.column_stack([1 - p, p])
@@ -0,0 +1,233 @@
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+
+from tarefa import TabelaTarefas
+from escalonador import (
+    EscalonadorFIFO,
+    EscalonadorSJF,
+    EscalonadorRoundRobin,
+    EscalonadorPrioridade,
+    EscalonadorEDF,
+    EscalonadorSRTF,
+    EscalonadorRoundRobinDinamico
+)
+from escalonadorML import EscalonadorML
+from experimentos import criar_escalonador, usa_quantum
+
+ESCALONADORES = {
+    "FIFO": EscalonadorFIFO,
+    "SJF": EscalonadorSJF,
+    "RoundRobin": EscalonadorRoundRobin,
+    "Prioridade": EscalonadorPrioridade,
+    "EDF": EscalonadorEDF,
+    "SRTF": EscalonadorSRTF,
+    "RoundRobinDinamico": EscalonadorRoundRobinDinamico,
+    "ML": EscalonadorML,
+}
+
+TAMANHOS = [10, 100, 1_000, 10_000, 100_000, 1_000_000]
+
+# Densidade de chegadas como utilização média do processador (trabalho que chega
+# por segundo). Acima de 1 a fila de prontos cresce durante toda a simulação.
+CARGAS = {"baixa": 0.5, "alta": 0.95, "sobrecarga": 2.0}
+
+QUANTA = [1, 4]
+
+# A FilaML pontua toda a fila de prontos a cada decisão (custo linear no tamanho
+# da fila); acima disso, sob sobrecarga, a execução leva horas e o tamanho é pulado
+TAMANHO_MAXIMO = {EscalonadorML: 10_000}
+
+# Variação percentual tolerada no tempo antes de acusar regressão
+LIMITE_REGRESSAO = 0.2
+# Medidas mais curtas que isso são dominadas por ruído e não são comparadas
+TEMPO_MINIMO_COMPARACAO = 0.005
+
+
+# --- Cargas de trabalho ---
+
+def gerar_carga_benchmark(semente, n_tarefas, carga):
+    """
+    Carga sintética reprodutível: durações de 3 a 8 s (como na interface),
+    chegadas de Poisson com taxa ajustada para a utilização 'carga' e deadlines
+    relativos com folga de 5 a 20 s.
+    """
+    rng = np.random.default_rng(semente)
+    duracao = rng.integers(3, 9, n_tarefas)
+    intervalo_medio = duracao.mean() / carga
+    tempo_chegada = np.round(np.cumsum(rng.exponential(intervalo_medio, n_tarefas)) - intervalo_medio, 2)
+    tempo_chegada = np.maximum(tempo_chegada, 0)
+    deadline = duracao + rng.integers(5, 21, n_tarefas)
+    prioridade = rng.integers(1, 6, n_tarefas)
+    return TabelaTarefas(None, duracao, prioridade, tempo_chegada, deadline)
+
+
+# --- Medição ---
+
+def medir(classe, tarefas, quantum=None, modelo=None, repeticoes=1, medir_memoria=True):
+    """
+    Tempo de parede (melhor de 'repeticoes'), pico de memória e decisões por
+    segundo de uma configuração. O pico de memória vem de uma execução extra sob
+    tracemalloc, que deixa a simulação mais lenta e não entra na medida de tempo.
+    """
+    escalonador = criar_escalonador(classe, tarefas, quantum, modelo)
+    escalonador.rastreio = None
+
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        escalonador.escalonar()
+        tempos.append(time.perf_counter() - inicio)
+    tempo = min(tempos)
+
+    memoria_pico = None
+    if medir_memoria:
+        tracemalloc.start()
+        try:
+            escalonador.escalonar()
+            memoria_pico = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    return {
+        "tempo_s": tempo,
+        "memoria_pico_bytes": memoria_pico,
+        "decisoes": escalonador.decisoes,
+        "decisoes_por_s": escalonador.decisoes / tempo if tempo > 0 else None,
+    }
+
+
+def executar_benchmark(classes, tamanhos=TAMANHOS, cargas=CARGAS, quanta=QUANTA, semente=0,
+                       modelo=None, repeticoes=1, medir_memoria=True):
+    """
+    Mede cada escalonador em cada tamanho e densidade de chegada (e em cada
+    quantum, para os que usam um) e devolve as linhas de resultado (gerador).
+    Todas as classes recebem a mesma carga para um mesmo tamanho e densidade.
+    """
+    for n_tarefas in tamanhos:
+        for nome_carga, carga in cargas.items():
+            tarefas = gerar_carga_benchmark(semente, n_tarefas, carga)
+            for classe in classes:
+                if n_tarefas > TAMANHO_MAXIMO.get(classe, n_tarefas):
+                    continue
+                for quantum in (quanta if usa_quantum(classe) else [None]):
+                    resultado = medir(classe, tarefas, quantum, modelo, repeticoes, medir_memoria)
+                    yield {
+                        "escalonador": classe.__name__,
+                        "n_tarefas": n_tarefas,
+                        "carga": nome_carga,
+                        "quantum": quantum,
+                        **resultado,
+                    }
+
+
+# --- Baselines e regressões ---
+
+def _chave(resultado):
+    return (resultado["escalonador"], resultado["n_tarefas"], resultado["carga"], resultado["quantum"])
+
+
+def salvar_baseline(resultados, caminho, semente=0):
+    dados = {
+        "metadados": {
+            "data": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "plataforma": platform.platform(),
+            "processador": platform.processor() or platform.machine(),
+            "semente": semente,
+        },
+        "resultados": resultados,
+    }
+    with open(caminho, "w") as arquivo:
+        json.dump(dados, arquivo, indent=2)
+
+
+def carregar_baseline(caminho):
+    with open(caminho) as arquivo:
+        return json.load(arquivo)["resultados"]
+
+
+def comparar(resultados, baseline, limite=LIMITE_REGRESSAO):
+    """
+    Compara os tempos com uma baseline e devolve as regressões, como tuplas
+    (resultado, tempo_baseline, variacao), onde variacao = tempo / baseline - 1.
+    Configurações ausentes da baseline são ignoradas.
+    """
+    referencia = {_chave(r): r["tempo_s"] for r in baseline}
+    regressoes = []
+    for resultado in resultados:
+        tempo_base = referencia.get(_chave(resultado))
+        if tempo_base is None or max(tempo_base, resultado["tempo_s"]) < TEMPO_MINIMO_COMPARACAO:
+            continue
+        variacao = resultado["tempo_s"] / tempo_base - 1
+        if variacao > limite:
+            regressoes.append((resultado, tempo_base, variacao))
+    return regressoes
+
+
+def _formatar(resultado):
+    memoria = resultado["memoria_pico_bytes"]
+    quantum = "-" if resultado["quantum"] is None else resultado["quantum"]
+    taxa = resultado["decisoes_por_s"]
+    return (
+        f"{resultado['escalonador']:<31} n={resultado['n_tarefas']:<8} carga={resultado['carga']:<10} "
+        f"q={quantum:<3} {resultado['tempo_s']:9.4f}s "
+        f"{'-' if memoria is None else f'{memoria / 2**20:.1f} MiB':>10} "
+        f"{'-' if taxa is None else f'{taxa:,.0f}':>12} dec/s"
+    )
+
+
+# --- Linha de comando ---
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Benchmark dos escalonadores com cargas sintéticas.")
+    parser.add_argument("--escalonadores", nargs="+", choices=list(ESCALONADORES), default=list(ESCALONADORES))
+    parser.add_argument("--tamanhos", nargs="+", type=int, default=TAMANHOS)
+    parser.add_argument("--cargas", nargs="+", choices=list(CARGAS), default=list(CARGAS))
+    parser.add_argument("--quanta", nargs="+", type=float, default=QUANTA)
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--repeticoes", type=int, default=1, help="Execuções por configuração (vale a mais rápida)")
+    parser.add_argument("--sem-memoria", action="store_true", help="Não mede o pico de memória (mais rápido)")
+    parser.add_argument("--saida", help="Grava os resultados como baseline JSON")
+    parser.add_argument("--baseline", help="Baseline JSON para detectar regressões")
+    parser.add_argument("--limite", type=float, default=LIMITE_REGRESSAO,
+                        help="Lentidão tolerada em relação à baseline (0.2 = 20%%)")
+    args = parser.parse_args(argumentos)
+
+    classes = [ESCALONADORES[nome] for nome in args.escalonadores]
+    modelo = None
+    if EscalonadorML in classes:
+        from cache_modelos import CacheModelos
+        modelo = CacheModelos().obter()
+
+    resultados = []
+    for resultado in executar_benchmark(classes, args.tamanhos, {c: CARGAS[c] for c in args.cargas},
+                                        args.quanta, args.semente, modelo, args.repeticoes,
+                                        not args.sem_memoria):
+        print(_formatar(resultado), flush=True)
+        resultados.append(resultado)
+
+    if args.saida:
+        salvar_baseline(resultados, args.saida, args.semente)
+        print(f"\nBaseline salva em: {args.saida}")
+
+    if args.baseline:
+        regressoes = comparar(resultados, carregar_baseline(args.baseline), args.limite)
+        if regressoes:
+            print(f"\n--- {len(regressoes)} regressão(ões) acima de {args.limite:.0%} ---")
+            for resultado, tempo_base, variacao in regressoes:
+                print(f"{_formatar(resultado)}  (baseline {tempo_base:.4f}s, +{variacao:.0%})")
+            return 1
+        print(f"\nNenhuma regressão acima de {args.limite:.0%} em relação a {args.baseline}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,165 @@
+import os
+from array import array
+
+import numpy as np
+
+# Um burst de execução: identificador estável da tarefa, intervalo e processador (28 bytes)
+DTYPE_BURST = np.dtype([("tarefa", "i8"), ("inicio", "f8"), ("fim", "f8"), ("processador", "i4")])
+
+
+class RegistroBursts:
+    """
+    Log único e só de acréscimo com os bursts de uma simulação, em arrays
+    tipados (array.array) em vez de uma lista de tuplas por tarefa.
+
+    Bursts consecutivos da mesma tarefa no mesmo processador (um termina onde
+    o outro começa) são unidos: o último burst de cada processador fica aberto
+    até chegar um que não o continue, e só então entra no log.
+
+    Com 'arquivo', as entradas fechadas são descarregadas a cada 'bloco'
+    bursts num arquivo binário (DTYPE_BURST) e a leitura usa np.memmap, então
+    a memória não cresce com a duração da simulação. Os arrays lidos deixam
+    de valer quando resetar() recomeça o arquivo.
+
+    bifurcar() cria um registro que continua deste sem copiar o que já foi
+    registrado: os bursts fechados viram blocos somente leitura compartilhados.
+    """
+    def __init__(self, arquivo=None, bloco=1 << 16):
+        self.arquivo = arquivo
+        self.bloco = bloco
+        self.resetar()
+
+    def resetar(self):
+        self._tarefa = array("q")
+        self._inicio = array("d")
+        self._fim = array("d")
+        self._processador = array("i")
+        self._abertos = {}  # processador -> [tarefa, inicio, fim] do último burst
+        self._descarregados = 0
+        self._blocos = ()  # Bursts herdados de bifurcar(), somente leitura e anteriores aos demais
+        if self.arquivo is not None:
+            open(self.arquivo, "wb").close()
+
+    def registrar(self, tarefa, inicio, fim, processador=0):
+        aberto = self._abertos.get(processador)
+        if aberto is not None:
+            if aberto[0] == tarefa and aberto[2] == inicio:
+                aberto[2] = fim
+                return
+            self._fechar(processador, aberto)
+        self._abertos[processador] = [tarefa, inicio, fim]
+
+    def _fechar(self, processador, burst):
+        tarefa, inicio, fim = burst
+        self._tarefa.append(tarefa)
+        self._inicio.append(inicio)
+        self._fim.append(fim)
+        self._processador.append(processador)
+        if self.arquivo is not None and len(self._tarefa) >= self.bloco:
+            self._descarregar()
+
+    def concluir(self):
+        """Fecha os bursts abertos (fim da simulação) e descarrega o que falta no arquivo."""
+        for processador, burst in sorted(self._abertos.items()):
+            self._fechar(processador, burst)
+        self._abertos.clear()
+        if self.arquivo is not None:
+            self._descarregar()
+
+    def _em_memoria(self):
+        linhas = np.empty(len(self._tarefa), dtype=DTYPE_BURST)
+        for nome, coluna in (("tarefa", self._tarefa), ("inicio", self._inicio), ("fim", self._fim),
+                             ("processador", self._processador)):
+            linhas[nome] = np.frombuffer(coluna, dtype=linhas.dtype[nome]) if len(coluna) else []
+        return linhas
+
+    def _descarregar(self):
+        if not len(self._tarefa):
+            return
+        with open(self.arquivo, "ab") as arquivo:
+            self._em_memoria().tofile(arquivo)
+        self._descarregados += len(self._tarefa)
+        for coluna in (self._tarefa, self._inicio, self._fim, self._processador):
+            del coluna[:]
+
+    def restaurar(self, linhas):
+        """Recomeça o registro só com os bursts de 'linhas' (DTYPE_BURST, já fechados), sem copiá-los."""
+        self.resetar()
+        if len(linhas):
+            linhas = linhas.view()
+            linhas.setflags(write=False)
+            self._blocos = (linhas,)
+
+    def bifurcar(self):
+        """
+        Novo registro (em memória) que continua deste: os dois compartilham os
+        bursts fechados até aqui e acrescentam os seguintes cada um por si. Com
+        arquivo, o bloco compartilhado é lido dele e deixa de valer no resetar().
+        """
+        blocos = self._blocos
+        if self.arquivo is None:
+            if len(self._tarefa):
+                # Este registro também passa a ler o bloco, em vez de manter os arrays
+                bloco = self._em_memoria()
+                bloco.setflags(write=False)
+                self._blocos = blocos = blocos + (bloco,)
+                for coluna in (self._tarefa, self._inicio, self._fim, self._processador):
+                    del coluna[:]
+        else:
+            self._descarregar()
+            if self._descarregados:
+                blocos = blocos + (
+                    np.memmap(self.arquivo, dtype=DTYPE_BURST, mode="r", shape=(self._descarregados,)),
+                )
+        novo = RegistroBursts(bloco=self.bloco)
+        novo._blocos = blocos
+        novo._abertos = {processador: list(burst) for processador, burst in self._abertos.items()}
+        return novo
+
+    def __len__(self):
+        herdados = sum(len(bloco) for bloco in self._blocos)
+        return herdados + self._descarregados + len(self._tarefa) + len(self._abertos)
+
+    # --- Leitura ---
+
+    def bursts(self):
+        """Array estruturado (DTYPE_BURST) com todos os bursts, inclusive os ainda abertos."""
+        partes = list(self._blocos)
+        if self._descarregados:
+            partes.append(np.memmap(self.arquivo, dtype=DTYPE_BURST, mode="r", shape=(self._descarregados,)))
+        if len(self._tarefa):
+            partes.append(self._em_memoria())
+        if self._abertos:
+            partes.append(np.array(
+                [(t, i, f, p) for p, (t, i, f) in sorted(self._abertos.items())], dtype=DTYPE_BURST
+            ))
+        if len(partes) == 1:
+            return partes[0]
+        return np.concatenate(partes) if partes else np.empty(0, dtype=DTYPE_BURST)
+
+    def da_tarefa(self, tarefa):
+        """Lista de (inicio, fim) dos bursts da tarefa com o identificador dado, em ordem."""
+        linhas = self.bursts()
+        linhas = linhas[linhas["tarefa"] == tarefa]
+        linhas = linhas[np.argsort(linhas["inicio"], kind="stable")]
+        return list(zip(linhas["inicio"].tolist(), linhas["fim"].tolist()))
+
+    def por_tarefa(self, n_tarefas):
+        """Lista, para cada identificador 0..n_tarefas-1, um array (k, 2) com (inicio, fim) de cada burst."""
+        linhas = self.bursts()
+        linhas = linhas[np.lexsort((linhas["inicio"], linhas["tarefa"]))]
+        limites = np.searchsorted(linhas["tarefa"], np.arange(n_tarefas + 1))
+        pares = np.column_stack([linhas["inicio"], linhas["fim"]])
+        return [pares[limites[i]:limites[i + 1]] for i in range(n_tarefas)]
+
+    def por_processador(self, processadores):
+        """Lista, para cada processador, um array (k, 3) com (inicio, fim, tarefa) de cada burst."""
+        linhas = self.bursts()
+        linhas = linhas[np.lexsort((linhas["inicio"], linhas["processador"]))]
+        limites = np.searchsorted(linhas["processador"], np.arange(processadores + 1))
+        trios = np.column_stack([linhas["inicio"], linhas["fim"], linhas["tarefa"]])
+        return [trios[limites[p]:limites[p + 1]] for p in range(processadores)]
+
+    def __repr__(self):
+        destino = "em memória" if self.arquivo is None else f"em {os.path.basename(self.arquivo)}"
+        return f"RegistroBursts({len(self)} bursts, {destino})"
@@ -0,0 +1,80 @@
+import os
+
+from arvore_compilada import ArvoreCompilada
+from chaves import chave_conteudo, completar_parametros
+
+DIRETORIO_PADRAO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "modelos_cache")
+
+# Parâmetros de geração do dataset, hiperparâmetros da árvore e semente do RNG
+PARAMETROS_PADRAO = {
+    "n_amostras": 1000,
+    "n_tarefas_por_amostra": 5,
+    "max_depth": 6,
+    "class_weight": "balanced",
+    "semente": 0,
+}
+
+# Versão do formato salvo e do procedimento de treino (ver chaves.py)
+VERSAO_FORMATO = 2
+
+
+class CacheModelos:
+    """
+    Guarda em disco as árvores treinadas (já compiladas), indexadas pelos
+    parâmetros que as produziram. Mantém no máximo 'max_entradas' arquivos,
+    descartando os usados há mais tempo.
+    """
+    def __init__(self, diretorio=DIRETORIO_PADRAO, max_entradas=8):
+        self.diretorio = diretorio
+        self.max_entradas = max_entradas
+        self._carregados = {}
+
+    @staticmethod
+    def parametros(**parametros):
+        parametros = completar_parametros(PARAMETROS_PADRAO, parametros, "modelo")
+        if parametros["semente"] is None:
+            # Sem semente o treino não se repete e a chave não identificaria o modelo
+            raise ValueError("O cache de modelos exige uma semente fixa (parâmetro 'semente').")
+        return parametros
+
+    def chave(self, **parametros):
+        return chave_conteudo(VERSAO_FORMATO, self.parametros(**parametros))
+
+    def _caminho(self, chave):
+        return os.path.join(self.diretorio, f"modelo_{chave}.npz")
+
+    def obter(self, **parametros):
+        """Devolve o modelo dos parâmetros, carregando do disco ou treinando se preciso."""
+        chave = self.chave(**parametros)
+        if chave in self._carregados:
+            return self._carregados[chave]
+
+        caminho = self._caminho(chave)
+        if os.path.exists(caminho):
+            modelo = ArvoreCompilada.carregar(caminho)
+            os.utime(caminho)  # Marca como usado recentemente
+            self._carregados[chave] = modelo
+            return modelo
+        return self.treinar(**parametros)
+
+    def treinar(self, **parametros):
+        """Treina (mesmo se já houver modelo salvo), compila e grava no cache."""
+        from escalonadorML import treinar_modelo_decision_tree
+
+        modelo = ArvoreCompilada.de_modelo(treinar_modelo_decision_tree(**self.parametros(**parametros)))
+        chave = self.chave(**parametros)
+        os.makedirs(self.diretorio, exist_ok=True)
+        modelo.salvar(self._caminho(chave))
+        self._carregados[chave] = modelo
+        self._despejar()
+        return modelo
+
+    def _despejar(self):
+        arquivos = [
+            os.path.join(self.diretorio, nome) for nome in os.listdir(self.diretorio)
+            if nome.startswith("modelo_") and nome.endswith(".npz")
+        ]
+        arquivos.sort(key=os.path.getmtime, reverse=True)
+        for caminho in arquivos[self.max_entradas:]:
+            os.remove(caminho)
+            self._carregados.pop(os.path.basename(caminho)[len("modelo_"):-len(".npz")], None)
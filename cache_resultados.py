@@ -0,0 +1,167 @@
+import numbers
+import os
+from collections import OrderedDict
+
+import numpy as np
+
+from chaves import chave_conteudo
+
+DIRETORIO_PADRAO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "resultados_cache")
+
+# Atributos do escalonador que entram na chave, além da classe (ausentes contam como None)
+PARAMETROS_CHAVE = (
+    "quantum", "quantum_base", "processadores", "particionado",
+    "SOBRECARGA_BASE", "SOBRECARGA_MIGRACAO", "PREEMPTIVO", "SOBRECARGA_A_CADA_DESPACHO",
+    "niveis_prioridade", "envelhecimento",
+)
+
+# Versão do formato salvo e do comportamento das simulações (ver chaves.py)
+VERSAO_FORMATO = 1
+
+
+def _normalizar(valor):
+    # 2, 2.0 e np.int64(2) produzem a mesma simulação e devem dar a mesma chave
+    if isinstance(valor, numbers.Real) and not isinstance(valor, bool):
+        return float(valor)
+    return valor
+
+
+class CacheResultados:
+    """
+    Cache de resultados de simulação endereçado pelo conteúdo. A chave é o
+    hash das tarefas (ver TabelaTarefas.impressao_digital), da classe e dos
+    parâmetros do escalonador (PARAMETROS_CHAVE) e da impressão digital do
+    modelo; o valor, a escala completa e as métricas (ver
+    EscalonadorCAV.exportar_resultado).
+
+    Há duas camadas: uma LRU em memória com até 'max_memoria' resultados e uma
+    em disco, com arquivos .npz que somam no máximo 'max_bytes_disco' bytes
+    (os usados há mais tempo são descartados primeiro). O diretório pode ser
+    compartilhado por vários processos.
+    """
+    def __init__(self, diretorio=DIRETORIO_PADRAO, max_memoria=16, max_bytes_disco=256 << 20):
+        self.diretorio = diretorio
+        self.max_memoria = max_memoria
+        self.max_bytes_disco = max_bytes_disco
+        self._memoria = OrderedDict()
+        self.acertos = 0
+        self.falhas = 0
+
+    def chave(self, escalonador):
+        """
+        Chave do resultado que o escalonador produziria, ou None se ele não puder
+        ser guardado: tarefas de um fluxo ou online, controle de admissão ou
+        modelo sem impressao_digital().
+        """
+        tarefas = escalonador.tarefas_para_escalonar.impressao_digital()
+        if tarefas is None or escalonador.controle_admissao is not None:
+            return None
+        modelo = getattr(escalonador, "modelo", None)
+        if modelo is not None and not hasattr(modelo, "impressao_digital"):
+            return None
+        classe = escalonador.__class__
+        return chave_conteudo(VERSAO_FORMATO, {
+            "tarefas": tarefas,
+            "classe": f"{classe.__module__}.{classe.__qualname__}",
+            "parametros": {nome: _normalizar(getattr(escalonador, nome, None)) for nome in PARAMETROS_CHAVE},
+            "modelo": None if modelo is None else modelo.impressao_digital(),
+        }, tamanho=32)
+
+    def _caminho(self, chave):
+        return os.path.join(self.diretorio, f"resultado_{chave}.npz")
+
+    def obter(self, chave):
+        """Resultado guardado com a chave (da memória ou do disco), ou None."""
+        resultado = self._memoria.get(chave)
+        if resultado is not None:
+            self._memoria.move_to_end(chave)
+            return resultado
+
+        caminho = self._caminho(chave)
+        try:
+            with np.load(caminho) as dados:
+                resultado = {nome: dados[nome] for nome in dados.files}
+            os.utime(caminho)  # Marca como usado recentemente
+        except FileNotFoundError:
+            return None  # Inclusive se outro processo o descartou agora
+        self._guardar_em_memoria(chave, resultado)
+        return resultado
+
+    def guardar(self, chave, resultado):
+        """Guarda o resultado nas duas camadas."""
+        self._guardar_em_memoria(chave, resultado)
+        os.makedirs(self.diretorio, exist_ok=True)
+        caminho = self._caminho(chave)
+        temporario = f"{caminho}.{os.getpid()}.tmp"
+        with open(temporario, "wb") as arquivo:
+            np.savez(arquivo, **resultado)
+        os.replace(temporario, caminho)  # Leitores nunca veem um arquivo pela metade
+        self._despejar()
+
+    def _guardar_em_memoria(self, chave, resultado):
+        self._memoria[chave] = resultado
+        self._memoria.move_to_end(chave)
+        while len(self._memoria) > self.max_memoria:
+            self._memoria.popitem(last=False)
+
+    def _despejar(self):
+        arquivos = []
+        for entrada in os.scandir(self.diretorio):
+            if entrada.name.startswith("resultado_") and entrada.name.endswith(".npz"):
+                try:
+                    estado = entrada.stat()
+                except FileNotFoundError:
+                    continue
+                arquivos.append((estado.st_mtime, estado.st_size, entrada.path))
+        arquivos.sort(reverse=True)
+        total = 0
+        for _, tamanho, caminho in arquivos:
+            total += tamanho
+            if total > self.max_bytes_disco:
+                try:
+                    os.remove(caminho)
+                except FileNotFoundError:
+                    pass
+
+    def escalonar(self, escalonador):
+        """
+        Como escalonador.escalonar(), mas reaproveitando o resultado guardado
+        para a mesma configuração, se houver. Devolve True se veio do cache.
+        """
+        chave = self.chave(escalonador)
+        resultado = None if chave is None else self.obter(chave)
+        if resultado is not None:
+            escalonador.importar_resultado(resultado)
+            self.acertos += 1
+            return True
+        escalonador.escalonar()
+        self.falhas += 1
+        if chave is not None:
+            self.guardar(chave, escalonador.exportar_resultado())
+        return False
+
+    def limpar(self):
+        """Esvazia as duas camadas."""
+        self._memoria.clear()
+        if os.path.isdir(self.diretorio):
+            for nome in os.listdir(self.diretorio):
+                if nome.startswith("resultado_") and nome.endswith(".npz"):
+                    os.remove(os.path.join(self.diretorio, nome))
+
+
+# --- Exemplo de execução ---
+if __name__ == "__main__":
+    import time
+
+    from benchmark import gerar_carga_benchmark
+    from escalonador import EscalonadorEDF
+
+    tarefas = gerar_carga_benchmark(semente=0, n_tarefas=100_000, carga=0.95)
+    cache = CacheResultados()
+    for rodada in ("primeira", "segunda"):
+        escalonador = EscalonadorEDF(tarefas, quantum=2)
+        escalonador.rastreio = None
+        inicio = time.perf_counter()
+        do_cache = cache.escalonar(escalonador)
+        print(f"{rodada} execução: {time.perf_counter() - inicio:.3f}s (do cache: {do_cache}), "
+              f"{escalonador.deadlines_perdidos} deadlines perdidos")
@@ -0,0 +1,141 @@
+import csv
+import json
+import os
+
+import numpy as np
+
+from tarefa import RegistroTarefa
+
+# Colunas de um trace (CSV) ou chaves de cada linha (JSONL); só duracao é obrigatória
+CAMPOS_TRACE = RegistroTarefa._fields
+
+
+# --- Leitura de traces gravados ---
+
+def _registro(campos):
+    """Converte os campos lidos de um trace (texto, no CSV) num RegistroTarefa."""
+    deadline = campos.get("deadline")
+    return RegistroTarefa(
+        nome=campos.get("nome") or None,
+        duracao=float(campos["duracao"]),
+        prioridade=int(campos.get("prioridade") or 1),
+        tempo_chegada=float(campos.get("tempo_chegada") or 0),
+        deadline=None if deadline in (None, "") else float(deadline),
+    )
+
+
+def ler_trace_csv(caminho):
+    """Lê um trace CSV (cabeçalho com os CAMPOS_TRACE) uma tarefa por vez."""
+    with open(caminho, newline="") as arquivo:
+        for linha in csv.DictReader(arquivo):
+            yield _registro(linha)
+
+
+def ler_trace_jsonl(caminho):
+    """Lê um trace JSONL (um objeto por linha, com os CAMPOS_TRACE) uma tarefa por vez."""
+    with open(caminho) as arquivo:
+        for linha in arquivo:
+            if linha.strip():
+                yield _registro(json.loads(linha))
+
+
+LEITORES = {"csv": ler_trace_csv, "jsonl": ler_trace_jsonl}
+
+
+class Trace:
+    """
+    Trace gravado em disco, usado como fluxo de tarefas de um escalonador. Cada
+    iteração reabre o arquivo, então a mesma fonte serve para várias simulações.
+    As tarefas devem estar em ordem de chegada.
+    """
+    def __init__(self, caminho, formato=None):
+        formato = formato or os.path.splitext(caminho)[1].lstrip(".").lower()
+        if formato not in LEITORES:
+            raise ValueError(f"Formato de trace desconhecido: {formato!r} (use {tuple(LEITORES)})")
+        self.caminho = caminho
+        self.formato = formato
+
+    def __iter__(self):
+        return LEITORES[self.formato](self.caminho)
+
+
+def gravar_trace(registros, caminho, formato=None):
+    """Grava um fluxo de tarefas (ex.: uma CargaPoisson) como trace, sem materializá-lo."""
+    formato = formato or os.path.splitext(caminho)[1].lstrip(".").lower()
+    if formato not in LEITORES:
+        raise ValueError(f"Formato de trace desconhecido: {formato!r} (use {tuple(LEITORES)})")
+    with open(caminho, "w", newline="") as arquivo:
+        if formato == "csv":
+            writer = csv.writer(arquivo)
+            writer.writerow(CAMPOS_TRACE)
+            for registro in registros:
+                writer.writerow(["" if valor is None else valor for valor in registro])
+        else:
+            for registro in registros:
+                arquivo.write(json.dumps(registro._asdict()) + "\n")
+
+
+# --- Cargas sintéticas ---
+
+def _sortear(rng, distribuicao, n):
+    if callable(distribuicao):
+        return np.asarray(distribuicao(rng, n))
+    minimo, maximo = distribuicao
+    return rng.integers(minimo, maximo + 1, n)
+
+
+class CargaPoisson:
+    """
+    Fluxo sintético reprodutível no mesmo formato dos traces: chegadas de
+    Poisson com 'taxa' tarefas por segundo e deadlines relativos iguais à
+    duração mais uma folga sorteada.
+
+    Cada distribuição é um par (minimo, maximo), sorteado uniformemente entre
+    inteiros (inclusive), ou uma função (rng, n) -> array com n valores. Os
+    sorteios são feitos em blocos de 'bloco' tarefas; cada iteração recomeça da
+    semente e produz o mesmo fluxo. Com n_tarefas=None o fluxo não termina.
+    """
+    def __init__(self, taxa, n_tarefas=None, semente=0, duracao=(3, 8), folga_deadline=(5, 20),
+                 prioridade=(1, 5), bloco=4096):
+        if taxa <= 0:
+            raise ValueError("A taxa de chegada deve ser positiva.")
+        self.taxa = taxa
+        self.n_tarefas = n_tarefas
+        self.semente = semente
+        self.duracao = duracao
+        self.folga_deadline = folga_deadline
+        self.prioridade = prioridade
+        self.bloco = bloco
+
+    def __iter__(self):
+        rng = np.random.default_rng(self.semente)
+        tempo = 0.0
+        gerados = 0
+        while self.n_tarefas is None or gerados < self.n_tarefas:
+            n = self.bloco if self.n_tarefas is None else min(self.bloco, self.n_tarefas - gerados)
+            chegadas = tempo + np.cumsum(rng.exponential(1 / self.taxa, n))
+            duracoes = _sortear(rng, self.duracao, n)
+            deadlines = duracoes + _sortear(rng, self.folga_deadline, n)
+            prioridades = _sortear(rng, self.prioridade, n)
+            tempo = chegadas[-1].item()
+            gerados += n
+            for chegada, duracao, prioridade, deadline in zip(
+                chegadas.tolist(), duracoes.tolist(), prioridades.tolist(), deadlines.tolist()
+            ):
+                yield RegistroTarefa(None, duracao, prioridade, chegada, deadline)
+
+
+# --- Exemplo de execução ---
+if __name__ == "__main__":
+    from escalonador import EscalonadorEDF
+    from metricas import EscritorMetricas
+
+    carga = CargaPoisson(taxa=0.18, n_tarefas=1_000_000, semente=42)
+    gravar_trace(carga, "trace_exemplo.csv")
+
+    escalonador = EscalonadorEDF(Trace("trace_exemplo.csv"))
+    with EscritorMetricas("metricas_trace_exemplo", formato="colunar") as escritor:
+        escalonador.rastreio = escritor
+        escalonador.escalonar()
+    print(f"Deadlines perdidos: {escalonador.deadlines_perdidos}, "
+          f"linhas alocadas: {escalonador.tarefas_para_escalonar.capacidade}")
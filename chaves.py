@@ -0,0 +1,24 @@
+import hashlib
+import json
+
+# Chaves dos caches em disco (modelos, resultados, datasets do oráculo): o hash do
+# conteúdo que produz o artefato e da versão do formato de quem o grava. Cada
+# módulo mantém seu VERSAO_FORMATO e o incrementa quando o formato salvo ou o
+# procedimento que gera o artefato mudar; as entradas antigas deixam de ser achadas.
+
+
+def completar_parametros(padrao, parametros, descricao):
+    """
+    Parâmetros completos: 'parametros' sobre os valores de 'padrao'. Nomes fora
+    de 'padrao' levantam ValueError ('descricao' identifica o cache na mensagem).
+    """
+    desconhecidos = set(parametros) - set(padrao)
+    if desconhecidos:
+        raise ValueError(f"Parâmetros de {descricao} desconhecidos: {sorted(desconhecidos)}")
+    return {**padrao, **parametros}
+
+
+def chave_conteudo(versao, conteudo, tamanho=20):
+    """Hash (SHA-256, 'tamanho' caracteres hexadecimais) do dicionário 'conteudo' na versão de formato."""
+    serializado = json.dumps({"versao": versao, **conteudo}, sort_keys=True, default=repr)
+    return hashlib.sha256(serializado.encode()).hexdigest()[:tamanho]
@@ -0,0 +1,382 @@
+import math
+from collections import namedtuple
+
+import numpy as np
+
+from tarefa import TabelaTarefas, TabelaFluxo, TOLERANCIA_DEADLINE
+
+# Elementos de cada matriz de trabalho (instantes de início de janela x tarefas) das análises
+# O(n²): os blocos têm ORCAMENTO_ELEMENTOS // n linhas, então a memória não cresce com n
+ORCAMENTO_ELEMENTOS = 1 << 21
+# Tolerância para comparações de tempo em ponto flutuante: a mesma com que o simulador
+# decide se um deadline foi perdido, para que uma carga aceita aqui não perca por arredondamento
+EPSILON = TOLERANCIA_DEADLINE
+
+# Resultado do teste de demanda: folga mínima e a janela (inicio, fim) em que ela ocorre
+ResultadoDemanda = namedtuple("ResultadoDemanda", ["escalonavel", "folga", "intervalo"])
+
+
+# --- Parâmetros das tarefas ---
+
+def parametros(tarefas):
+    """
+    Arrays (chegada, duracao, deadline absoluto, prioridade) de uma TabelaTarefas
+    ou de uma sequência de TarefaCAV/RegistroTarefa. Como em
+    EscalonadorCAV.deadline_perdido, o deadline é relativo à chegada; tarefas
+    sem deadline recebem deadline absoluto infinito.
+    """
+    if isinstance(tarefas, TabelaTarefas) and not isinstance(tarefas, TabelaFluxo):
+        chegada, duracao, deadline, prioridade = (
+            tarefas.tempo_chegada, tarefas.duracao, tarefas.deadline, tarefas.prioridade
+        )
+    else:
+        tarefas = list(tarefas)
+        chegada = np.array([t.tempo_chegada for t in tarefas], dtype=np.float64)
+        duracao = np.array([t.duracao for t in tarefas], dtype=np.float64)
+        deadline = np.array([np.nan if t.deadline is None else t.deadline for t in tarefas], dtype=np.float64)
+        prioridade = np.array([t.prioridade for t in tarefas], dtype=np.int64)
+    chegada = np.asarray(chegada, dtype=np.float64)
+    deadline_absoluto = chegada + np.nan_to_num(np.asarray(deadline, dtype=np.float64), nan=np.inf)
+    return chegada, np.asarray(duracao, dtype=np.float64), deadline_absoluto, np.asarray(prioridade)
+
+
+# --- Limites de utilização (O(n)) ---
+
+def densidade(tarefas):
+    """Soma de duracao / deadline relativo (tarefas sem deadline não contam)."""
+    chegada, duracao, deadline, _ = parametros(tarefas)
+    return float(np.sum(duracao / (deadline - chegada)))
+
+
+def limite_liu_layland(n):
+    """Limite de Liu & Layland, n(2^(1/n) - 1), para prioridades fixas monotônicas no deadline."""
+    return n * (2 ** (1 / n) - 1) if n else 1.0
+
+
+def teste_utilizacao(tarefas, processadores=1, politica="edf"):
+    """
+    Testes rápidos que resolvem os casos fáceis sem a análise exata. Devolve
+    False se nenhum escalonador cumpre todos os deadlines (alguma tarefa não
+    cabe no próprio deadline, ou a carga excede a capacidade do horizonte),
+    True se a densidade garante os deadlines e None se o teste é inconclusivo.
+
+    'politica' = "edf" usa o limite de densidade do EDF global (GFB), que com um
+    processador é densidade <= 1; "prioridade" usa o limite de Liu & Layland e
+    só conclui True com um processador e prioridades monotônicas no deadline.
+    Os limites supõem execução preemptiva.
+    """
+    chegada, duracao, deadline, prioridade = parametros(tarefas)
+    if not len(duracao):
+        return True
+    relativo = deadline - chegada
+    if np.any(duracao > relativo + EPSILON):
+        return False
+    com_deadline = np.isfinite(deadline)
+    if np.any(com_deadline):
+        horizonte = deadline[com_deadline].max() - chegada[com_deadline].min()
+        if duracao[com_deadline].sum() > processadores * horizonte + EPSILON:
+            return False
+
+    densidades = duracao / relativo
+    if politica == "edf":
+        limite = processadores - (processadores - 1) * densidades.max()
+    elif politica == "prioridade":
+        if processadores != 1 or not _monotonica_no_deadline(prioridade, relativo):
+            return None
+        limite = limite_liu_layland(len(duracao))
+    else:
+        raise ValueError(f"Política desconhecida: {politica!r} (use 'edf' ou 'prioridade')")
+    return True if densidades.sum() <= limite + EPSILON else None
+
+
+def _monotonica_no_deadline(prioridade, relativo):
+    # Maior prioridade (menor número) nunca tem deadline relativo maior
+    ordem = np.lexsort((relativo, prioridade))
+    return bool(np.all(np.diff(relativo[ordem]) >= 0))
+
+
+# --- Teste de demanda do processador (EDF) ---
+
+def _janelas(chegada, duracao, deadline):
+    """
+    Percorre as janelas [t1, t2], com t1 numa chegada e t2 num deadline, em
+    blocos de valores de t1 (ver ORCAMENTO_ELEMENTOS). Gera (t1, demanda,
+    mascara, auxiliar): demanda[k, j] é o trabalho das tarefas que chegam em
+    t1[k] ou depois e vencem até o j-ésimo deadline (tarefas já ordenadas por
+    deadline); mascara e auxiliar são matrizes de trabalho do mesmo formato.
+    As três são reaproveitadas de um bloco para o outro.
+    """
+    inicios = np.unique(chegada)
+    linhas = min(max(1, ORCAMENTO_ELEMENTOS // max(len(chegada), 1)), len(inicios))
+    demanda_bloco = np.empty((linhas, len(chegada)))
+    auxiliar_bloco = np.empty_like(demanda_bloco)
+    mascara_bloco = np.empty(demanda_bloco.shape, dtype=bool)
+    for bloco in range(0, len(inicios), linhas):
+        t1 = inicios[bloco:bloco + linhas, None]
+        demanda, mascara = demanda_bloco[:len(t1)], mascara_bloco[:len(t1)]
+        np.greater_equal(chegada, t1, out=mascara)
+        np.multiply(mascara, duracao, out=demanda)
+        np.cumsum(demanda, axis=1, out=demanda)
+        yield t1, demanda, mascara, auxiliar_bloco[:len(t1)]
+
+
+def _ordenar_por_deadline(tarefas):
+    chegada, duracao, deadline, _ = parametros(tarefas)
+    ordem = np.argsort(deadline, kind="stable")
+    return chegada[ordem], duracao[ordem], deadline[ordem]
+
+
+def teste_demanda_edf(tarefas, processadores=1, quantum=None):
+    """
+    Teste de demanda do processador para EDF preemptivo com deadlines absolutos:
+    em toda janela [t1, t2] o trabalho que chega e vence dentro dela cabe em
+    processadores * (t2 - t1). Com um processador o teste é exato; com vários,
+    é só necessário.
+
+    Se o teste falha, nenhuma política cumpre todos os deadlines (o EDF é ótimo
+    num processador). Se passa, o EDF ideal cumpre, e ele é o
+    EscalonadorEDFPreemptivo do simulador; o EscalonadorEDF ordena a fila pelo
+    deadline relativo e só troca de tarefa ao fim do quantum, então ainda pode
+    perder deadlines quando as chegadas diferem.
+
+    Com 'quantum' (e um processador), cada janela soma o bloqueio de um trecho
+    não preemptivo de até 'quantum' de uma tarefa que chegou antes e vence
+    depois, e o teste passa a ser suficiente.
+    """
+    chegada, duracao, deadline = _ordenar_por_deadline(tarefas)
+    if not len(duracao):
+        return ResultadoDemanda(True, math.inf, None)
+
+    bloqueio_possivel = quantum is not None and processadores == 1
+    if bloqueio_possivel:
+        trecho = np.minimum(duracao, quantum)
+        # Primeiro índice com deadline estritamente maior que o da coluna j
+        seguinte = np.searchsorted(deadline, deadline, side="right")
+        sem_seguinte = seguinte == len(deadline)
+        seguinte = np.minimum(seguinte, len(deadline) - 1)
+
+    # Cada tarefa precisa caber sozinha entre a própria chegada e o deadline
+    folgas = deadline - chegada - duracao
+    j = int(np.argmin(folgas))
+    folga, intervalo = folgas[j].item(), (chegada[j].item(), deadline[j].item())
+
+    for t1, demanda, mascara, folgas in _janelas(chegada, duracao, deadline):
+        if bloqueio_possivel:
+            # Maior trecho, entre as que chegaram antes de t1, das tarefas que vencem depois da coluna j
+            np.less(chegada, t1, out=mascara)
+            np.multiply(mascara, trecho, out=folgas)
+            np.maximum.accumulate(folgas[:, ::-1], axis=1, out=folgas[:, ::-1])
+            demanda += np.take(folgas, seguinte, axis=1) * ~sem_seguinte
+        np.subtract(deadline, t1, out=folgas)
+        folgas *= processadores
+        folgas -= demanda
+        np.less(deadline, t1, out=mascara)
+        folgas[mascara] = np.inf
+        k, j = np.unravel_index(np.argmin(folgas), folgas.shape)
+        if folgas[k, j] < folga:
+            folga, intervalo = folgas[k, j].item(), (t1[k, 0].item(), deadline[j].item())
+    return ResultadoDemanda(folga >= -EPSILON, folga, intervalo)
+
+
+def processadores_minimos(tarefas):
+    """
+    Limite inferior do número de processadores com que algum escalonador cumpre
+    todos os deadlines: a maior razão demanda / (t2 - t1) entre as janelas.
+    None se alguma tarefa não cabe no próprio deadline com qualquer número.
+    """
+    chegada, duracao, deadline = _ordenar_por_deadline(tarefas)
+    if np.any(duracao > deadline - chegada + EPSILON):
+        return None
+    razao = 0.0
+    for t1, demanda, valida, razoes in _janelas(chegada, duracao, deadline):
+        # Janelas sem comprimento não contam; as de deadline infinito dão razão 0
+        np.subtract(deadline, t1, out=razoes)
+        np.greater(razoes, 0, out=valida)
+        np.divide(demanda, razoes, out=razoes, where=valida)
+        razoes[~valida] = 0.0
+        razao = max(razao, razoes.max().item())
+    return max(1, math.ceil(razao - EPSILON))
+
+
+# --- Análise de tempo de resposta (prioridades fixas) ---
+
+def tempos_resposta(tarefas, quantum=None):
+    """
+    Limite superior do tempo de resposta de cada tarefa com prioridades fixas
+    num processador (menor número = maior prioridade), na ordem das tarefas.
+
+    Cada tarefa sofre a interferência das tarefas de prioridade maior ou igual
+    cuja janela [chegada, chegada + resposta] cruza a sua, mais o bloqueio por
+    uma tarefa menos prioritária que já executava ao chegar: no máximo um
+    'quantum', como no EscalonadorPrioridade, ou a duração inteira dela com
+    quantum=None (o EscalonadorPrioridade não preemptivo).
+
+    A iteração de ponto fixo é feita para todas as tarefas de uma vez, com
+    somas acumuladas por nível de prioridade em vez de uma matriz tarefa x
+    tarefa: cada iteração custa O(n * níveis), mais O(n * níveis * trechos
+    distintos) no bloqueio. Com poucos níveis (como os 1 a 5 das cargas do
+    simulador) leva ~0,15-0,3 ms até algumas dezenas de tarefas (o custo fixo
+    das chamadas NumPy domina), ~1 ms com 100, 4-11 ms com 1000 e 40-70 ms
+    com 5000; com prioridades todas distintas o custo volta a ser quadrático.
+    """
+    chegada, duracao, _, prioridade = parametros(tarefas)
+    ordem = np.argsort(chegada, kind="stable")
+    chegada, duracao, prioridade = chegada[ordem], duracao[ordem], prioridade[ordem]
+    n = len(duracao)
+    if not n:
+        return duracao
+    _, nivel = np.unique(prioridade, return_inverse=True)
+    niveis = nivel.max() + 1
+    posicoes = np.arange(n)
+    base = nivel * (n + 1)  # Início da linha do nível de cada tarefa na matriz niveis x (n + 1) achatada
+
+    # acumulada[l, k]: soma das durações das tarefas 0..k-1 de nível <= l
+    acumulada = np.zeros((niveis, n + 1))
+    acumulada[nivel, posicoes + 1] = duracao
+    acumulada = acumulada.cumsum(axis=1).cumsum(axis=0)
+
+    # Trecho que uma tarefa menos prioritária executa sem ceder o processador
+    trecho = duracao if quantum is None else np.minimum(duracao, quantum)
+    # Uma tarefa só bloqueia as que chegam estritamente depois dela
+    primeira_bloqueada = np.searchsorted(chegada, chegada, side="right")
+    grupos = [(valor, trecho == valor) for valor in np.unique(trecho)]
+
+    def cobertura(de, ate, pesos, grupo=slice(None)):
+        # Soma, por nível e posição, dos pesos das tarefas cujo intervalo [de, ate) cobre a posição
+        indices = np.concatenate([base[grupo] + de, base[grupo] + ate])
+        soma = np.bincount(indices, np.concatenate([pesos, -pesos]), minlength=niveis * (n + 1))
+        return soma.reshape(niveis, n + 1)[:, :n].cumsum(axis=1)
+
+    resposta = duracao.copy()
+    while True:
+        # Tarefa i termina antes da chegada da tarefa 'ate[i]'
+        ate = np.searchsorted(chegada, chegada + resposta, side="left")
+        # Interferência das que chegam depois de i e antes do seu fim...
+        nova = duracao + acumulada[nivel, ate] - acumulada[nivel, posicoes + 1]
+        # ...e das anteriores ainda ativas: a tarefa j cruza as janelas das posições j+1..ate[j]-1
+        nova += cobertura(posicoes + 1, ate, duracao).cumsum(axis=0)[nivel, posicoes]
+        if niveis > 1:
+            bloqueio = np.zeros((niveis + 1, n))
+            for valor, grupo in grupos:  # Em ordem crescente: o maior trecho prevalece
+                grupo = grupo & (primeira_bloqueada < ate)
+                if grupo.any():
+                    pesos = np.ones(np.count_nonzero(grupo))
+                    bloqueio[:niveis][cobertura(primeira_bloqueada[grupo], ate[grupo], pesos, grupo) > 0.5] = valor
+            # Linha l: maior trecho entre os níveis >= l; a tarefa é bloqueada pelos níveis > o seu
+            bloqueio = np.maximum.accumulate(bloqueio[::-1], axis=0)[::-1]
+            nova += bloqueio[nivel + 1, posicoes]
+        # As respostas só crescem a cada iteração e são limitadas pela soma das durações
+        if np.array_equal(nova, resposta):
+            return resposta[np.argsort(ordem)]
+        resposta = nova
+
+
+def teste_prioridade_fixa(tarefas, quantum=None):
+    """True se o limite de tempos_resposta() garante todos os deadlines."""
+    chegada, _, deadline, _ = parametros(tarefas)
+    return bool(np.all(chegada + tempos_resposta(tarefas, quantum) <= deadline + EPSILON))
+
+
+# --- Controle de admissão ---
+
+def _cabem_no_prazo(tempo, restante, deadline, processadores, posicao):
+    """
+    Tarefas já presentes em 'tempo', com trabalho 'restante': o EDF cumpre os
+    deadlines da tarefa na 'posicao' e das que vencem depois dela? Exato com
+    um processador; com vários, só descarta os casos sem solução.
+    """
+    ordem = np.argsort(deadline, kind="stable")
+    conclusao = tempo + np.cumsum(restante[ordem]) / processadores
+    if processadores > 1:
+        conclusao = np.maximum(conclusao, tempo + restante[ordem])
+    afetadas = np.argmax(ordem == posicao)
+    return bool(np.all(conclusao[afetadas:] <= deadline[ordem][afetadas:] + EPSILON))
+
+
+class ControleAdmissao:
+    """
+    Controle de admissão para EscalonadorCAV.controle_admissao: uma tarefa que
+    chega só entra se, junto com as tarefas admitidas e ainda não concluídas,
+    o EDF ainda cumprir o deadline dela e o das que vencem depois. Como o EDF é
+    ótimo num processador, uma recusa significa que nenhuma política cumpriria
+    todos esses deadlines.
+
+    A garantia para as admitidas vale para o EDF ideal, o
+    EscalonadorEDFPreemptivo, num processador: com ele, nenhuma tarefa
+    admitida perde o deadline. Com outras políticas (inclusive o
+    EscalonadorEDF, que usa o deadline relativo e quantum) ou vários
+    processadores, o controle só recusa as tarefas sem chance.
+
+    Uma tarefa recusada é rejeitada ou, com 'adiamento', volta a chegar
+    'adiamento' segundos depois (até 'max_adiamentos' vezes), como um novo
+    pedido com o deadline relativo contado da nova chegada.
+    """
+    def __init__(self, adiamento=None, max_adiamentos=3):
+        if adiamento is not None and adiamento <= 0:
+            raise ValueError("O adiamento deve ser positivo.")
+        self.adiamento = adiamento
+        self.max_adiamentos = max_adiamentos
+        self._admitidas = []  # (linha, identificador) das tarefas admitidas
+        self._adiamentos = {}  # identificador -> vezes que a tarefa já foi adiada
+
+    def iniciar(self, escalonador):
+        if self.adiamento is not None and not isinstance(escalonador.tarefas_para_escalonar, TabelaFluxo):
+            raise ValueError("O adiamento de chegadas exige um fluxo ou o modo online (a tabela é imutável); "
+                             "use ControleAdmissao() sem adiamento.")
+        self._admitidas = []
+        self._adiamentos = {}
+
+    def avaliar(self, escalonador, tarefa, tempo):
+        tabela = escalonador.tarefas_para_escalonar
+        # Descarta as concluídas; numa TabelaFluxo a linha pode já ser de outra tarefa
+        self._admitidas = [
+            (linha, identificador) for linha, identificador in self._admitidas
+            if tabela.tempo_final[linha] < 0 and tabela.identificador(linha) == identificador
+        ]
+        linhas = np.array([linha for linha, _ in self._admitidas] + [tarefa], dtype=np.int64)
+        restante = tabela.tempo_restante[linhas]
+        for em_execucao, inicio in escalonador.bursts_em_andamento():
+            restante[linhas == em_execucao] -= tempo - inicio
+        deadline = tabela.tempo_chegada[linhas] + np.nan_to_num(tabela.deadline[linhas], nan=np.inf)
+
+        identificador = tabela.identificador(tarefa)
+        if _cabem_no_prazo(tempo, restante, deadline, escalonador.processadores, len(linhas) - 1):
+            self._admitidas.append((tarefa, identificador))
+            self._adiamentos.pop(identificador, None)
+            return None
+        adiamentos = self._adiamentos.get(identificador, 0)
+        if self.adiamento is None or adiamentos >= self.max_adiamentos:
+            self._adiamentos.pop(identificador, None)
+            return math.inf
+        self._adiamentos[identificador] = adiamentos + 1
+        return tempo + self.adiamento
+
+
+# --- Exemplo de execução ---
+if __name__ == "__main__":
+    import time
+
+    from experimentos import gerar_carga
+    from escalonador import EscalonadorEDF, EscalonadorEDFPreemptivo
+    from cargas import CargaPoisson
+
+    tarefas = gerar_carga(semente=0, n_tarefas=20)
+    repeticoes = 1000
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        resultado = teste_demanda_edf(tarefas)
+    decorrido = (time.perf_counter() - inicio) / repeticoes * 1e6
+    print(f"Teste de demanda (EDF): escalonável = {resultado.escalonavel}, folga = {resultado.folga:.2f}s "
+          f"na janela {resultado.intervalo} ({decorrido:.0f} µs)")
+    print(f"Teste de utilização: {teste_utilizacao(tarefas)}; processadores mínimos: {processadores_minimos(tarefas)}")
+    print(f"Prioridades fixas (quantum 2): escalonável = {teste_prioridade_fixa(tarefas, quantum=2)}")
+
+    for classe in (EscalonadorEDFPreemptivo, EscalonadorEDF):
+        escalonador = classe(CargaPoisson(taxa=0.25, n_tarefas=2000, semente=1))
+        escalonador.rastreio = None
+        escalonador.controle_admissao = ControleAdmissao(adiamento=5)
+        escalonador.escalonar()
+        print(f"{classe.__name__} com controle de admissão: {escalonador.tarefas_rejeitadas} rejeitadas, "
+              f"{escalonador.deadlines_perdidos} deadlines perdidos")
+        if classe is EscalonadorEDFPreemptivo and escalonador.deadlines_perdidos:
+            raise AssertionError("Tarefas admitidas perderam o deadline com o EDF ideal.")
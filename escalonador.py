@@ -1,29 +1,815 @@
 import copy
-from collections import deque
-from abc import ABC, abstractmethod
+import heapq
+import math
+from itertools import count, tee
+from abc import ABC
+from collections import namedtuple
+from collections.abc import Sequence
 import csv
 import os
 
+import numpy as np
+
+import metricas
+import rastreamento
+from bursts import DTYPE_BURST
+from filas import FilaFIFO, FilaHeap, FilaPrioridadeBitmap
+from perfil import EnvoltorioCronometrado
+from tarefa import TabelaTarefas, TabelaFluxo, RegistroTarefa, TarefaCAV, TOLERANCIA_DEADLINE
+
+# Tipos de evento do núcleo de simulação. Eventos no mesmo instante são tratados
+# nesta ordem: chegadas entram na fila antes de uma tarefa preemptada voltar a ela.
+CHEGADA = 0
+CONCLUSAO = 1
+FIM_QUANTUM = 2
+
+# A cada quantas decisões o callback de progresso é chamado
+INTERVALO_PROGRESSO = 256
+
+
+class SimulacaoCancelada(Exception):
+    """Levantada por escalonar() quando cancelar() é chamado durante a simulação."""
+
+
+# Decisão de escalonamento devolvida pela API online; 'tarefa' é o identificador estável
+Decisao = namedtuple("Decisao", ["tempo", "tarefa", "nome", "processador", "fatia"])
+
+
+# --- FONTES DE CHEGADAS ---
+# Cada fonte informa o instante da próxima chegada (proxima) e entrega ao núcleo,
+# como índices da tabela, as tarefas que já chegaram (admitir_ate). bifurcar()
+# cria uma fonte independente que continua do mesmo ponto, para outra tabela.
+
+def _como_registro(tarefa):
+    if isinstance(tarefa, RegistroTarefa):
+        return tarefa
+    if isinstance(tarefa, TarefaCAV):
+        return RegistroTarefa(tarefa.nome, tarefa.duracao, tarefa.prioridade, tarefa.tempo_chegada, tarefa.deadline)
+    return RegistroTarefa(*tarefa)
+
+
+class _ChegadasTabela:
+    """Cursor sobre os índices de uma tabela completa, ordenados (de forma estável) por chegada."""
+    def __init__(self, tabela):
+        self._ordem = np.argsort(tabela.tempo_chegada, kind="stable")
+        self._tempos = tabela.tempo_chegada[self._ordem]
+        self._cursor = 0
+
+    def proxima(self):
+        return self._tempos[self._cursor].item() if self._cursor < len(self._tempos) else None
+
+    def admitir_ate(self, tempo, admitir):
+        fim = int(np.searchsorted(self._tempos, tempo, side="right"))
+        for tarefa in self._ordem[self._cursor:fim].tolist():
+            admitir(tarefa)
+        admitidas = fim - self._cursor
+        self._cursor = fim
+        return admitidas
+
+    def bifurcar(self, tabela):
+        return copy.copy(self)  # A ordem e os tempos de chegada são compartilhados
+
+
+class _ChegadasFluxo:
+    """Lê um fluxo em ordem de chegada sob demanda, com uma tarefa de antecedência."""
+    def __init__(self, registros, tabela):
+        self._registros = registros
+        self._tabela = tabela
+        self._ultima_chegada = float("-inf")
+        self._ler_proximo()
+
+    def _ler_proximo(self):
+        registro = next(self._registros, None)
+        if registro is not None:
+            registro = _como_registro(registro)
+            if registro.tempo_chegada < self._ultima_chegada:
+                raise ValueError(
+                    f"Fluxo fora de ordem: tarefa {registro.nome!r} chega em {registro.tempo_chegada} "
+                    f"depois de uma chegada em {self._ultima_chegada}."
+                )
+            self._ultima_chegada = registro.tempo_chegada
+        self._proximo = registro
+
+    def proxima(self):
+        return None if self._proximo is None else self._proximo.tempo_chegada
+
+    def admitir_ate(self, tempo, admitir):
+        admitidas = 0
+        while self._proximo is not None and self._proximo.tempo_chegada <= tempo:
+            admitir(self._tabela.admitir(self._proximo))
+            self._ler_proximo()
+            admitidas += 1
+        return admitidas
+
+    def bifurcar(self, tabela):
+        # tee guarda os registros lidos por um ramo até que os demais também os leiam
+        copia = copy.copy(self)
+        copia._tabela = tabela
+        self._registros, copia._registros = tee(self._registros)
+        return copia
+
+
+class _ChegadasOnline:
+    """Tarefas submetidas durante a simulação (API online), num heap por instante de chegada."""
+    def __init__(self, tabela):
+        self._tabela = tabela
+        self._pendentes = []
+        self._sequencia = count()
+
+    def submeter(self, registro):
+        heapq.heappush(self._pendentes, (registro.tempo_chegada, next(self._sequencia), registro))
+
+    def proxima(self):
+        return self._pendentes[0][0] if self._pendentes else None
+
+    def admitir_ate(self, tempo, admitir):
+        admitidas = 0
+        while self._pendentes and self._pendentes[0][0] <= tempo:
+            admitir(self._tabela.admitir(heapq.heappop(self._pendentes)[2]))
+            admitidas += 1
+        return admitidas
+
+    def bifurcar(self, tabela):
+        copia = copy.copy(self)
+        copia._tabela = tabela
+        copia._pendentes = list(self._pendentes)
+        proxima = next(self._sequencia)
+        self._sequencia = count(proxima)
+        copia._sequencia = count(proxima)
+        return copia
+
+
+# --- INSTANTÂNEOS DE SIMULAÇÃO ---
+
+class Instantaneo:
+    """
+    Estado congelado de uma simulação em andamento (ver EscalonadorCAV.instantaneo).
+    Cada bifurcar() devolve um escalonador novo que continua do instante
+    congelado, sem afetar o original, o instantâneo nem os outros ramos.
+
+    Os ramos compartilham com o instantâneo o que não alteram: a especificação
+    das tarefas, os tempos de chegada, os bursts já registrados e, na
+    TabelaTarefas, as páginas do estado de execução (mapeadas com cópia na
+    escrita). Filas de prontos, eventos pendentes e métricas acumuladas, que
+    crescem com as tarefas presentes no sistema e não com o total, são copiados.
+    """
+    def __init__(self, escalonador):
+        self.tempo = escalonador.tempo_atual_simulacao
+        self._congelado = escalonador._copiar(congelar=True)
+
+    def bifurcar(self, rastreio=None):
+        """
+        Novo escalonador que continua deste instante. Os atributos da política
+        (quantum, modelo...) podem ser trocados antes de avançar; o ramo só
+        registra eventos em 'rastreio', se for dado.
+        """
+        ramo = self._congelado._copiar(congelar=False)
+        if rastreio is not None:
+            ramo.rastreio = rastreio
+            rastreio.iniciar(ramo)
+            ramo._instrumentar()  # Com perfil, o destino também é cronometrado
+        return ramo
+
+
 # --- CLASSE ABSTRATA DE ESCALONADOR ---
 class EscalonadorCAV(ABC):
+    """
+    Núcleo de simulação por eventos discretos compartilhado pelos escalonadores.
+
+    As subclasses definem apenas a política: a fila de prontos
+    (criar_fila_prontos) e quanto tempo cada tarefa executa por vez
+    (fatia_de_execucao). O núcleo cuida das chegadas, do relógio e das métricas.
+
+    Os eventos da simulação vão para 'rastreio' (ver rastreamento.py). O padrão
+    imprime no console; com rastreio = None a simulação roda em silêncio.
+
+    Para rodar em outra thread, 'ao_progredir' recebe periodicamente o tempo
+    simulado atual e cancelar() interrompe a simulação.
+
+    Com 'perfil' (ver perfil.Perfilador) cada fase das decisões é cronometrada;
+    sem ele a simulação não tem nenhum custo de medição.
+
+    Com 'controle_admissao' (ver escalonabilidade.ControleAdmissao) cada
+    chegada passa por avaliar(escalonador, tarefa, tempo), que devolve None
+    para admitir, math.inf para rejeitar ou o instante em que a tarefa deve
+    chegar de novo (adiamento, só em fluxos e no modo online).
+
+    'tarefas_iniciais' pode ser uma lista de TarefaCAV, uma TabelaTarefas ou um
+    fluxo: qualquer outro iterável de RegistroTarefa/TarefaCAV em ordem de
+    chegada (ver cargas.py). O fluxo é lido sob demanda, a cada chegada, e as
+    tarefas concluídas liberam sua linha da tabela (ver TabelaFluxo). Com
+    tarefas_iniciais = None o escalonador é online: as tarefas são entregues
+    com submeter() e a simulação avança com avancar() ou proxima_decisao().
+    Essas duas também conduzem passo a passo as simulações de tabela e fluxo.
+
+    instantaneo() congela uma simulação em andamento e bifurcar() cria, a
+    partir dela, ramos independentes (outro quantum, uma chegada a mais no modo
+    online...) que não refazem o trecho já simulado.
+
+    Com 'processadores' > 1 a simulação usa vários processadores (núcleos ou
+    ECUs). No modo global há uma única fila de prontos e uma tarefa pode voltar
+    a executar em outro processador, pagando SOBRECARGA_MIGRACAO; no modo
+    particionado (particionado = True) cada tarefa é atribuída a um processador
+    na chegada (ver escolher_processador) e usa só a fila dele.
+    """
     SOBRECARGA_BASE = 0.1
+    SOBRECARGA_MIGRACAO = 0.2
+    # Se True, chegadas podem interromper a tarefa em execução (ver deve_preemptar)
+    PREEMPTIVO = False
+    # Se True, a sobrecarga é cobrada a cada despacho; senão, a cada volta à fila por quantum
+    SOBRECARGA_A_CADA_DESPACHO = False
+    # Mensagens no console (ver rastreamento.FORMATOS_CONSOLE)
+    FORMATO_CONSOLE = "fatia"
 
     def __init__(self, tarefas_iniciais):
-        self.tarefas_originais = copy.deepcopy(tarefas_iniciais)
-        self.tarefas_para_escalonar = []
+        self._fluxo = None
+        self.online = tarefas_iniciais is None
+        if isinstance(tarefas_iniciais, (TabelaTarefas, Sequence)):
+            # A especificação das tarefas é imutável: a tabela é copiada uma única vez
+            # e cada simulação só reinicia os arrays de estado (ver TabelaTarefas.resetar)
+            self.tarefas_para_escalonar = TabelaTarefas.de_tarefas(tarefas_iniciais)
+        else:
+            if not self.online:
+                self._fluxo = tarefas_iniciais
+                self._fluxo_consumido = False
+            self.tarefas_para_escalonar = TabelaFluxo()
+        # Tabela dinâmica (fluxo ou online): linhas alocadas na chegada e liberadas na conclusão
+        self._dinamica = isinstance(self.tarefas_para_escalonar, TabelaFluxo)
+        self._em_andamento = False  # Há uma simulação iniciada que avancar() pode continuar
         self.sobrecarga_total = 0
-        self.tempos_de_turnaround = []
+        self.estatisticas = metricas.EstatisticasSimulacao()  # Atualizadas a cada conclusão
         self.deadlines_perdidos = 0  # Adicionado
+        self.tarefas_rejeitadas = 0  # Recusadas pelo controle de admissão
+        self.decisoes = 0  # Despachos feitos na última simulação
+        self.processadores = 1
+        self.particionado = False
+        self.rastreio = rastreamento.RenderizadorConsole()
+        self.ao_progredir = None
+        self.controle_admissao = None
+        self.perfil = None
+        self._cancelado = False
 
     def resetar_estado_simulacao(self):
-        self.tarefas_para_escalonar = copy.deepcopy(self.tarefas_originais)
+        self.tarefas_para_escalonar.resetar()
         self.sobrecarga_total = 0
-        self.tempos_de_turnaround = []
+        self.estatisticas = metricas.EstatisticasSimulacao()
         self.deadlines_perdidos = 0  # Adicionado
+        self.tarefas_rejeitadas = 0
+
+    # --- Pontos de extensão das políticas ---
+
+    def cabecalho(self):
+        return f"--- Escalonamento {self.__class__.__name__} ---"
+
+    def criar_fila_prontos(self):
+        """Retorna a fila de prontos da política (padrão: ordem de chegada)."""
+        return FilaFIFO()
+
+    def fatia_de_execucao(self, tarefa):
+        """Tempo máximo de execução antes de a tarefa voltar à fila (None = até concluir)."""
+        return getattr(self, "quantum", None)
+
+    def deve_preemptar(self, tarefa, restante, candidata):
+        """
+        Chamado nas chegadas das políticas preemptivas: a tarefa pronta
+        'candidata' deve tomar o processador de 'tarefa', que está em execução
+        com 'restante' de trabalho?
+        """
+        return False
+
+    def chave_preempcao(self, tarefa, restante):
+        """Ordem das tarefas em execução: a de maior chave é a primeira a ceder o processador."""
+        return restante
+
+    def escolher_processador(self, tarefa):
+        """
+        Modo particionado: processador que recebe a tarefa que acaba de chegar.
+        O padrão é o de menor trabalho pendente (empate: menor índice).
+        """
+        pendente = self._trabalho_pendente
+        return pendente.index(min(pendente))
+
+    # --- Núcleo de simulação ---
 
-    @abstractmethod
     def escalonar(self):
-        pass
+        self.resetar_estado_simulacao()
+        self._iniciar_simulacao()
+        self._processar_eventos()
+
+    def _iniciar_simulacao(self):
+        tabela = self.tarefas_para_escalonar
+        processadores = self.processadores
+        if not isinstance(processadores, int) or processadores < 1:
+            raise ValueError(f"Número de processadores inválido: {processadores!r}")
+        if self.controle_admissao is not None:
+            # Antes de qualquer estado: uma configuração inválida falha sem simular nada
+            self.controle_admissao.iniciar(self)
+        self.tempo_atual_simulacao = 0
+        self.decisoes = 0
+        self._em_andamento = True
+        if self.particionado:
+            self.filas_prontos = [self.criar_fila_prontos() for _ in range(processadores)]
+        else:
+            self.filas_prontos = [self.criar_fila_prontos()] * processadores  # Fila global compartilhada
+        self.fila_prontos = self.filas_prontos[0]
+        self._migracao_possivel = processadores > 1 and not self.particionado
+        self._trabalho_pendente = [0] * processadores
+        if self.online:
+            self._chegadas = _ChegadasOnline(tabela)
+        elif self._fluxo is not None:
+            self._chegadas = _ChegadasFluxo(self._abrir_fluxo(), tabela)
+        else:
+            self._chegadas = _ChegadasTabela(tabela)
+        self._eventos = []
+        self._sequencia_eventos = count()
+        # Estado de cada processador; o evento de fim do burst é invalidado na preempção
+        self._em_execucao = [None] * processadores
+        self._inicio_burst = [0] * processadores
+        self._seq_execucao = [None] * processadores
+        self._processador_livre = None
+        self._adiadas = []  # (instante, seq, tarefa) das chegadas adiadas pelo controle de admissão
+        self._instrumentar()
+        self._agendar_proxima_chegada()
+        if self.rastreio is not None:
+            self.rastreio.iniciar(self)
+
+    # Métodos da instância trocados por versões cronometradas quando há perfil
+    _METODOS_PERFILADOS = {
+        "_despachar": "decisao", "_tratar_proximo_evento": "evento", "registrar_sobrecarga": "sobrecarga"
+    }
+
+    def _instrumentar(self):
+        for nome in self._METODOS_PERFILADOS:
+            self.__dict__.pop(nome, None)
+        rastreio = self.rastreio
+        if isinstance(rastreio, EnvoltorioCronometrado):
+            rastreio = self.rastreio = rastreio.original
+        perfil = self.perfil
+        if perfil is None:
+            return
+
+        for nome, fase in self._METODOS_PERFILADOS.items():
+            setattr(self, nome, perfil.cronometrar(self, fase, getattr(self, nome)))
+        envoltorios = {}  # No modo global todas as posições são a mesma fila
+        self.filas_prontos = [
+            envoltorios.setdefault(id(fila), perfil.envolver(self, fila, {"inserir": "fila", "remover": "selecao"}))
+            for fila in self.filas_prontos
+        ]
+        self.fila_prontos = self.filas_prontos[0]
+        if rastreio is not None:
+            self.rastreio = perfil.envolver(self, rastreio, {"registrar": "saida"})
+
+    def _agendar_evento(self, tempo, tipo, tarefa=None, processador=None):
+        seq = next(self._sequencia_eventos)
+        heapq.heappush(self._eventos, (tempo, tipo, seq, tarefa, processador))
+        return seq
+
+    def _agendar_proxima_chegada(self):
+        tempo = self._chegadas.proxima()
+        if tempo is not None:
+            self._agendar_evento(tempo, CHEGADA)
+
+    def _abrir_fluxo(self):
+        registros = iter(self._fluxo)
+        if registros is self._fluxo:
+            # Um gerador só pode ser percorrido uma vez; fontes de cargas.py podem ser reabertas
+            if self._fluxo_consumido:
+                raise RuntimeError("O fluxo de tarefas já foi consumido por uma simulação anterior.")
+            self._fluxo_consumido = True
+        return registros
+
+    def _processar_eventos(self):
+        decisoes = self.decisoes
+        while self._avancar_ate_decisao():
+            if self._cancelado:
+                self._cancelado = False
+                self.decisoes = decisoes
+                raise SimulacaoCancelada(f"{self.__class__.__name__} cancelado em {self.tempo_atual_simulacao:.2f}s")
+            self._despachar(self.tempo_atual_simulacao)
+            decisoes += 1
+            if self.ao_progredir is not None and decisoes % INTERVALO_PROGRESSO == 0:
+                self.ao_progredir(self.tempo_atual_simulacao)
+        self.decisoes = decisoes
+        self._concluir_bursts()
+
+    def _concluir_bursts(self):
+        bursts = self.tarefas_para_escalonar.bursts
+        if bursts is not None:
+            bursts.concluir()
+
+    def cancelar(self):
+        """Interrompe a simulação em andamento, ou a próxima (seguro a partir de outra thread)."""
+        self._cancelado = True
+
+    # --- API online ---
+
+    def _garantir_iniciada(self):
+        if not self._em_andamento:
+            self.resetar_estado_simulacao()
+            self._iniciar_simulacao()
+
+    def submeter(self, tarefa):
+        """
+        Entrega uma tarefa (TarefaCAV, RegistroTarefa ou tupla) ao escalonador
+        online. Uma chegada anterior ao tempo atual conta como chegada agora; a
+        tarefa entra na fila quando a simulação avançar até a sua chegada.
+        """
+        if not self.online:
+            raise RuntimeError("submeter() exige um escalonador criado com tarefas_iniciais = None.")
+        self._garantir_iniciada()
+        registro = _como_registro(tarefa)
+        if registro.tempo_chegada < self.tempo_atual_simulacao:
+            registro = registro._replace(tempo_chegada=self.tempo_atual_simulacao)
+        self._chegadas.submeter(registro)
+        self._agendar_evento(registro.tempo_chegada, CHEGADA)
+
+    def avancar(self, ate=None):
+        """
+        Simula até o instante 'ate' (inclusive), tomando todas as decisões
+        pendentes, e devolve a lista de Decisao. Sem 'ate', simula até terminar
+        as tarefas já submetidas.
+        """
+        self._garantir_iniciada()
+        decisoes = []
+        while self._avancar_ate_decisao(ate):
+            decisoes.append(self._decidir())
+        if ate is not None and ate > self.tempo_atual_simulacao:
+            self.tempo_atual_simulacao = ate
+        return decisoes
+
+    def continuar(self):
+        """Simula até o fim a partir do estado atual (de um ramo, por exemplo), sem recomeçar."""
+        self._garantir_iniciada()
+        self._processar_eventos()
+
+    def proxima_decisao(self):
+        """
+        Avança até a próxima decisão, toma-a e a devolve (None se não há tarefas
+        pendentes). Com as filas de heap, o custo é O(log n) nas tarefas prontas.
+        """
+        self._garantir_iniciada()
+        return self._decidir() if self._avancar_ate_decisao() else None
+
+    def prontas(self):
+        """
+        Avança até a próxima decisão e devolve as tarefas (índices da tabela)
+        entre as quais ela será tomada: as prontas na fila do processador livre.
+        Lista vazia se não há decisão pendente.
+        """
+        self._garantir_iniciada()
+        if not self._avancar_ate_decisao():
+            return []
+        return list(self.filas_prontos[self._processador_livre])
+
+    def decidir(self, tarefa=None):
+        """
+        Toma a próxima decisão executando 'tarefa' (uma das prontas()) no lugar
+        da escolha da política, e devolve a Decisao (None se não há decisão).
+        """
+        self._garantir_iniciada()
+        return self._decidir(tarefa) if self._avancar_ate_decisao() else None
+
+    def proximo_evento(self):
+        """Instante do próximo evento pendente (None se não há nada a simular)."""
+        self._garantir_iniciada()
+        return self._eventos[0][0] if self._eventos else None
+
+    def _decidir(self, tarefa=None):
+        tempo = self.tempo_atual_simulacao
+        tarefa, processador, fatia = self._despachar(tempo, tarefa)
+        self.decisoes += 1
+        tabela = self.tarefas_para_escalonar
+        return Decisao(tempo, tabela.identificador(tarefa), tabela.nomes[tarefa], processador, fatia)
+
+    # --- Instantâneos e ramos ---
+
+    def instantaneo(self):
+        """Congela a simulação em andamento (iniciando-a, se preciso) num Instantaneo."""
+        self._garantir_iniciada()
+        return Instantaneo(self)
+
+    def bifurcar(self, rastreio=None):
+        """Ramo que continua da simulação em andamento (atalho para instantaneo().bifurcar())."""
+        return self.instantaneo().bifurcar(rastreio)
+
+    def _copiar(self, congelar):
+        """Cópia independente da simulação; a tabela é congelada ou bifurcada (ver TabelaTarefas)."""
+        copia = copy.copy(self)
+        tabela = self.tarefas_para_escalonar
+        copia.tarefas_para_escalonar = tabela.congelar() if congelar else tabela.bifurcar()
+        copia.estatisticas = self.estatisticas.copiar()
+        copia.controle_admissao = copy.deepcopy(self.controle_admissao)
+        copia.rastreio = None
+        copia._cancelado = False
+        copia._chegadas = self._chegadas.bifurcar(copia.tarefas_para_escalonar)
+        copia._eventos = list(self._eventos)
+        proximo = next(self._sequencia_eventos)
+        self._sequencia_eventos = count(proximo)
+        copia._sequencia_eventos = count(proximo)
+        copia._adiadas = list(self._adiadas)
+        copia._trabalho_pendente = list(self._trabalho_pendente)
+        copia._em_execucao = list(self._em_execucao)
+        copia._inicio_burst = list(self._inicio_burst)
+        copia._seq_execucao = list(self._seq_execucao)
+
+        copias = {}  # No modo global todas as posições são a mesma fila
+        filas = []
+        for fila in self.filas_prontos:
+            if isinstance(fila, EnvoltorioCronometrado):
+                fila = fila.original
+            if id(fila) not in copias:
+                copias[id(fila)] = copia.criar_fila_prontos()
+                copias[id(fila)].copiar_conteudo(fila)
+            filas.append(copias[id(fila)])
+        copia.filas_prontos = filas
+        copia.fila_prontos = filas[0]
+        copia._instrumentar()
+        return copia
+
+    # --- Resultado de uma simulação (ver cache_resultados.py) ---
+
+    # Escalares guardados no resultado, além do estado da tabela, dos bursts e das estatísticas
+    _ESCALARES_RESULTADO = (
+        "tempo_atual_simulacao", "sobrecarga_total", "deadlines_perdidos", "tarefas_rejeitadas", "decisoes"
+    )
+
+    def exportar_resultado(self):
+        """Resultado da última simulação (de uma TabelaTarefas) como dicionário de arrays, pronto para np.savez."""
+        tabela = self.tarefas_para_escalonar
+        resultado = {nome: getattr(tabela, nome).copy() for nome in tabela.COLUNAS_ESTADO}
+        bursts = tabela.bursts
+        resultado["bursts"] = np.array(bursts.bursts()) if bursts is not None else np.empty(0, dtype=DTYPE_BURST)
+        for nome in self._ESCALARES_RESULTADO:
+            resultado[f"escalar_{nome}"] = np.array(getattr(self, nome))
+        for nome, array in self.estatisticas.estado().items():
+            resultado[f"estatisticas_{nome}"] = array
+        return resultado
+
+    def importar_resultado(self, resultado):
+        """
+        Restaura, sem simular, um resultado de exportar_resultado() para as
+        mesmas tarefas. Os eventos da simulação não são repetidos no rastreio.
+        """
+        tabela = self.tarefas_para_escalonar
+        for nome in tabela.COLUNAS_ESTADO:
+            getattr(tabela, nome)[:] = resultado[nome]
+        if tabela.bursts is not None:
+            tabela.bursts.restaurar(resultado["bursts"])
+        for nome in self._ESCALARES_RESULTADO:
+            setattr(self, nome, resultado[f"escalar_{nome}"].item())
+        prefixo = "estatisticas_"
+        self.estatisticas = metricas.EstatisticasSimulacao.de_estado(
+            {nome[len(prefixo):]: array for nome, array in resultado.items() if nome.startswith(prefixo)}
+        )
+        self._em_andamento = False  # Não há eventos pendentes para avancar() continuar
+
+    def horizonte_simulacao(self):
+        """
+        Instante em que a última tarefa termina. Todas as políticas mantêm o
+        processador ocupado sempre que há tarefa pronta, então o horizonte não
+        depende da política: é calculado direto das chegadas e durações.
+        Num fluxo (ou online), as tarefas futuras não são conhecidas e o resultado é None.
+        Com vários processadores, o valor de um processador é um limite superior.
+        """
+        if self._dinamica:
+            return None
+        tabela = self.tarefas_para_escalonar
+        if not len(tabela):
+            return 0
+        ordem = np.argsort(tabela.tempo_chegada, kind="stable")
+        chegadas = tabela.tempo_chegada[ordem]
+        trabalho = np.cumsum(tabela.duracao[ordem])
+        # fim_k = trabalho_k + max_{j<=k}(chegada_j - trabalho_{j-1})
+        folga = chegadas - np.concatenate([[0], trabalho[:-1]])
+        return (trabalho + np.maximum.accumulate(folga)).max().item()
+
+    def _avancar_ate_decisao(self, limite=None):
+        """
+        Trata eventos até algum processador ficar livre com tarefas prontas.
+        Devolve False se os eventos acabarem ou se o próximo passar de 'limite'.
+        """
+        em_execucao, filas, eventos = self._em_execucao, self.filas_prontos, self._eventos
+        if len(em_execucao) == 1:
+            fila = filas[0]
+            while em_execucao[0] is not None or not fila:
+                if not eventos or (limite is not None and eventos[0][0] > limite):
+                    return False
+                self._tratar_proximo_evento()
+            self._processador_livre = 0
+            return True
+
+        while True:
+            if None in em_execucao:
+                for processador, tarefa in enumerate(em_execucao):
+                    if tarefa is None and filas[processador]:
+                        self._processador_livre = processador
+                        return True
+            if not eventos or (limite is not None and eventos[0][0] > limite):
+                return False
+            self._tratar_proximo_evento()
+
+    def _tratar_proximo_evento(self):
+        tempo, tipo, seq, tarefa, processador = heapq.heappop(self._eventos)
+        if tipo != CHEGADA and seq != self._seq_execucao[processador]:
+            return  # Burst interrompido por preempção
+        self.tempo_atual_simulacao = tempo
+        if tipo == CHEGADA:
+            self._admitir_chegadas(tempo)
+        elif tipo == FIM_QUANTUM:
+            self._preemptar(processador, tempo)
+            if not self.SOBRECARGA_A_CADA_DESPACHO:
+                self._trocar_contexto(tarefa, tempo)
+        else:
+            self._encerrar_burst(processador, tempo)
+            self._concluir_tarefa(tarefa, tempo)
+
+    def _admitir_chegadas(self, tempo):
+        admitir = self._admitir if self.particionado else self.fila_prontos.inserir
+        if self.controle_admissao is None:
+            admitidas = self._chegadas.admitir_ate(tempo, admitir)
+        else:
+            admitidas = self._admitir_com_controle(tempo, admitir)
+        self._agendar_proxima_chegada()
+
+        if self.PREEMPTIVO:
+            self._verificar_preempcoes(tempo, admitidas)
+
+    def _admitir(self, tarefa):
+        if self.particionado:
+            processador = self.escolher_processador(tarefa)
+            self.tarefas_para_escalonar.processador[tarefa] = processador
+            self._trabalho_pendente[processador] += self.tarefas_para_escalonar.duracao[tarefa].item()
+        self._enfileirar(tarefa)
+
+    def _admitir_com_controle(self, tempo, admitir):
+        candidatas = []
+        self._chegadas.admitir_ate(tempo, candidatas.append)
+        while self._adiadas and self._adiadas[0][0] <= tempo:
+            candidatas.append(heapq.heappop(self._adiadas)[2])
+
+        admitidas = 0
+        for tarefa in candidatas:
+            instante = self.controle_admissao.avaliar(self, tarefa, tempo)
+            if instante is None:
+                admitir(tarefa)
+                admitidas += 1
+            elif instante == math.inf:
+                self._rejeitar(tarefa, tempo)
+            else:
+                self._adiar(tarefa, tempo, instante)
+        return admitidas
+
+    def _rejeitar(self, tarefa, tempo):
+        self.tarefas_rejeitadas += 1
+        if self.rastreio is not None:
+            self.rastreio.registrar(rastreamento.REJEICAO, tempo, tarefa, 0.0)
+        if self._dinamica:
+            self.tarefas_para_escalonar.liberar(tarefa)
+
+    def _adiar(self, tarefa, tempo, instante):
+        # A tarefa volta como uma nova chegada: o deadline relativo conta a partir dela
+        if not self._dinamica:
+            raise ValueError("O adiamento de chegadas exige um fluxo ou o modo online (a tabela é imutável).")
+        if instante <= tempo:
+            raise ValueError(f"Adiamento para {instante}, que não é posterior ao tempo atual ({tempo}).")
+        self.tarefas_para_escalonar.tempo_chegada[tarefa] = instante
+        heapq.heappush(self._adiadas, (instante, next(self._sequencia_eventos), tarefa))
+        self._agendar_evento(instante, CHEGADA)
+        if self.rastreio is not None:
+            self.rastreio.registrar(rastreamento.ADIAMENTO, tempo, tarefa, instante)
+
+    def bursts_em_andamento(self):
+        """Pares (tarefa, inicio) dos bursts em execução; tempo_restante só é atualizado no fim de cada um."""
+        return [(tarefa, inicio) for tarefa, inicio in zip(self._em_execucao, self._inicio_burst) if tarefa is not None]
+
+    def _enfileirar(self, tarefa):
+        if self.particionado:
+            self.filas_prontos[self.tarefas_para_escalonar.processador[tarefa]].inserir(tarefa)
+        else:
+            self.fila_prontos.inserir(tarefa)
+
+    def _verificar_preempcoes(self, tempo, admitidas):
+        """
+        Avalia a preempção dos processadores ocupados. No modo particionado,
+        cada um é comparado com a primeira tarefa da própria fila. No global,
+        as primeiras da fila ficam com os processadores livres, e as seguintes
+        são pareadas, uma a uma, com as tarefas em execução da pior para a
+        melhor (ver chave_preempcao); no máximo 'admitidas' tarefas são
+        interrompidas.
+        """
+        tabela = self.tarefas_para_escalonar
+        ocupados = []
+        livres = 0
+        for processador, tarefa in enumerate(self._em_execucao):
+            if tarefa is None:
+                livres += 1
+                continue
+            restante = tabela.tempo_restante[tarefa].item() - (tempo - self._inicio_burst[processador])
+            ocupados.append((restante, processador, tarefa))
+        if self.particionado:
+            for restante, processador, tarefa in ocupados:
+                fila = self.filas_prontos[processador]
+                if fila and self.deve_preemptar(tarefa, restante, fila.primeiras(1)[0]):
+                    self._preemptar(processador, tempo)
+            return
+
+        ocupados.sort(key=lambda ocupado: (-self.chave_preempcao(ocupado[2], ocupado[0]), ocupado[1]))
+        candidatas = self.fila_prontos.primeiras(livres + min(admitidas, len(ocupados)))[livres:]
+        for (restante, processador, tarefa), candidata in zip(ocupados, candidatas):
+            # Candidatas cada vez piores contra tarefas cada vez melhores: a primeira recusa encerra
+            if not self.deve_preemptar(tarefa, restante, candidata):
+                break
+            self._preemptar(processador, tempo)
+
+    def _despachar(self, tempo, tarefa=None):
+        tabela = self.tarefas_para_escalonar
+        processador = self._processador_livre
+        if tarefa is None:
+            tarefa = self.filas_prontos[processador].remover()
+        else:
+            tarefa = self.filas_prontos[processador].remover_tarefa(tarefa)
+        if self._migracao_possivel:
+            anterior = tabela.processador[tarefa].item()
+            if anterior != processador:
+                if anterior >= 0 and self._em_execucao[anterior] is None:
+                    processador = anterior  # Afinidade: volta ao último processador, se estiver livre
+                elif anterior >= 0:
+                    self._migrar(tarefa, tempo)
+                tabela.processador[tarefa] = processador
+        restante = tabela.tempo_restante[tarefa].item()
+        fatia = self.fatia_de_execucao(tarefa)
+        if fatia is None or fatia >= restante:
+            tempo_exec, tipo = restante, CONCLUSAO
+        else:
+            tempo_exec, tipo = fatia, FIM_QUANTUM
+
+        if tabela.tempo_inicio_execucao[tarefa] < 0:
+            tabela.tempo_inicio_execucao[tarefa] = tempo
+            tabela.processador[tarefa] = processador
+        if self.SOBRECARGA_A_CADA_DESPACHO:
+            self._trocar_contexto(tarefa, tempo)
+        if self.rastreio is not None:
+            self.rastreio.registrar(rastreamento.DESPACHO, tempo, tarefa, tempo_exec)
+
+        self._em_execucao[processador] = tarefa
+        self._inicio_burst[processador] = tempo
+        self._seq_execucao[processador] = self._agendar_evento(tempo + tempo_exec, tipo, tarefa, processador)
+        return tarefa, processador, tempo_exec
+
+    def _encerrar_burst(self, processador, tempo):
+        tarefa = self._em_execucao[processador]
+        inicio = self._inicio_burst[processador]
+        if tempo > inicio:
+            tabela = self.tarefas_para_escalonar
+            tabela.tempo_restante[tarefa] -= tempo - inicio
+            if tabela.bursts is not None:
+                tabela.bursts.registrar(tabela.identificador(tarefa), inicio, tempo, processador)
+        self._em_execucao[processador] = None
+        self._seq_execucao[processador] = None
+        return tarefa
+
+    def _preemptar(self, processador, tempo):
+        tarefa = self._encerrar_burst(processador, tempo)
+        self._enfileirar(tarefa)
+        if self.rastreio is not None:
+            restante = self.tarefas_para_escalonar.tempo_restante[tarefa].item()
+            self.rastreio.registrar(rastreamento.PREEMPCAO, tempo, tarefa, restante)
+
+    def _migrar(self, tarefa, tempo):
+        self.registrar_sobrecarga(self.SOBRECARGA_MIGRACAO)
+        if self.rastreio is not None:
+            self.rastreio.registrar(rastreamento.MIGRACAO, tempo, tarefa, self.SOBRECARGA_MIGRACAO)
+
+    def _trocar_contexto(self, tarefa, tempo):
+        self.registrar_sobrecarga()
+        if self.rastreio is not None:
+            self.rastreio.registrar(rastreamento.TROCA_CONTEXTO, tempo, tarefa, self.SOBRECARGA_BASE)
+
+    def _concluir_tarefa(self, tarefa, tempo):
+        tabela = self.tarefas_para_escalonar
+        tabela.tempo_restante[tarefa] = 0
+        tabela.tempo_final[tarefa] = tempo
+        if self.particionado:
+            self._trabalho_pendente[tabela.processador[tarefa]] -= tabela.duracao[tarefa].item()
+        chegada = tabela.tempo_chegada.item(tarefa)
+        self.estatisticas.registrar(tempo - chegada, tabela.duracao.item(tarefa),
+                                    tabela.tempo_inicio_execucao.item(tarefa) - chegada, tabela.deadline.item(tarefa))
+        rastreio = self.rastreio
+        if rastreio is not None:
+            rastreio.registrar(rastreamento.CONCLUSAO, tempo, tarefa, 0.0)
+        if self.deadline_perdido(tarefa):
+            self.deadlines_perdidos += 1
+            if rastreio is not None:
+                atraso = tempo - tabela.tempo_chegada[tarefa] - tabela.deadline[tarefa]
+                rastreio.registrar(rastreamento.DEADLINE_PERDIDO, tempo, tarefa, atraso.item())
+        if self._dinamica:
+            tabela.liberar(tarefa)
+
+    def deadline_perdido(self, tarefa):
+        """O deadline é relativo à chegada da tarefa (NaN = sem deadline); ver TOLERANCIA_DEADLINE."""
+        tabela = self.tarefas_para_escalonar
+        turnaround = tabela.tempo_final[tarefa] - tabela.tempo_chegada[tarefa]
+        return bool(turnaround > tabela.deadline[tarefa] + TOLERANCIA_DEADLINE)
 
     def registrar_sobrecarga(self, tempo=None):
         if tempo is None:
@@ -31,315 +817,278 @@ class EscalonadorCAV(ABC):
         self.sobrecarga_total += tempo
 
     def calcular_e_exibir_metricas(self):
-        if not self.tarefas_para_escalonar:
-            print("Nenhuma tarefa para calcular métricas.")
-            return
-
+        """
+        Exibe as tarefas ainda na tabela e o resumo da simulação. O resumo vem
+        de 'estatisticas' e vale também para fluxos, cujas tarefas já foram
+        liberadas da tabela ao concluir.
+        """
         print("\n--- Resultados da Simulação ---")
-        for tarefa in self.tarefas_para_escalonar:
-            if tarefa.tempo_final != -1:
-                turnaround = tarefa.tempo_final - tarefa.tempo_chegada
-                self.tempos_de_turnaround.append(turnaround)
-                print(f"   - Tarefa '{tarefa.nome}':")
-                print(f"     - Chegada: {tarefa.tempo_chegada:.2f}s, Conclusão: {tarefa.tempo_final:.2f}s")
-                print(f"     - Tempo de Turnaround: {turnaround:.2f}s")
-            else:
-                print(f"   - Tarefa '{tarefa.nome}' não foi concluída.")
+        if self.tarefas_para_escalonar:
+            for tarefa in self.tarefas_para_escalonar:
+                if tarefa.tempo_final != -1:
+                    turnaround = tarefa.tempo_final - tarefa.tempo_chegada
+                    print(f"   - Tarefa '{tarefa.nome}':")
+                    print(f"     - Chegada: {tarefa.tempo_chegada:.2f}s, Conclusão: {tarefa.tempo_final:.2f}s")
+                    print(f"     - Tempo de Turnaround: {turnaround:.2f}s")
+                else:
+                    print(f"   - Tarefa '{tarefa.nome}' não foi concluída.")
+        elif not self.estatisticas.concluidas:
+            print("Nenhuma tarefa para calcular métricas.")
 
-        if self.tempos_de_turnaround:
-            avg_turnaround = sum(self.tempos_de_turnaround) / len(self.tempos_de_turnaround)
-            print(f"**Turnaround Médio**: {avg_turnaround:.2f} segundos.")
+        estatisticas = self.estatisticas
+        if estatisticas.concluidas:
+            turnaround = estatisticas.resumo("turnaround")
+            print(f"**Tarefas Concluídas**: {estatisticas.concluidas}")
+            print(f"**Turnaround Médio**: {turnaround['media']:.2f} segundos.")
+            print(f"**Turnaround p50/p95/p99**: {turnaround['p50']:.2f} / {turnaround['p95']:.2f} / "
+                  f"{turnaround['p99']:.2f} segundos (máximo {turnaround['max']:.2f}).")
+            print(f"**Espera Média**: {estatisticas.resumo('espera')['media']:.2f} segundos; "
+                  f"**Resposta Média**: {estatisticas.resumo('resposta')['media']:.2f} segundos.")
         else:
             print("**Turnaround Médio**: N/A (Nenhuma tarefa concluída).")
 
         print(f"**Sobrecarga Total Acumulada**: {self.sobrecarga_total:.2f} segundos.")
         print(f"**Deadlines Perdidos**: {self.deadlines_perdidos}")  # Adicionado
+        if estatisticas.com_deadline:
+            print(f"**Taxa de Perda de Deadlines**: {100 * estatisticas.taxa_perda:.1f}%; "
+                  f"**Atraso Máximo**: {estatisticas.atraso_maximo:.2f} segundos.")
+        ocupacao = self._ocupacao()
+        if ocupacao is not None:
+            print("**Ocupação dos Processadores**: " + ", ".join(f"{100 * o:.1f}%" for o in ocupacao))
         print("------------------------------\n")
 
-    def salvar_metricas_csv(self, nome_arquivo="metricas_escalonamento.csv"):
-        if not self.tarefas_para_escalonar:
+    def _ocupacao(self):
+        # None quando os bursts não são registrados (fluxos, por padrão)
+        bursts = self.tarefas_para_escalonar.bursts
+        if bursts is None or not len(bursts):
+            return None
+        return metricas.ocupacao_processadores(bursts, self.processadores)
+
+    def salvar_metricas_csv(self, nome_arquivo="metricas_escalonamento.csv", diretorio=None):
+        """
+        Relatório CSV legível de uma simulação pequena: uma linha por tarefa
+        ainda na tabela (nenhuma num fluxo, que as libera ao concluir) e o
+        resumo de 'estatisticas'. Para execuções grandes ou muitas execuções,
+        use metricas.EscritorMetricas durante a simulação.
+        """
+        if not self.tarefas_para_escalonar and not self.estatisticas.concluidas:
             print("Nenhuma tarefa para salvar métricas.")
             return
 
-        caminho_completo = os.path.join(os.getcwd(), nome_arquivo)
+        caminho_completo = os.path.join(diretorio or os.getcwd(), nome_arquivo)
 
         with open(caminho_completo, mode='w', newline='') as arquivo_csv:
             writer = csv.writer(arquivo_csv)
             
-            # Cabeçalho
-            writer.writerow([
-                "Nome da Tarefa", "Tempo de Chegada", "Tempo de Conclusão",
-                "Tempo de Turnaround", "Prioridade", "Deadline", "Deadline Perdido?"
-            ])
+            if self.tarefas_para_escalonar:
+                # Cabeçalho
+                writer.writerow([
+                    "Nome da Tarefa", "Tempo de Chegada", "Tempo de Conclusão",
+                    "Tempo de Turnaround", "Prioridade", "Deadline", "Deadline Perdido?"
+                ])
 
-            for tarefa in self.tarefas_para_escalonar:
-                if tarefa.tempo_final != -1:
-                    turnaround = tarefa.tempo_final - tarefa.tempo_chegada
-                    deadline_perdido = (
-                        "Sim" if tarefa.deadline is not None and tarefa.tempo_final > tarefa.deadline else "Não"
-                    )
-                    writer.writerow([
-                        tarefa.nome,
-                        f"{tarefa.tempo_chegada:.2f}",
-                        f"{tarefa.tempo_final:.2f}",
-                        f"{turnaround:.2f}",
-                        f"{tarefa.prioridade}",
-                        f"{tarefa.deadline:.2f}" if tarefa.deadline is not None else "N/A",
-                        deadline_perdido
-                    ])
-                else:
-                    writer.writerow([
-                        tarefa.nome,
-                        f"{tarefa.tempo_chegada:.2f}",
-                        "Não concluída",
-                        "N/A",
-                        f"{tarefa.prioridade}",
-                        f"{tarefa.deadline:.2f}" if tarefa.deadline is not None else "N/A",
-                        "Sim"  # Considera deadline perdido se nem foi concluída
-                    ])
-            
-            # Linha em branco
-            writer.writerow([])
+                for tarefa in self.tarefas_para_escalonar:
+                    if tarefa.tempo_final != -1:
+                        turnaround = tarefa.tempo_final - tarefa.tempo_chegada
+                        deadline_perdido = (
+                            "Sim" if tarefa.deadline is not None
+                            and turnaround > tarefa.deadline + TOLERANCIA_DEADLINE else "Não"
+                        )
+                        writer.writerow([
+                            tarefa.nome,
+                            f"{tarefa.tempo_chegada:.2f}",
+                            f"{tarefa.tempo_final:.2f}",
+                            f"{turnaround:.2f}",
+                            f"{tarefa.prioridade}",
+                            f"{tarefa.deadline:.2f}" if tarefa.deadline is not None else "N/A",
+                            deadline_perdido
+                        ])
+                    else:
+                        writer.writerow([
+                            tarefa.nome,
+                            f"{tarefa.tempo_chegada:.2f}",
+                            "Não concluída",
+                            "N/A",
+                            f"{tarefa.prioridade}",
+                            f"{tarefa.deadline:.2f}" if tarefa.deadline is not None else "N/A",
+                            "Sim"  # Considera deadline perdido se nem foi concluída
+                        ])
 
-            # Métricas agregadas
-            avg_turnaround = (
-                sum(self.tempos_de_turnaround) / len(self.tempos_de_turnaround)
-                if self.tempos_de_turnaround else 0
-            )
+                # Linha em branco
+                writer.writerow([])
 
+            # Métricas agregadas
+            estatisticas = self.estatisticas
             writer.writerow(["Métricas Finais"])
-            writer.writerow(["Turnaround Médio (s)", f"{avg_turnaround:.2f}"])
+            writer.writerow(["Tarefas Concluídas", estatisticas.concluidas])
+            if estatisticas.concluidas:
+                for nome, rotulo, media in (("turnaround", "Turnaround", "Turnaround Médio"),
+                                            ("espera", "Espera", "Espera Média"),
+                                            ("resposta", "Resposta", "Resposta Média")):
+                    resumo = estatisticas.resumo(nome)
+                    writer.writerow([f"{media} (s)", f"{resumo['media']:.2f}"])
+                    for chave in ("p50", "p95", "p99", "max"):
+                        writer.writerow([f"{rotulo} {chave} (s)", f"{resumo[chave]:.2f}"])
+            else:
+                writer.writerow(["Turnaround Médio (s)", "N/A"])
             writer.writerow(["Sobrecarga Total (s)", f"{self.sobrecarga_total:.2f}"])
             writer.writerow(["Total de Deadlines Perdidos", self.deadlines_perdidos])
+            if estatisticas.com_deadline:
+                writer.writerow(["Taxa de Perda de Deadlines (%)", f"{100 * estatisticas.taxa_perda:.1f}"])
+                writer.writerow(["Atraso Máximo (s)", f"{estatisticas.atraso_maximo:.2f}"])
+            ocupacao = self._ocupacao()
+            if ocupacao is not None:
+                for processador, o in enumerate(ocupacao):
+                    writer.writerow([f"Ocupação do Processador {processador} (%)", f"{100 * o:.1f}"])
 
         print(f"\n Métricas salvas em: {caminho_completo}")
 
 # --- IMPLEMENTAÇÕES DOS ESCALONADORES ---
 
 class EscalonadorFIFO(EscalonadorCAV):
-    def escalonar(self):
-        self.resetar_estado_simulacao()
-        print("--- Escalonamento FIFO ---")
-        tempo_atual_simulacao = 0
-        for tarefa in self.tarefas_para_escalonar:
-            print(f"Tempo: {tempo_atual_simulacao:.2f}s - Executando tarefa {tarefa.nome}...")
-            inicio_exec = tempo_atual_simulacao
-            tempo_atual_simulacao += tarefa.duracao
-            tarefa.tempos_execucao.append((inicio_exec, tempo_atual_simulacao))
-            tarefa.tempo_final = tempo_atual_simulacao
-            tarefa.tempo_restante = 0
-            print(f"Tarefa {tarefa.nome} finalizada em {tarefa.tempo_final:.2f}s.\n")
-        print(self.tarefas_para_escalonar)    
+    FORMATO_CONSOLE = "tarefa"
+
+    def cabecalho(self):
+        return "--- Escalonamento FIFO ---"
 
 class EscalonadorSJF(EscalonadorCAV):
-    def escalonar(self):
-        self.resetar_estado_simulacao()
-        print("--- Escalonamento SJF ---")
-        self.tarefas_para_escalonar.sort(key=lambda tarefa: tarefa.duracao)
-        tempo_atual_simulacao = 0
-        fila = [tarefa for tarefa in self.tarefas_para_escalonar if tarefa.tempo_chegada <= tempo_atual_simulacao]
-        fila.sort(key=lambda t: t.duracao)
-        for _ in range(len(self.tarefas_para_escalonar)):
-            tarefa = fila[0]
-            print(f"Tempo: {tempo_atual_simulacao:.2f}s - Executando tarefa {tarefa.nome}...")
-            inicio_exec = tempo_atual_simulacao
-            tempo_atual_simulacao += tarefa.duracao
-            tarefa.tempos_execucao.append((inicio_exec, tempo_atual_simulacao))
-            tarefa.tempo_final = tempo_atual_simulacao
-            tarefa.tempo_restante = 0
-            tarefa.foi_executada = True
-            print(f"Tarefa {tarefa.nome} finalizada em {tarefa.tempo_final:.2f}s.\n")
-            fila = [tarefa for tarefa in self.tarefas_para_escalonar if tarefa.tempo_chegada <= tempo_atual_simulacao and not tarefa.foi_executada]
-            fila.sort(key=lambda t: t.duracao)
+    FORMATO_CONSOLE = "tarefa"
+
+    def cabecalho(self):
+        return "--- Escalonamento SJF ---"
+
+    def criar_fila_prontos(self):
+        tabela = self.tarefas_para_escalonar
+        return FilaHeap(chave=lambda tarefa: tabela.duracao[tarefa])
 
 class EscalonadorRoundRobin(EscalonadorCAV):
     def __init__(self, quantum, tarefas_iniciais):
         super().__init__(tarefas_iniciais)
         self.quantum = quantum
 
-    def escalonar(self):
-        self.resetar_estado_simulacao()
-        print(f"--- Escalonamento Round Robin (Quantum: {self.quantum}s) ---")
-        tempo_atual_simulacao = 0
-        fila = [tarefa for tarefa in self.tarefas_para_escalonar if tarefa.tempo_chegada <= tempo_atual_simulacao and not tarefa.foi_executada]
-        while fila:
-            tarefa = fila.pop(0)
-            inicio_exec = tempo_atual_simulacao
-            tempo_exec = min(tarefa.tempo_restante, self.quantum)
-            tarefa.tempo_restante -= tempo_exec
-            print(f"Tempo: {tempo_atual_simulacao:.2f}s - Executando {tarefa.nome} por {tempo_exec:.2f}s.")
-            tempo_atual_simulacao += tempo_exec
-            tarefa.tempos_execucao.append((inicio_exec, tempo_atual_simulacao))
-            for t in self.tarefas_para_escalonar:
-                if not t in fila and inicio_exec <= t.tempo_chegada <= tempo_atual_simulacao and t != tarefa:
-                    fila.append(t)
-            if tarefa.tempo_restante > 0 and not tarefa in fila:
-                fila.append(tarefa)
-                self.registrar_sobrecarga()
-            else:
-                tarefa.tempo_final = tempo_atual_simulacao
-                tarefa.foi_executada = True
-                print(f"-> Tarefa {tarefa.nome} finalizada em {tarefa.tempo_final:.2f}s.\n")
+    def cabecalho(self):
+        return f"--- Escalonamento Round Robin (Quantum: {self.quantum}s) ---"
 
 class EscalonadorPrioridade(EscalonadorCAV):
-    def __init__(self, tarefas_iniciais,quantum):
+    """
+    Escalonador por prioridade (menor número = maior prioridade), com a fila
+    de níveis FilaPrioridadeBitmap. Com 'envelhecimento', as tarefas que
+    esperam sobem um nível a cada tantas decisões.
+    """
+    def __init__(self, tarefas_iniciais,quantum, niveis_prioridade=140, envelhecimento=None):
         super().__init__(tarefas_iniciais)
         self.quantum = quantum
+        self.niveis_prioridade = niveis_prioridade
+        self.envelhecimento = envelhecimento
 
-    def escalonar(self):
-        self.resetar_estado_simulacao()
-        print("--- Escalonamento por Prioridade ---")
-        tempo_atual_simulacao = 0
-        fila = [tarefa for tarefa in self.tarefas_para_escalonar if tarefa.tempo_chegada <= tempo_atual_simulacao and not tarefa.foi_executada]
-        while fila:
-            tarefa = fila.pop(0)
-            inicio_exec = tempo_atual_simulacao
-            tempo_exec = min(tarefa.tempo_restante, self.quantum)
-            tarefa.tempo_restante -= tempo_exec
-            print(f"Tempo: {tempo_atual_simulacao:.2f}s - Executando {tarefa.nome} por {tempo_exec:.2f}s.")
-            tempo_atual_simulacao += tempo_exec
-            tarefa.tempos_execucao.append((inicio_exec, tempo_atual_simulacao))
-            for t in self.tarefas_para_escalonar:
-                if not t in fila and inicio_exec <= t.tempo_chegada <= tempo_atual_simulacao and t != tarefa:
-                    fila.append(t)
-                    fila.sort(key=lambda t: t.prioridade)
-            if tarefa.tempo_restante > 0 and not tarefa in fila:
-                fila.append(tarefa)
-                fila.sort(key=lambda t: t.prioridade)
-                self.registrar_sobrecarga()
+    def cabecalho(self):
+        return "--- Escalonamento por Prioridade ---"
 
-            else:
-                tarefa.tempo_final = tempo_atual_simulacao
-                tarefa.foi_executada = True
-                print(f"-> Tarefa {tarefa.nome} finalizada em {tarefa.tempo_final:.2f}s.\n")
+    def criar_fila_prontos(self):
+        # Empates em ordem de chegada na fila
+        tabela = self.tarefas_para_escalonar
+        return FilaPrioridadeBitmap(lambda tarefa: tabela.prioridade.item(tarefa), self.niveis_prioridade,
+                                    self.envelhecimento)
 
 class EscalonadorEDF(EscalonadorCAV):
+    FORMATO_CONSOLE = "deadline"
+
     def __init__(self, tarefas_iniciais, quantum=1):
         super().__init__(tarefas_iniciais)
         self.quantum = quantum
 
-    def escalonar(self):
-        self.resetar_estado_simulacao()
-        print(f"--- Escalonamento EDF (Quantum: {self.quantum}s) ---")
-        tempo_atual_simulacao = 0
-        tarefas_pendentes = [tarefa for tarefa in self.tarefas_para_escalonar if tarefa.tempo_chegada <= tempo_atual_simulacao and not tarefa.foi_executada]
-        while tarefas_pendentes:
-            tarefa_atual = tarefas_pendentes.pop(0)
-            inicio_exec = tempo_atual_simulacao
-            tempo_exec = min(tarefa_atual.tempo_restante, self.quantum)
-            tarefa_atual.tempo_restante -= tempo_exec
-            print(f"Tempo: {tempo_atual_simulacao:.2f}s - Executando {tarefa_atual.nome} por {tempo_exec:.2f}s.")
-            tempo_atual_simulacao += tempo_exec
-            tarefa_atual.tempos_execucao.append((inicio_exec, tempo_atual_simulacao))
-            for t in self.tarefas_para_escalonar:
-                if not t in tarefas_pendentes and inicio_exec <= t.tempo_chegada <= tempo_atual_simulacao and t != tarefa_atual:
-                    tarefas_pendentes.append(t)
-                    tarefas_pendentes.sort(key=lambda t: t.deadline - tempo_exec)
-            if tarefa_atual.tempo_restante > 0 and not tarefa_atual in tarefas_pendentes:
-                tarefas_pendentes.append(tarefa_atual)
-                tarefas_pendentes.sort(key=lambda t: t.deadline - tempo_exec)
-                self.registrar_sobrecarga()
-            else:
-                tarefa_atual.tempo_final = tempo_atual_simulacao
-                print(f"   -> Tarefa {tarefa_atual.nome} finalizada em {tarefa_atual.tempo_final:.2f}s.")
-                if tarefa_atual.tempo_final - tarefa_atual.tempo_chegada > tarefa_atual.deadline:
-                    print(f"   -> DEADLINE PERDIDO!\n")
-                    self.deadlines_perdidos += 1  # Contador incrementado
-                else:
-                    print(f"   -> Deadline cumprido.\n")
+    def cabecalho(self):
+        return f"--- Escalonamento EDF (Quantum: {self.quantum}s) ---"
 
-class EscalonadorSRTF(EscalonadorCAV):
+    def criar_fila_prontos(self):
+        tabela = self.tarefas_para_escalonar
+        return FilaHeap(chave=lambda tarefa: tabela.deadline[tarefa])
+
+class EscalonadorEDFPreemptivo(EscalonadorCAV):
     """
-    Escalonador Shortest Remaining Time First (SRTF) - Preemptivo.
-    A cada instante, seleciona a tarefa com o menor tempo restante para executar.
+    EDF preemptivo pelo deadline absoluto (chegada + deadline relativo): a
+    tarefa que vence primeiro executa, e uma chegada que vence antes da tarefa
+    em execução a interrompe. É o EDF ideal dos testes de escalonabilidade
+    (ver teste_demanda_edf e ControleAdmissao): num processador, as tarefas
+    admitidas pelo ControleAdmissao cumprem seus deadlines. Sem deadline, a
+    tarefa vai para o fim da fila.
     """
-    def escalonar(self):
-        self.resetar_estado_simulacao()
-        print("--- Escalonamento SRTF (Shortest Remaining Time First) ---")
+    PREEMPTIVO = True
+    SOBRECARGA_A_CADA_DESPACHO = True
+    FORMATO_CONSOLE = "deadline"
 
-        tempo_atual_simulacao = 0
-        tarefas_concluidas = 0
-        total_tarefas = len(self.tarefas_para_escalonar)
-        tarefa_em_execucao = None
+    def cabecalho(self):
+        return "--- Escalonamento EDF Preemptivo (deadline absoluto) ---"
 
-        while tarefas_concluidas < total_tarefas:
-            # Filtra tarefas que já chegaram e ainda não foram concluídas
-            fila_prontos = [t for t in self.tarefas_para_escalonar if t.tempo_chegada <= tempo_atual_simulacao and t.tempo_restante > 0]
+    def deadline_absoluto(self, tarefa):
+        tabela = self.tarefas_para_escalonar
+        deadline = tabela.deadline.item(tarefa)
+        return math.inf if math.isnan(deadline) else tabela.tempo_chegada.item(tarefa) + deadline
 
-            if not fila_prontos:
-                # Se não há tarefas prontas, avança o tempo para a próxima chegada
-                tempo_atual_simulacao += 1
-                continue
+    def criar_fila_prontos(self):
+        return FilaHeap(chave=self.deadline_absoluto)
 
-            # Ordena a fila de prontos pelo menor tempo restante
-            fila_prontos.sort(key=lambda t: t.tempo_restante)
-            proxima_tarefa = fila_prontos[0]
+    def deve_preemptar(self, tarefa, restante, candidata):
+        return self.deadline_absoluto(candidata) < self.deadline_absoluto(tarefa)
 
-            # Lógica de preempção e troca de contexto
-            if tarefa_em_execucao != proxima_tarefa:
-                self.registrar_sobrecarga()
-                tarefa_em_execucao = proxima_tarefa
-                print(f"Tempo: {tempo_atual_simulacao:.2f}s - Assumindo tarefa {tarefa_em_execucao.nome} (Restante: {tarefa_em_execucao.tempo_restante:.2f}s)")
+    def chave_preempcao(self, tarefa, restante):
+        return self.deadline_absoluto(tarefa)
 
-            # Executa a tarefa por uma unidade de tempo
-            inicio_burst = tempo_atual_simulacao
-            tarefa_em_execucao.tempo_restante -= 1
-            tempo_atual_simulacao += 1
-            
-            # Registra o burst de execução (mesmo que seja de 1s)
-            # Para o Gantt, podemos otimizar depois, mas vamos registrar tudo por enquanto
-            if not tarefa_em_execucao.tempos_execucao or tarefa_em_execucao.tempos_execucao[-1][1] != inicio_burst:
-                tarefa_em_execucao.tempos_execucao.append([inicio_burst, tempo_atual_simulacao])
-            else: # Estende o burst anterior
-                tarefa_em_execucao.tempos_execucao[-1][1] = tempo_atual_simulacao
-
-
-            # Verifica se a tarefa terminou
-            if tarefa_em_execucao.tempo_restante <= 0:
-                tarefa_em_execucao.tempo_final = tempo_atual_simulacao
-                tarefas_concluidas += 1
-                tarefa_em_execucao = None # Limpa a tarefa em execução
-                print(f"-> Tarefa {proxima_tarefa.nome} finalizada em {proxima_tarefa.tempo_final:.2f}s.\n")
-                if proxima_tarefa.tempo_final - proxima_tarefa.tempo_chegada > proxima_tarefa.deadline:
-                    self.deadlines_perdidos += 1
+class EscalonadorSRTF(EscalonadorCAV):
+    """
+    Escalonador Shortest Remaining Time First (SRTF) - Preemptivo.
+    A cada chegada, a tarefa com o menor tempo restante assume o processador.
+    """
+    PREEMPTIVO = True
+    SOBRECARGA_A_CADA_DESPACHO = True
+    FORMATO_CONSOLE = "restante"
+
+    def cabecalho(self):
+        return "--- Escalonamento SRTF (Shortest Remaining Time First) ---"
+
+    def criar_fila_prontos(self):
+        # A chave é o tempo restante no momento da inserção: só a tarefa em
+        # execução tem o tempo restante alterado enquanto está fora da fila.
+        tabela = self.tarefas_para_escalonar
+        return FilaHeap(chave=lambda tarefa: tabela.tempo_restante[tarefa])
+
+    def deve_preemptar(self, tarefa, restante, candidata):
+        return self.tarefas_para_escalonar.tempo_restante[candidata] < restante
 
 class EscalonadorRoundRobinDinamico(EscalonadorCAV):
     """
     Escalonador Round Robin com Quantum Dinâmico baseado na prioridade.
     Tarefas de maior prioridade (menor número) recebem um quantum maior.
+
+    Com 'niveis_prioridade', a fila também é por prioridade (a de
+    EscalonadorPrioridade, com 'envelhecimento' opcional) em vez de circular.
     """
-    def __init__(self, quantum_base, tarefas_iniciais):
+    def __init__(self, quantum_base, tarefas_iniciais, niveis_prioridade=None, envelhecimento=None):
         super().__init__(tarefas_iniciais)
         self.quantum_base = quantum_base
+        self.prioridade_max = 0
+        self.niveis_prioridade = niveis_prioridade
+        self.envelhecimento = envelhecimento
 
-    def escalonar(self):
-        self.resetar_estado_simulacao()
-        print(f"--- Escalonamento Round Robin com Quantum Dinâmico (Base: {self.quantum_base}s) ---")
-        
-        if not self.tarefas_para_escalonar:
-            return
+    def cabecalho(self):
+        return f"--- Escalonamento Round Robin com Quantum Dinâmico (Base: {self.quantum_base}s) ---"
 
+    def resetar_estado_simulacao(self):
+        super().resetar_estado_simulacao()
         # Encontra a prioridade máxima (menor número) para o cálculo
-        prioridade_max = max(t.prioridade for t in self.tarefas_para_escalonar)
-        
-        tempo_atual_simulacao = 0
-        fila = [tarefa for tarefa in self.tarefas_para_escalonar if tarefa.tempo_chegada <= tempo_atual_simulacao and not tarefa.foi_executada]
-        while fila:
-            tarefa = fila.pop(0)
-            quantum_dinamico = self.quantum_base + (prioridade_max - tarefa.prioridade)
-            inicio_exec = tempo_atual_simulacao
-            tempo_exec = min(tarefa.tempo_restante, quantum_dinamico)
-            tarefa.tempo_restante -= tempo_exec
-            print(f"Tempo: {tempo_atual_simulacao:.2f}s - Executando {tarefa.nome} por {tempo_exec:.2f}s.")
-            tempo_atual_simulacao += tempo_exec
-            tarefa.tempos_execucao.append((inicio_exec, tempo_atual_simulacao))
-            for t in self.tarefas_para_escalonar:
-                if not t in fila and inicio_exec <= t.tempo_chegada <= tempo_atual_simulacao and t != tarefa:
-                    fila.append(t)
-            if tarefa.tempo_restante > 0 and not tarefa in fila:
-                fila.append(tarefa)
-                self.registrar_sobrecarga()
-            else:
-                tarefa.tempo_final = tempo_atual_simulacao
-                tarefa.foi_executada = True
-                print(f"-> Tarefa {tarefa.nome} finalizada em {tarefa.tempo_final:.2f}s.\n")
\ No newline at end of file
+        prioridades = self.tarefas_para_escalonar.prioridade
+        self.prioridade_max = prioridades.max().item() if len(prioridades) and not self._dinamica else 0
+
+    def criar_fila_prontos(self):
+        if self.niveis_prioridade is None:
+            return super().criar_fila_prontos()
+        tabela = self.tarefas_para_escalonar
+        return FilaPrioridadeBitmap(lambda tarefa: tabela.prioridade.item(tarefa), self.niveis_prioridade,
+                                    self.envelhecimento)
+
+    def fatia_de_execucao(self, tarefa):
+        tabela = self.tarefas_para_escalonar
+        if self._dinamica:
+            # Num fluxo, a prioridade máxima só é conhecida entre as tarefas já admitidas
+            self.prioridade_max = tabela.prioridade_maxima
+        return self.quantum_base + (self.prioridade_max - tabela.prioridade[tarefa].item())
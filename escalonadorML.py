@@ -1,159 +1,343 @@
-import pandas as pd
-import random
-from sklearn.tree import DecisionTreeClassifier
+import os
+
+import numpy as np
+from arvore_compilada import ArvoreCompilada
 from tarefa import TarefaCAV
 from escalonador import EscalonadorCAV
 
+# Ordem das colunas de entrada do modelo (as 4 primeiras são estáticas por tarefa)
+COLUNAS_MODELO = ["duracao", "prioridade", "tempo_chegada", "deadline", "tempo_atual", "slack", "espera"]
+DURACAO, PRIORIDADE, CHEGADA, DEADLINE, TEMPO_ATUAL, SLACK, ESPERA = range(len(COLUNAS_MODELO))
+
+
+# --- Features do modelo (únicas para a simulação e para os dados de treino) ---
+
+def _features_estaticas(tabela, tarefas):
+    """Colunas estáticas (as anteriores a TEMPO_ATUAL) de uma tarefa ou array de tarefas da tabela."""
+    return tabela.duracao[tarefas], tabela.prioridade[tarefas], tabela.tempo_chegada[tarefas], tabela.deadline[tarefas]
+
+
+def _atualizar_features(x, tempo_atual):
+    """Recalcula, em x (já com as colunas estáticas), as colunas que dependem do tempo atual."""
+    x[:, TEMPO_ATUAL] = tempo_atual
+    x[:, SLACK] = x[:, DEADLINE] - tempo_atual - x[:, DURACAO]
+    x[:, ESPERA] = tempo_atual - x[:, CHEGADA]
+    return x
+
+
+def features(tabela, tarefas, tempo_atual):
+    """Matriz de features (uma linha por tarefa, na ordem de COLUNAS_MODELO) das tarefas da tabela."""
+    tarefas = np.asarray(tarefas, dtype=np.int64)
+    x = np.empty((len(tarefas), len(COLUNAS_MODELO)))
+    x[:, :TEMPO_ATUAL] = np.column_stack(_features_estaticas(tabela, tarefas))
+    return _atualizar_features(x, tempo_atual)
+
+
+class FilaML:
+    """
+    Fila de prontos do EscalonadorML: mantém a matriz de features das tarefas
+    prontas. As colunas estáticas são copiadas uma vez na inserção; a cada
+    decisão só tempo_atual, slack e espera são recalculadas, de forma vetorizada.
+    """
+    def __init__(self, tabela, modelo, relogio, capacidade=64):
+        self._tabela = tabela
+        self._modelo = modelo
+        self._relogio = relogio  # Função que devolve o tempo atual da simulação
+        self._x = np.empty((min(capacidade, max(len(tabela), 1)), len(COLUNAS_MODELO)))
+        self._ids = np.empty(len(self._x), dtype=np.int64)
+        self._ordem = np.empty(len(self._x), dtype=np.int64)  # Identificador estável, para desempate
+        self._n = 0
+        self._escolha = None  # Linha já pontuada por escalonar_em_lote
+
+    def __len__(self):
+        return self._n
+
+    def __iter__(self):
+        return iter(self._ids[:self._n].tolist())
+
+    def inserir(self, tarefa):
+        if self._n == len(self._x):
+            self._x = np.concatenate([self._x, np.empty_like(self._x)])
+            self._ids = np.concatenate([self._ids, np.empty_like(self._ids)])
+            self._ordem = np.concatenate([self._ordem, np.empty_like(self._ordem)])
+        self._x[self._n, :TEMPO_ATUAL] = _features_estaticas(self._tabela, tarefa)
+        self._ids[self._n] = tarefa
+        self._ordem[self._n] = self._tabela.identificador(tarefa)
+        self._n += 1
+        self._escolha = None
+
+    def features(self, tempo_atual):
+        """Atualiza e devolve a matriz (visão) de features das tarefas prontas."""
+        return _atualizar_features(self._x[:self._n], tempo_atual)
+
+    def definir_probabilidades(self, probabilidades):
+        """Registra as probabilidades de "escolhida" calculadas fora da fila (modo em lote)."""
+        self._escolha = self._melhor_linha(probabilidades)
+
+    def _melhor_linha(self, probabilidades):
+        # Em empate, vence a tarefa que aparece primeiro na lista original
+        empatadas = np.flatnonzero(probabilidades == probabilidades.max())
+        return empatadas[np.argmin(self._ordem[empatadas])]
+
+    def remover(self):
+        linha = self._escolha
+        if linha is None:
+            x = self.features(self._relogio())
+            linha = self._melhor_linha(self._modelo.predict_proba(x)[:, 1])
+        self._escolha = None
+        return self._remover_linha(linha)
+
+    def remover_tarefa(self, tarefa):
+        """Retira uma tarefa específica (no lugar da escolha do modelo) e a devolve."""
+        linhas = np.flatnonzero(self._ids[:self._n] == tarefa)
+        if not len(linhas):
+            raise ValueError(f"A tarefa {tarefa} não está na fila.")
+        self._escolha = None
+        return self._remover_linha(linhas[0])
+
+    def _remover_linha(self, linha):
+        tarefa = self._ids[linha].item()
+        ultima = self._n - 1
+        self._x[linha] = self._x[ultima]
+        self._ids[linha] = self._ids[ultima]
+        self._ordem[linha] = self._ordem[ultima]
+        self._n = ultima
+        return tarefa
+
+    def copiar_conteudo(self, outra):
+        """Passa a ter as tarefas prontas de 'outra' (ver EscalonadorCAV.bifurcar)."""
+        self._x = outra._x.copy()
+        self._ids = outra._ids.copy()
+        self._ordem = outra._ordem.copy()
+        self._n = outra._n
+        self._escolha = outra._escolha
+
+
 # --- Escalonador com ML supervisionado ---
 class EscalonadorML(EscalonadorCAV):
+    SOBRECARGA_A_CADA_DESPACHO = True
+    FORMATO_CONSOLE = "burst"
+
     def __init__(self, tarefas_iniciais, modelo, quantum=None):
         super().__init__(tarefas_iniciais)
         self.modelo = modelo
         self.quantum = quantum
 
+    def cabecalho(self):
+        return "--- Escalonamento com ML supervisionado ---"
+
+    def criar_fila_prontos(self):
+        modelo = self.modelo
+        if self.perfil is not None:
+            # A inferência é a maior parte da latência de decisão do ML
+            modelo = self.perfil.envolver(self, modelo, {"predict_proba": "modelo"})
+        return FilaML(self.tarefas_para_escalonar, modelo, lambda: self.tempo_atual_simulacao)
+
     def escolher_tarefa(self, tempo_atual, tarefas_disponiveis):
         if not tarefas_disponiveis:
             return None
 
-        entradas = pd.DataFrame([
-            {
-                "duracao": t.duracao,
-                "prioridade": t.prioridade,
-                "tempo_chegada": t.tempo_chegada,
-                "deadline": t.deadline,
-                "tempo_atual": tempo_atual,
-                "slack": t.deadline - tempo_atual - t.duracao,
-                "espera": tempo_atual - t.tempo_chegada
-            }
+        entradas = np.array([
+            [t.duracao, t.prioridade, t.tempo_chegada, t.deadline, tempo_atual,
+             t.deadline - tempo_atual - t.duracao, tempo_atual - t.tempo_chegada]
             for t in tarefas_disponiveis
-        ])
+        ], dtype=np.float64)
 
         # Obtém as probabilidades da classe "Escolhida"
-        probabilidades = self.modelo.predict_proba(entradas)
+        probabilidades = self.modelo.predict_proba(entradas)[:, 1]
 
         # Escolhe a tarefa com maior probabilidade de ser "escolhida"
-        escolhida = max(zip(tarefas_disponiveis, probabilidades), key=lambda x: x[1][1])[0]
-        
-        return escolhida
-
-
-    def escalonar(self):
-        self.resetar_estado_simulacao()
-        print("--- Escalonamento com ML supervisionado ---")
-
-        tempo_atual_simulacao = 0
-        tarefas_pendentes = list(self.tarefas_para_escalonar)
-
-        while any(t.tempo_restante > 0 for t in tarefas_pendentes):
-            # Filtra tarefas disponíveis no tempo atual
-            disponiveis = [t for t in tarefas_pendentes if t.tempo_restante > 0 and t.tempo_chegada <= tempo_atual_simulacao]
-
-            if not disponiveis:
-                tempo_atual_simulacao += 1
-                continue
-
-            # Escolhe a próxima tarefa usando o modelo
-            tarefa = self.escolher_tarefa(tempo_atual_simulacao, disponiveis)
-            self.registrar_sobrecarga()
-
-            # Define tempo de execução (com quantum, se houver)
-            tempo_exec = tarefa.tempo_restante
-            if self.quantum is not None:
-                tempo_exec = min(self.quantum, tarefa.tempo_restante)
-
-            inicio_exec = tempo_atual_simulacao
-            tempo_atual_simulacao += tempo_exec
-
-            # Atualiza estado da tarefa
-            tarefa.tempos_execucao.append((inicio_exec, tempo_atual_simulacao))
-            tarefa.tempo_restante -= tempo_exec
-
-            if tarefa.tempo_restante == 0:
-                tarefa.tempo_final = tempo_atual_simulacao
-                print(f"Tempo: {inicio_exec:.2f}s - Executou {tarefa.nome} até {tempo_atual_simulacao:.2f}s. Finalizada.")
-                
-                # Verifica deadline
-                if tarefa.deadline is not None:
-                    if tarefa.tempo_final - tarefa.tempo_chegada > tarefa.deadline :
-                        print(f"   -> DEADLINE PERDIDO para {tarefa.nome}!")
-                        self.deadlines_perdidos += 1
-                    else:
-                        print(f"   -> Deadline cumprido para {tarefa.nome}.")
+        return tarefas_disponiveis[int(np.argmax(probabilidades))]
+
+
+def escalonar_em_lote(escalonadores):
+    """
+    Executa várias simulações independentes do EscalonadorML em conjunto: a cada
+    rodada, as decisões pendentes de todas as simulações que usam o mesmo modelo
+    são pontuadas numa única chamada a predict_proba. Só para um processador.
+    """
+    ativos = []
+    for escalonador in escalonadores:
+        if escalonador.processadores != 1:
+            raise ValueError("escalonar_em_lote só aceita simulações com um processador.")
+        escalonador.resetar_estado_simulacao()
+        escalonador._iniciar_simulacao()
+        ativos.append(escalonador)
+
+    while ativos:
+        pendentes = []
+        for escalonador in ativos:
+            if escalonador._avancar_ate_decisao():
+                pendentes.append(escalonador)
             else:
-                print(f"Tempo: {inicio_exec:.2f}s - Executou {tarefa.nome} até {tempo_atual_simulacao:.2f}s. (resta {tarefa.tempo_restante:.2f}s)")
-
-# --- Função para gerar dados de treinamento supervisionado ---
-def gerar_dataset_supervisionado(n_amostras=1000, n_tarefas_por_amostra=5):
-    data = []
-
-    estrategias = [
-        ("SJF", lambda tarefas: min(tarefas, key=lambda t: t.duracao)),
-        ("Prioridade", lambda tarefas: min(tarefas, key=lambda t: t.prioridade)),
-        ("EDF", lambda tarefas: min(tarefas, key=lambda t: t.deadline)),
-    ]
-
-    for _ in range(n_amostras):
-        tarefas = []
-        for i in range(n_tarefas_por_amostra):
-            chegada = random.randint(0, 10)
-            duracao = random.randint(1, 10)
-            deadline = chegada + duracao + random.randint(5, 20)
-            prioridade = random.randint(1, 5)
-
-            tarefas.append(TarefaCAV(
-                nome=f"T{i}",
-                duracao=duracao,
-                prioridade=prioridade,
-                tempo_chegada=chegada,
-                deadline=deadline
-            ))
-
-        tempo_atual = min(t.tempo_chegada for t in tarefas)
-        candidatas = [t for t in tarefas if t.tempo_chegada <= tempo_atual]
-
-        if not candidatas:
-            continue
-
-        nome_estrategia, estrategia = random.choice(estrategias)
-        escolhida = estrategia(candidatas)
-
-        for t in tarefas:
-            slack = t.deadline - tempo_atual - t.duracao
-            espera = tempo_atual - t.tempo_chegada
-
-            data.append({
-                "duracao": t.duracao,
-                "prioridade": t.prioridade,
-                "tempo_chegada": t.tempo_chegada,
-                "deadline": t.deadline,
-                "tempo_atual": tempo_atual,
-                "slack": slack,
-                "espera": espera,
-                "algoritmo_origem": nome_estrategia,
-                "escolhida": int(t.nome == escolhida.nome)
-            })
-
-    df = pd.DataFrame(data)
+                escalonador._concluir_bursts()
+        ativos = pendentes
+        por_modelo = {}
+        for escalonador in ativos:
+            por_modelo.setdefault(id(escalonador.modelo), []).append(escalonador)
+
+        for grupo in por_modelo.values():
+            matrizes = [e.fila_prontos.features(e.tempo_atual_simulacao) for e in grupo]
+            probabilidades = grupo[0].modelo.predict_proba(np.concatenate(matrizes))[:, 1]
+            inicio = 0
+            for escalonador, x in zip(grupo, matrizes):
+                escalonador.fila_prontos.definir_probabilidades(probabilidades[inicio:inicio + len(x)])
+                inicio += len(x)
+                escalonador._despachar(escalonador.tempo_atual_simulacao)
+                escalonador.decisoes += 1
+
+# --- Geração vetorizada dos dados de treinamento supervisionado ---
+
+# Heurísticas usadas como rótulo; o código de cada uma é sua posição na lista
+ESTRATEGIAS = ["SJF", "Prioridade", "EDF"]
+
+
+def gerar_bloco_supervisionado(rng, n_amostras, n_tarefas_por_amostra=5):
+    """
+    Gera um bloco de amostras de uma só vez com operações NumPy. Cada amostra é
+    um conjunto de tarefas sorteadas; no instante da primeira chegada, uma
+    heurística sorteada (SJF, Prioridade ou EDF) escolhe entre as candidatas.
+    Devolve (X, y, estrategia), com uma linha de X por tarefa na ordem de
+    COLUNAS_MODELO.
+    """
+    forma = (n_amostras, n_tarefas_por_amostra)
+    chegada = rng.integers(0, 11, forma)
+    duracao = rng.integers(1, 11, forma)
+    deadline = chegada + duracao + rng.integers(5, 21, forma)
+    prioridade = rng.integers(1, 6, forma)
+
+    tempo_atual = chegada.min(axis=1, keepdims=True)
+    candidata = chegada <= tempo_atual
+
+    estrategia = rng.integers(0, len(ESTRATEGIAS), n_amostras)
+    chave = np.stack([duracao, prioridade, deadline])[estrategia, np.arange(n_amostras)]
+    # argmin devolve o primeiro mínimo, como min() na versão com laços
+    escolhida = np.where(candidata, chave, np.iinfo(chave.dtype).max).argmin(axis=1)
+
+    tempo_atual = np.broadcast_to(tempo_atual, forma)
+    X = np.stack([
+        duracao, prioridade, chegada, deadline, tempo_atual,
+        deadline - tempo_atual - duracao, tempo_atual - chegada,
+    ], axis=-1).reshape(-1, len(COLUNAS_MODELO)).astype(np.float32)
+    y = (np.arange(n_tarefas_por_amostra) == escolhida[:, None]).ravel().astype(np.int8)
+    return X, y, np.repeat(estrategia, n_tarefas_por_amostra).astype(np.int8)
+
+
+def gerar_blocos_supervisionados(n_amostras=1000, n_tarefas_por_amostra=5, semente=None,
+                                 amostras_por_bloco=100_000):
+    """Gera o dataset em blocos de tamanho fixo, para manter a memória limitada."""
+    rng = np.random.default_rng(semente)
+    for inicio in range(0, n_amostras, amostras_por_bloco):
+        yield gerar_bloco_supervisionado(rng, min(amostras_por_bloco, n_amostras - inicio),
+                                         n_tarefas_por_amostra)
+
+
+def salvar_dataset_em_blocos(diretorio, n_amostras, n_tarefas_por_amostra=5, semente=None,
+                             amostras_por_bloco=100_000):
+    """Grava o dataset em arquivos bloco_NNNNN.npz, um bloco por vez."""
+    os.makedirs(diretorio, exist_ok=True)
+    blocos = gerar_blocos_supervisionados(n_amostras, n_tarefas_por_amostra, semente, amostras_por_bloco)
+    for numero, (X, y, estrategia) in enumerate(blocos):
+        np.savez(os.path.join(diretorio, f"bloco_{numero:05d}.npz"), X=X, y=y, estrategia=estrategia)
+
+
+def carregar_blocos(diretorio):
+    """Lê, em ordem, os blocos gravados por salvar_dataset_em_blocos."""
+    for nome in sorted(os.listdir(diretorio)):
+        if nome.startswith("bloco_") and nome.endswith(".npz"):
+            with np.load(os.path.join(diretorio, nome)) as bloco:
+                yield bloco["X"], bloco["y"], bloco["estrategia"]
+
+
+def amostrar_blocos(blocos, max_amostras, semente=None):
+    """
+    Amostra uniforme (reservoir sampling) de até 'max_amostras' linhas dos
+    blocos (X, y, estrategia), lidos um por vez: a memória fica limitada a
+    'max_amostras' linhas mais um bloco, qualquer que seja o tamanho do
+    dataset. Devolve (X, y).
+    """
+    rng = np.random.default_rng(semente)
+    X = y = None
+    vistas = 0  # Linhas já lidas
+    for X_bloco, y_bloco, _ in blocos:
+        if X is None:
+            X = np.empty((max_amostras, X_bloco.shape[1]), dtype=X_bloco.dtype)
+            y = np.empty(max_amostras, dtype=y_bloco.dtype)
+        # Enquanto o reservatório não enche, as linhas entram direto
+        livres = min(max(max_amostras - vistas, 0), len(y_bloco))
+        X[vistas:vistas + livres] = X_bloco[:livres]
+        y[vistas:vistas + livres] = y_bloco[:livres]
+        # Depois, a linha de índice global i substitui uma posição sorteada em 0..i, se for < max_amostras
+        indices = np.arange(vistas + livres, vistas + len(y_bloco))
+        posicoes = rng.integers(0, indices + 1)
+        entram = np.flatnonzero(posicoes < max_amostras)
+        # Se duas linhas do bloco sorteiam a mesma posição, fica a última, como na versão sequencial
+        _, ultimas = np.unique(posicoes[entram][::-1], return_index=True)
+        entram = entram[::-1][ultimas]
+        X[posicoes[entram]] = X_bloco[livres + entram]
+        y[posicoes[entram]] = y_bloco[livres + entram]
+        vistas += len(y_bloco)
+    if X is None:
+        raise ValueError("Nenhum bloco de dados para amostrar.")
+    return X[:vistas], y[:vistas]
+
+
+def gerar_dataset_supervisionado(n_amostras=1000, n_tarefas_por_amostra=5, semente=None):
+    """Dataset completo em memória como DataFrame (para inspeção)."""
+    # pandas e scikit-learn são importados só quando usados: a simulação com uma
+    # ArvoreCompilada (arvore_compilada.py) depende apenas de NumPy
+    import pandas as pd
+
+    X, y, estrategia = gerar_bloco_supervisionado(np.random.default_rng(semente), n_amostras,
+                                                  n_tarefas_por_amostra)
+    df = pd.DataFrame(X.astype(np.int64), columns=COLUNAS_MODELO)
+    df["algoritmo_origem"] = np.array(ESTRATEGIAS)[estrategia]
+    df["escolhida"] = y
     return df
 
 
-def treinar_modelo_decision_tree():
-    df = gerar_dataset_supervisionado()
+def treinar_modelo_decision_tree(n_amostras=1000, n_tarefas_por_amostra=5, max_depth=6,
+                                 class_weight='balanced', semente=None, diretorio_blocos=None,
+                                 max_amostras=None):
+    """
+    Treina a árvore com um dataset gerado na hora ou, se 'diretorio_blocos' for
+    informado, com os blocos gravados por salvar_dataset_em_blocos.
+
+    A geração e a leitura em blocos limitam a memória só até o treino: o
+    scikit-learn precisa de todas as linhas de uma vez. Com 'max_amostras', o
+    treino usa uma amostra uniforme de no máximo essa quantidade de linhas (ver
+    amostrar_blocos) e a memória fica limitada também nele; sem, todas as
+    linhas são carregadas.
+    """
+    from sklearn.tree import DecisionTreeClassifier
+
+    if diretorio_blocos is not None:
+        blocos = carregar_blocos(diretorio_blocos)
+    else:
+        blocos = gerar_blocos_supervisionados(n_amostras, n_tarefas_por_amostra, semente)
+    if max_amostras is not None:
+        X, y = amostrar_blocos(blocos, max_amostras, semente)
+    else:
+        Xs, ys = [], []
+        for X_bloco, y_bloco, _ in blocos:
+            Xs.append(X_bloco)
+            ys.append(y_bloco)
+        X = np.concatenate(Xs)
+        y = np.concatenate(ys)
 
     print("\nExemplo de dados de treino:")
-    print(df.head(10))
-
-    X = df[["duracao", "prioridade", "tempo_chegada", "deadline", "tempo_atual", "slack", "espera"]]
-    y = df["escolhida"]
+    print(" ".join(COLUNAS_MODELO) + " escolhida")
+    for linha, rotulo in zip(X[:10], y[:10]):
+        print(" ".join(f"{v:g}" for v in linha), rotulo)
 
-    modelo = DecisionTreeClassifier(max_depth=6, class_weight='balanced')
+    modelo = DecisionTreeClassifier(max_depth=max_depth, class_weight=class_weight, random_state=semente)
     modelo.fit(X, y)
 
     acc = modelo.score(X, y)
     print(f"\nAcurácia no dataset gerado: {acc:.2f}")
 
     # plt.figure(figsize=(15, 6))
-    # tree.plot_tree(modelo, feature_names=X.columns, class_names=["Não escolhida", "Escolhida"], filled=True)
+    # tree.plot_tree(modelo, feature_names=COLUNAS_MODELO, class_names=["Não escolhida", "Escolhida"], filled=True)
     # plt.title("Árvore de Decisão do Escalonador ML")
     # plt.show()
 
@@ -170,5 +354,6 @@ if __name__ == "__main__":
         TarefaCAV("C", duracao=6, prioridade=3, tempo_chegada=2, deadline=20)
     ]
 
-    escalonador = EscalonadorML(tarefas, modelo, quantum=2)
+    # A árvore compilada dá as mesmas escolhas sem chamar o scikit-learn na simulação
+    escalonador = EscalonadorML(tarefas, ArvoreCompilada.de_modelo(modelo), quantum=2)
     escalonador.escalonar()
\ No newline at end of file
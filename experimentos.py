@@ -0,0 +1,214 @@
+import csv
+import inspect
+import itertools
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from tarefa import TabelaTarefas
+from escalonador import (
+    EscalonadorFIFO,
+    EscalonadorSJF,
+    EscalonadorRoundRobin,
+    EscalonadorPrioridade,
+    EscalonadorEDF,
+    EscalonadorSRTF,
+    EscalonadorRoundRobinDinamico
+)
+from escalonadorML import EscalonadorML
+from escalonabilidade import processadores_minimos
+from cache_resultados import CacheResultados
+
+COLUNAS_RESULTADO = [
+    "escalonador", "quantum", "semente", "n_tarefas",
+    "turnaround_medio", "turnaround_p95", "turnaround_p99", "espera_media", "atraso_maximo",
+    "sobrecarga_total", "deadlines_perdidos", "tempo_execucao_s", "do_cache"
+]
+
+
+# --- Cargas de trabalho ---
+
+def gerar_carga(semente, n_tarefas=10):
+    """Carga sintética com a mesma distribuição de App._criar_tarefas, reprodutível pela semente."""
+    rng = np.random.default_rng(semente)
+    tempo_chegada = np.arange(n_tarefas) * 2
+    duracao = rng.integers(3, 9, n_tarefas)
+    deadline = tempo_chegada + duracao + rng.integers(5, 21, n_tarefas)
+    prioridade = rng.integers(1, 6, n_tarefas)
+    return TabelaTarefas(None, duracao, prioridade, tempo_chegada, deadline)
+
+
+def criar_escalonador(classe, tarefas, quantum=None, modelo=None, processadores=1, particionado=False):
+    """Instancia qualquer escalonador, passando só os parâmetros que o construtor aceita."""
+    parametros = inspect.signature(classe.__init__).parameters
+    argumentos = {"tarefas_iniciais": tarefas}
+    if "quantum" in parametros:
+        argumentos["quantum"] = quantum
+    if "quantum_base" in parametros:
+        argumentos["quantum_base"] = quantum
+    if "modelo" in parametros:
+        argumentos["modelo"] = modelo
+    escalonador = classe(**argumentos)
+    escalonador.processadores = processadores
+    escalonador.particionado = particionado
+    return escalonador
+
+
+def processadores_necessarios(classe, tarefas, quantum=None, modelo=None, particionado=False,
+                              max_processadores=64):
+    """
+    Menor número de processadores com que a carga não perde nenhum deadline
+    (None se nem max_processadores bastar). Supõe que mais processadores nunca
+    aumentam as perdas, e por isso faz busca binária. A busca começa no limite
+    da análise de demanda (ver escalonabilidade.py), sem simular as
+    configurações que nenhuma política conseguiria cumprir.
+    """
+    def perdas(processadores):
+        escalonador = criar_escalonador(classe, tarefas, quantum, modelo, processadores, particionado)
+        escalonador.rastreio = None
+        escalonador.escalonar()
+        return escalonador.deadlines_perdidos
+
+    minimo = processadores_minimos(tarefas)
+    if minimo is None or minimo > max_processadores or perdas(max_processadores):
+        return None
+    maximo = max_processadores
+    while minimo < maximo:
+        meio = (minimo + maximo) // 2
+        if perdas(meio):
+            minimo = meio + 1
+        else:
+            maximo = meio
+    return minimo
+
+
+def usa_quantum(classe):
+    parametros = inspect.signature(classe.__init__).parameters
+    return "quantum" in parametros or "quantum_base" in parametros
+
+
+# --- Execução nos processos trabalhadores ---
+
+# Estado de cada processo trabalhador, recebido uma única vez na inicialização
+_cargas = {}
+_modelo = None
+_cache = None
+
+
+def _inicializar_trabalhador(cargas, modelo, diretorio_cache=None):
+    global _cargas, _modelo, _cache
+    _cargas = cargas
+    _modelo = modelo
+    _cache = None if diretorio_cache is None else CacheResultados(diretorio_cache)
+
+
+def _executar_configuracao(classe, quantum, semente):
+    tarefas = _cargas[semente]
+    escalonador = criar_escalonador(classe, tarefas, quantum, _modelo)
+    escalonador.rastreio = None  # Sem saída no console nos trabalhadores
+
+    inicio = time.perf_counter()
+    if _cache is None:
+        do_cache = False
+        escalonador.escalonar()
+    else:
+        do_cache = _cache.escalonar(escalonador)
+    duracao = time.perf_counter() - inicio
+
+    return resumir_resultado(escalonador, quantum, semente, duracao, do_cache)
+
+
+def resumir_resultado(escalonador, quantum, semente, tempo_execucao, do_cache=False):
+    estatisticas = escalonador.estatisticas
+    turnaround = estatisticas.resumo("turnaround")
+    return {
+        "escalonador": escalonador.__class__.__name__,
+        "quantum": quantum,
+        "semente": semente,
+        "n_tarefas": len(escalonador.tarefas_para_escalonar),
+        "turnaround_medio": turnaround["media"],
+        "turnaround_p95": turnaround["p95"],
+        "turnaround_p99": turnaround["p99"],
+        "espera_media": estatisticas.resumo("espera")["media"],
+        "atraso_maximo": estatisticas.atraso_maximo if estatisticas.com_deadline else float("nan"),
+        "sobrecarga_total": escalonador.sobrecarga_total,
+        "deadlines_perdidos": escalonador.deadlines_perdidos,
+        "tempo_execucao_s": tempo_execucao,
+        "do_cache": do_cache,
+    }
+
+
+def executar_ramos(escalonador, instante, variacoes):
+    """
+    Simula 'escalonador' até 'instante' uma única vez e, a partir dali, um ramo
+    por variação: um dicionário de atributos a trocar no ramo, como
+    {"quantum": 2}. Devolve os escalonadores dos ramos, já concluídos; só o
+    trecho de cada um posterior ao instante é simulado (ver Instantaneo).
+    """
+    escalonador.avancar(instante)
+    instantaneo = escalonador.instantaneo()
+    ramos = []
+    for variacao in variacoes:
+        ramo = instantaneo.bifurcar()
+        for atributo, valor in variacao.items():
+            setattr(ramo, atributo, valor)
+        ramo.continuar()
+        ramos.append(ramo)
+    return ramos
+
+
+# --- Execução da grade de experimentos ---
+
+def executar_experimentos(classes, quanta, sementes, n_tarefas=10, modelo=None, processos=None,
+                          diretorio_cache=None):
+    """
+    Executa todas as combinações (classe, quantum, semente) num pool de processos
+    e devolve as linhas de resultado à medida que terminam (gerador).
+
+    Escalonadores sem quantum rodam uma vez por semente. Cada processo recebe as
+    cargas (e o modelo, para o EscalonadorML) uma única vez, na inicialização.
+    Com 'diretorio_cache', os processos compartilham um CacheResultados em disco
+    e repetir a grade só simula as configurações novas (tempo_execucao_s passa
+    a ser o da leitura).
+    """
+    cargas = {semente: gerar_carga(semente, n_tarefas) for semente in sementes}
+    configuracoes = []
+    for classe in classes:
+        quanta_da_classe = quanta if usa_quantum(classe) else [None]
+        configuracoes.extend(itertools.product([classe], quanta_da_classe, sementes))
+
+    with ProcessPoolExecutor(max_workers=processos, initializer=_inicializar_trabalhador,
+                             initargs=(cargas, modelo, diretorio_cache)) as pool:
+        futuros = [pool.submit(_executar_configuracao, *configuracao) for configuracao in configuracoes]
+        for futuro in as_completed(futuros):
+            yield futuro.result()
+
+
+def salvar_resultados_csv(linhas, caminho):
+    """Grava as linhas (à medida que chegam, se for um gerador) num único CSV."""
+    with open(caminho, mode="w", newline="") as arquivo_csv:
+        writer = csv.DictWriter(arquivo_csv, fieldnames=COLUNAS_RESULTADO)
+        writer.writeheader()
+        for linha in linhas:
+            writer.writerow(linha)
+
+
+# --- Exemplo de execução ---
+if __name__ == "__main__":
+    from cache_modelos import CacheModelos
+
+    classes = [
+        EscalonadorFIFO, EscalonadorSJF, EscalonadorRoundRobin, EscalonadorPrioridade,
+        EscalonadorEDF, EscalonadorSRTF, EscalonadorRoundRobinDinamico, EscalonadorML
+    ]
+    resultados = executar_experimentos(classes, quanta=[1, 2, 4], sementes=range(20),
+                                       modelo=CacheModelos().obter())
+    salvar_resultados_csv(resultados, "resultados_experimentos.csv")
+    print("Resultados salvos em resultados_experimentos.csv")
+
+    # Quanta alternativos a partir da metade de uma simulação, sem refazer o começo
+    escalonador = EscalonadorRoundRobin(2, gerar_carga(semente=0, n_tarefas=200))
+    escalonador.rastreio = None
+    for ramo in executar_ramos(escalonador, 200, [{"quantum": q} for q in (1, 2, 4, 8)]):
+        print(f"Quantum {ramo.quantum} a partir de 200s: {ramo.deadlines_perdidos} deadlines perdidos")
@@ -0,0 +1,179 @@
+import heapq
+from collections import deque
+from itertools import count, islice
+
+# --- FILAS DE PRONTOS USADAS PELAS POLÍTICAS DE ESCALONAMENTO ---
+
+class FilaFIFO:
+    """Fila de prontos em ordem de chegada: inserção e remoção em O(1)."""
+    def __init__(self):
+        self._fila = deque()
+
+    def __len__(self):
+        return len(self._fila)
+
+    def inserir(self, tarefa):
+        self._fila.append(tarefa)
+
+    def __iter__(self):
+        return iter(self._fila)
+
+    def remover(self):
+        return self._fila.popleft()
+
+    def primeiras(self, k):
+        """As k próximas tarefas a sair, em ordem, sem retirá-las."""
+        return list(islice(self._fila, k))
+
+    def remover_tarefa(self, tarefa):
+        """Retira uma tarefa específica (no lugar da escolha da fila) e a devolve."""
+        self._fila.remove(tarefa)
+        return tarefa
+
+    def copiar_conteudo(self, outra):
+        """Passa a ter o conteúdo de 'outra' (da mesma classe); as duas seguem independentes."""
+        self._fila = deque(outra._fila)
+
+
+class FilaHeap:
+    """
+    Fila de prontos ordenada por uma chave (menor valor sai primeiro).
+    Empates saem na ordem de inserção, como numa ordenação estável.
+    """
+    def __init__(self, chave):
+        self._chave = chave
+        self._heap = []
+        self._sequencia = count()
+
+    def __len__(self):
+        return len(self._heap)
+
+    def inserir(self, tarefa):
+        heapq.heappush(self._heap, (self._chave(tarefa), next(self._sequencia), tarefa))
+
+    def __iter__(self):
+        return (tarefa for _, _, tarefa in self._heap)
+
+    def remover(self):
+        return heapq.heappop(self._heap)[2]
+
+    def remover_tarefa(self, tarefa):
+        """Retira uma tarefa específica (no lugar da de menor chave) e a devolve. O(n)."""
+        restantes = [entrada for entrada in self._heap if entrada[2] != tarefa]
+        if len(restantes) == len(self._heap):
+            raise ValueError(f"A tarefa {tarefa} não está na fila.")
+        heapq.heapify(restantes)
+        self._heap = restantes
+        return tarefa
+
+    def topo(self):
+        return self._heap[0][2]
+
+    def primeiras(self, k):
+        """As k próximas tarefas a sair, em ordem, sem retirá-las. O(n log k)."""
+        if k == 1:
+            return [self._heap[0][2]] if self._heap else []
+        return [tarefa for _, _, tarefa in heapq.nsmallest(k, self._heap)]
+
+    def copiar_conteudo(self, outra):
+        """
+        Passa a ter o conteúdo de 'outra' (da mesma classe), com as chaves já
+        calculadas; a contagem de desempate continua de onde a de 'outra' parou.
+        """
+        self._heap = list(outra._heap)
+        proxima = next(outra._sequencia)
+        outra._sequencia = count(proxima)
+        self._sequencia = count(proxima)
+
+
+class FilaPrioridadeBitmap:
+    """
+    Fila de prontos por níveis de prioridade inteiros (0 = mais alta), com uma
+    deque por nível e um bitmap dos níveis não vazios: inserção e remoção da
+    mais prioritária em O(1). No mesmo nível, sai primeiro quem entrou antes.
+    'chave' dá o nível da tarefa; valores fora de 0..niveis-1 vão para o
+    nível mais próximo.
+
+    Com 'envelhecimento', a cada tantas remoções todas as tarefas que esperam
+    sobem um nível (as do nível 1 entram no fim do nível 0), o que impede a
+    inanição das de baixa prioridade. Cada envelhecimento custa O(niveis).
+    """
+    def __init__(self, chave, niveis=140, envelhecimento=None):
+        if niveis < 1:
+            raise ValueError(f"Número de níveis inválido: {niveis!r}")
+        if envelhecimento is not None and envelhecimento < 1:
+            raise ValueError(f"Período de envelhecimento inválido: {envelhecimento!r}")
+        self._chave = chave
+        self.niveis = niveis
+        self.envelhecimento = envelhecimento
+        self._filas = [deque() for _ in range(niveis)]
+        self._bitmap = 0  # Bit i ligado = nível i não vazio
+        self._n = 0
+        self._remocoes = 0  # Desde o último envelhecimento
+
+    def __len__(self):
+        return self._n
+
+    def inserir(self, tarefa):
+        nivel = min(max(int(self._chave(tarefa)), 0), self.niveis - 1)
+        self._filas[nivel].append(tarefa)
+        self._bitmap |= 1 << nivel
+        self._n += 1
+
+    def __iter__(self):
+        return (tarefa for fila in self._filas for tarefa in fila)
+
+    def _nivel_mais_alto(self):
+        # Bit ligado menos significativo
+        return (self._bitmap & -self._bitmap).bit_length() - 1
+
+    def topo(self):
+        return self._filas[self._nivel_mais_alto()][0]
+
+    def primeiras(self, k):
+        """As k próximas tarefas a sair, em ordem, sem retirá-las (sem contar o envelhecimento)."""
+        return list(islice(self, k))
+
+    def remover(self):
+        nivel = self._nivel_mais_alto()
+        fila = self._filas[nivel]
+        tarefa = fila.popleft()
+        if not fila:
+            self._bitmap &= ~(1 << nivel)
+        self._n -= 1
+        if self.envelhecimento is not None:
+            self._remocoes += 1
+            if self._remocoes >= self.envelhecimento:
+                self._envelhecer()
+        return tarefa
+
+    def remover_tarefa(self, tarefa):
+        """Retira uma tarefa específica (no lugar da mais prioritária) e a devolve. O(n)."""
+        bitmap = self._bitmap
+        while bitmap:
+            nivel = (bitmap & -bitmap).bit_length() - 1
+            bitmap &= bitmap - 1
+            fila = self._filas[nivel]
+            if tarefa in fila:
+                fila.remove(tarefa)
+                if not fila:
+                    self._bitmap &= ~(1 << nivel)
+                self._n -= 1
+                return tarefa
+        raise ValueError(f"A tarefa {tarefa} não está na fila.")
+
+    def _envelhecer(self):
+        self._remocoes = 0
+        if self.niveis == 1:
+            return
+        filas = self._filas
+        filas[0].extend(filas.pop(1))
+        filas.append(deque())
+        self._bitmap = (self._bitmap >> 1) | (self._bitmap & 1)
+
+    def copiar_conteudo(self, outra):
+        """Passa a ter o conteúdo de 'outra' (da mesma classe); as duas seguem independentes."""
+        self._filas = [deque(fila) for fila in outra._filas]
+        self._bitmap = outra._bitmap
+        self._n = outra._n
+        self._remocoes = outra._remocoes
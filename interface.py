@@ -1,8 +1,10 @@
 # arquivo: interface.py
 
 import tkinter as tk
-from tkinter import messagebox
+from tkinter import messagebox, ttk
+import queue
 import random
+import threading
 
 # Importa as classes e funções dos outros arquivos do projeto
 from tarefa import TarefaCAV
@@ -13,31 +15,48 @@ from escalonador import (
     EscalonadorPrioridade, 
     EscalonadorEDF,
     EscalonadorSRTF,
-    EscalonadorRoundRobinDinamico
+    EscalonadorRoundRobinDinamico,
+    SimulacaoCancelada
 )
 # NOVO: Importa o módulo e a classe do escalonador de ML
-import escalonadorML
 from escalonadorML import EscalonadorML
+from cache_modelos import CacheModelos
+from cache_resultados import CacheResultados
 
-from visualizacao import visualizar_gantt
+# visualizacao (matplotlib) só é importado quando a primeira simulação é pedida,
+# para a janela abrir rápido; scikit-learn só é importado se for preciso treinar.
 
 class App:
     def __init__(self):
         """Construtor da nossa classe de interface gráfica."""
         self.root = tk.Tk()
         self.root.title("Simulador de Escalonamento de Tarefas CAV")
-        self.root.geometry("450x600") # Aumentamos a altura para os novos botões
+        self.root.geometry("450x750") # Aumentamos a altura para os novos botões
 
         # Variáveis de estado da aplicação
         self.tarefas_base = []
-        self.modelo_decision_tree = None # NOVO: Para armazenar o modelo treinado
+        self.modelo_decision_tree = None # Carregado do cache em segundo plano
+        self.modelo_pronto = threading.Event()
+        self.cache_modelos = CacheModelos()
+        self.cache_resultados = CacheResultados()  # Repetir uma simulação reaproveita o resultado
+        self.semente_modelo = 0
         self.listbox_tarefas = None
 
+        # Simulações rodam numa thread de trabalho; os resultados voltam por fila para a thread do Tk
+        self.fila_simulacoes = queue.Queue()
+        self.fila_resultados = queue.Queue()
+        self.escalonador_em_execucao = None
+        self.progresso_simulacao = 0.0
+        threading.Thread(target=self._trabalhador_simulacoes, daemon=True).start()
+
         # Cria os componentes da interface
         self._criar_widgets()
 
-        # Inicia com um conjunto de tarefas e treina o modelo
+        # Inicia com um conjunto de tarefas; o modelo é carregado (ou treinado) em
+        # segundo plano depois que a janela aparece
         self.redefinir_tarefas()
+        self.root.after(100, self._acompanhar_simulacoes)
+        self.root.after_idle(self._carregar_modelo_em_segundo_plano)
 
     def _criar_widgets(self):
         """Cria e organiza todos os componentes (widgets) na janela."""
@@ -45,9 +64,12 @@ class App:
         frame_gerenciamento = tk.Frame(self.root, pady=10)
         frame_gerenciamento.pack(fill=tk.X, padx=10)
 
-        btn_reset = tk.Button(frame_gerenciamento, text="Treinar Modelo e Gerar Novas Tarefas", command=self.redefinir_tarefas)
+        btn_reset = tk.Button(frame_gerenciamento, text="Gerar Novas Tarefas", command=self.redefinir_tarefas)
         btn_reset.pack(fill=tk.X)
 
+        self.btn_treinar = tk.Button(frame_gerenciamento, text="Retreinar Modelo de ML", command=self.retreinar_modelo)
+        self.btn_treinar.pack(fill=tk.X, pady=(5, 0))
+
         # --- Frame para a lista de tarefas ---
         frame_lista = tk.Frame(self.root, pady=5)
         frame_lista.pack(fill=tk.BOTH, expand=True, padx=10)
@@ -66,6 +88,15 @@ class App:
         frame_simulacao.pack(fill=tk.X, padx=10)
 
         tk.Frame(frame_simulacao, height=2, bd=1, relief=tk.SUNKEN).pack(fill=tk.X, pady=10)
+        # Processadores (núcleos/ECUs) da simulação: fila global ou particionada
+        frame_processadores = tk.Frame(frame_simulacao)
+        frame_processadores.pack(pady=(0, 5))
+        tk.Label(frame_processadores, text="Processadores:").pack(side=tk.LEFT)
+        self.var_processadores = tk.IntVar(value=1)
+        tk.Spinbox(frame_processadores, from_=1, to=16, width=4, textvariable=self.var_processadores).pack(side=tk.LEFT)
+        self.var_particionado = tk.BooleanVar(value=False)
+        tk.Checkbutton(frame_processadores, text="Particionado", variable=self.var_particionado).pack(side=tk.LEFT, padx=5)
+
         label_simulacao = tk.Label(frame_simulacao, text="Escolha um algoritmo para simular:")
         label_simulacao.pack()
         
@@ -85,6 +116,24 @@ class App:
             btn = tk.Button(frame_simulacao, text=f"Simular com {texto}", 
                             command=lambda t=tipo: self.executar_simulacao(t))
             btn.pack(pady=2, fill=tk.X, padx=20)
+            if tipo == "ML":
+                # Habilitado quando o modelo terminar de carregar (ver _acompanhar_simulacoes)
+                self.btn_ml = btn
+                self.texto_btn_ml = btn.cget("text")
+                btn.config(state=tk.DISABLED, text=f"{self.texto_btn_ml} (carregando modelo...)")
+
+        # --- Frame de progresso das simulações em andamento ---
+        frame_progresso = tk.Frame(self.root, pady=5)
+        frame_progresso.pack(fill=tk.X, padx=10)
+
+        self.label_progresso = tk.Label(frame_progresso, text="Nenhuma simulação em andamento.")
+        self.label_progresso.pack()
+
+        self.barra_progresso = ttk.Progressbar(frame_progresso, maximum=100)
+        self.barra_progresso.pack(fill=tk.X, pady=2)
+
+        btn_cancelar = tk.Button(frame_progresso, text="Cancelar Simulações", command=self.cancelar_simulacoes)
+        btn_cancelar.pack(fill=tk.X)
 
     def atualizar_listbox(self):
         """Limpa e preenche a Listbox com as tarefas atuais."""
@@ -124,14 +173,41 @@ class App:
         return tarefas
 
     def redefinir_tarefas(self):
-        """ATUALIZADO: Treina o modelo, gera um novo conjunto de tarefas e atualiza a interface."""
-        print("--- Treinando modelo de Machine Learning... ---")
-        self.modelo_decision_tree = escalonadorML.treinar_modelo_decision_tree()
-        print("--- Modelo treinado. Gerando novas tarefas... ---")
-        
+        """Gera um novo conjunto de tarefas e atualiza a interface."""
+        print("--- Gerando novas tarefas... ---")
         self.tarefas_base = self._criar_tarefas()
         self.atualizar_listbox()
 
+    def _carregar_modelo_em_segundo_plano(self, retreinar=False):
+        """Carrega do cache (ou treina) o modelo numa thread, sem bloquear a janela."""
+        self.modelo_pronto.clear()
+        self.btn_ml.config(state=tk.DISABLED, text=f"{self.texto_btn_ml} (carregando modelo...)")
+        self.btn_treinar.config(state=tk.DISABLED)
+
+        def carregar():
+            try:
+                if retreinar:
+                    print("--- Treinando modelo de Machine Learning... ---")
+                    self.modelo_decision_tree = self.cache_modelos.treinar(semente=self.semente_modelo)
+                else:
+                    print("--- Carregando modelo de Machine Learning... ---")
+                    self.modelo_decision_tree = self.cache_modelos.obter(semente=self.semente_modelo)
+                print("--- Modelo pronto. ---")
+            finally:
+                self.modelo_pronto.set()
+
+        threading.Thread(target=carregar, daemon=True).start()
+
+    def retreinar_modelo(self):
+        """
+        Treina explicitamente um novo modelo com a próxima semente. A semente faz
+        parte da chave do CacheModelos, então cada modelo retreinado é
+        reproduzível e pode ser obtido de novo com obter(semente=...).
+        """
+        self.semente_modelo += 1
+        print(f"--- Semente do novo modelo: {self.semente_modelo} ---")
+        self._carregar_modelo_em_segundo_plano(retreinar=True)
+
     def executar_simulacao(self, tipo_escalonador):
         """ATUALIZADO: Cria o escalonador correto, incluindo o de ML, e inicia a visualização."""
         if not self.tarefas_base:
@@ -163,14 +239,84 @@ class App:
             escalonador = EscalonadorRoundRobinDinamico(quantum_base=2, tarefas_iniciais=self.tarefas_base)
             titulo = "Round Robin Dinâmico"
         elif tipo_escalonador == "ML": 
-            if not self.modelo_decision_tree:
-                messagebox.showerror("Erro de Modelo", "O modelo de Machine Learning não foi treinado!")
+            if self.modelo_decision_tree is None:
+                messagebox.showerror("Erro de Modelo", "O modelo de Machine Learning não está disponível!")
                 return
             escalonador = EscalonadorML(tarefas_iniciais=self.tarefas_base, modelo=self.modelo_decision_tree, quantum=2)
             titulo = "Decision Tree Model"
         
         if escalonador:
-            visualizar_gantt(self.root, escalonador, titulo)
+            try:
+                processadores = self.var_processadores.get()
+            except tk.TclError:
+                processadores = 0
+            if processadores < 1:
+                messagebox.showerror("Erro", "O número de processadores deve ser um inteiro positivo!")
+                return
+            if processadores > 1:
+                escalonador.processadores = processadores
+                escalonador.particionado = self.var_particionado.get()
+                modo = "particionado" if escalonador.particionado else "global"
+                titulo = f"{titulo} - {processadores} processadores ({modo})"
+            self.fila_simulacoes.put((escalonador, titulo))
+
+    def _trabalhador_simulacoes(self):
+        """Executa, em ordem, as simulações enfileiradas (roda fora da thread do Tk)."""
+        while True:
+            escalonador, titulo = self.fila_simulacoes.get()
+            from visualizacao import simular  # Importado na primeira simulação pedida
+            horizonte = escalonador.horizonte_simulacao() or 1
+            self.progresso_simulacao = 0.0
+            escalonador.ao_progredir = lambda tempo: setattr(self, "progresso_simulacao", tempo / horizonte)
+            self.escalonador_em_execucao = (escalonador, titulo)
+            try:
+                chave = simular(escalonador, cache=self.cache_resultados)
+                self.fila_resultados.put(("concluida", (escalonador, chave), titulo))
+            except SimulacaoCancelada:
+                self.fila_resultados.put(("cancelada", escalonador, titulo))
+            except Exception as erro:
+                self.fila_resultados.put(("erro", erro, titulo))
+            finally:
+                self.escalonador_em_execucao = None
+
+    def _acompanhar_simulacoes(self):
+        """Atualiza o progresso e exibe os resultados prontos (roda na thread do Tk)."""
+        if self.modelo_pronto.is_set() and self.btn_treinar["state"] == tk.DISABLED:
+            self.btn_treinar.config(state=tk.NORMAL)
+            if self.modelo_decision_tree is not None:
+                self.btn_ml.config(state=tk.NORMAL, text=self.texto_btn_ml)
+            else:
+                self.btn_ml.config(text=f"{self.texto_btn_ml} (modelo indisponível)")
+
+        em_execucao = self.escalonador_em_execucao
+        if em_execucao is not None:
+            pendentes = self.fila_simulacoes.qsize()
+            self.label_progresso.config(text=f"Simulando {em_execucao[1]}... ({pendentes} na fila)")
+            self.barra_progresso["value"] = 100 * min(self.progresso_simulacao, 1.0)
+        else:
+            self.label_progresso.config(text="Nenhuma simulação em andamento.")
+            self.barra_progresso["value"] = 0
+
+        while not self.fila_resultados.empty():
+            situacao, resultado, titulo = self.fila_resultados.get()
+            if situacao == "concluida":
+                from visualizacao import exibir_gantt
+                escalonador, chave = resultado
+                exibir_gantt(self.root, escalonador, titulo, chave=chave)
+            elif situacao == "erro":
+                messagebox.showerror("Erro na Simulação", f"{titulo}: {resultado}")
+            else:
+                print(f"--- Simulação {titulo} cancelada ---")
+
+        self.root.after(100, self._acompanhar_simulacoes)
+
+    def cancelar_simulacoes(self):
+        """Descarta as simulações na fila e interrompe a que está em andamento."""
+        while not self.fila_simulacoes.empty():
+            self.fila_simulacoes.get_nowait()
+        em_execucao = self.escalonador_em_execucao
+        if em_execucao is not None:
+            em_execucao[0].cancelar()
 
     def iniciar(self):
         """Inicia o loop principal do Tkinter."""
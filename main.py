@@ -1,8 +1,22 @@
+import time
+
+# Meta de tempo entre o início do processo e a janela pronta para uso
+META_INICIALIZACAO_S = 0.5
+INICIO_PROCESSO = time.perf_counter()
+
 from interface import App
 
+
+def informar_tempo_inicializacao():
+    decorrido = time.perf_counter() - INICIO_PROCESSO
+    situacao = "dentro da meta" if decorrido <= META_INICIALIZACAO_S else "ACIMA da meta"
+    print(f"--- Janela pronta em {decorrido * 1000:.0f} ms ({situacao} de {META_INICIALIZACAO_S * 1000:.0f} ms) ---")
+
+
 if __name__ == "__main__":
     # Cria uma instância da nossa aplicação
     aplicacao = App()
+    aplicacao.root.after_idle(informar_tempo_inicializacao)
     
     # Inicia o loop principal da interface gráfica
-    aplicacao.iniciar()
\ No newline at end of file
+    aplicacao.iniciar()
@@ -0,0 +1,375 @@
+import copy
+import csv
+import json
+import math
+import os
+
+import numpy as np
+
+import rastreamento
+from tarefa import TabelaFluxo, TOLERANCIA_DEADLINE
+
+# Uma linha por tarefa concluída; id_execucao identifica a simulação de origem
+DTYPE_LINHA_METRICAS = np.dtype([
+    ("id_execucao", "i4"),
+    ("tarefa", "i8"),
+    ("prioridade", "i8"),
+    ("tempo_chegada", "f8"),
+    ("tempo_inicio", "f8"),
+    ("tempo_final", "f8"),
+    ("turnaround", "f8"),
+    ("deadline", "f8"),
+    ("deadline_perdido", "u1"),
+])
+
+FORMATOS = ("csv", "colunar")
+
+
+class EscritorMetricas:
+    """
+    Grava as métricas por tarefa enquanto a simulação roda, sem guardar todas
+    em memória: as linhas vão para um bloco pré-alocado que é descarregado no
+    disco quando enche.
+
+    É um destino de rastreamento (ver rastreamento.py) e reage aos eventos de
+    conclusão. Várias execuções podem ser acumuladas no mesmo conjunto de
+    dados; cada uma recebe um id_execucao, descrito em execucoes.jsonl.
+
+    Formatos:
+      - "csv": um único arquivo metricas.csv;
+      - "colunar": um arquivo binário por coluna (<coluna>.bin), lido com
+        ler_metricas_colunares() como np.memmap.
+    """
+    def __init__(self, diretorio, formato="csv", linhas_por_bloco=1 << 16):
+        if formato not in FORMATOS:
+            raise ValueError(f"Formato de métricas desconhecido: {formato!r} (use {FORMATOS})")
+        self.diretorio = diretorio
+        self.formato = formato
+        self._bloco = np.zeros(linhas_por_bloco, dtype=DTYPE_LINHA_METRICAS)
+        self._n = 0
+        self._tabela = None
+        os.makedirs(diretorio, exist_ok=True)
+        self.id_execucao = self._proximo_id_execucao() - 1
+        if formato == "colunar":
+            with open(self._caminho("esquema.json"), "w") as arquivo:
+                json.dump({nome: DTYPE_LINHA_METRICAS[nome].str for nome in DTYPE_LINHA_METRICAS.names}, arquivo)
+
+    def _caminho(self, nome):
+        return os.path.join(self.diretorio, nome)
+
+    def _proximo_id_execucao(self):
+        caminho = self._caminho("execucoes.jsonl")
+        if not os.path.exists(caminho):
+            return 0
+        with open(caminho) as arquivo:
+            return sum(1 for _ in arquivo)
+
+    # --- Protocolo de destino de rastreamento ---
+
+    def iniciar(self, escalonador):
+        self.id_execucao += 1
+        self._tabela = escalonador.tarefas_para_escalonar
+        descricao = {
+            "id_execucao": self.id_execucao,
+            "escalonador": escalonador.__class__.__name__,
+            "quantum": getattr(escalonador, "quantum", getattr(escalonador, "quantum_base", None)),
+            "n_tarefas": None if isinstance(self._tabela, TabelaFluxo) else len(self._tabela),
+            "processadores": escalonador.processadores,
+            "particionado": escalonador.particionado,
+        }
+        with open(self._caminho("execucoes.jsonl"), "a") as arquivo:
+            arquivo.write(json.dumps(descricao) + "\n")
+
+    def registrar(self, tipo, tempo, tarefa, valor):
+        if tipo != rastreamento.CONCLUSAO:
+            return
+        tabela = self._tabela
+        chegada = tabela.tempo_chegada[tarefa]
+        deadline = tabela.deadline[tarefa]
+        self._bloco[self._n] = (
+            self.id_execucao, tabela.identificador(tarefa), tabela.prioridade[tarefa], chegada,
+            tabela.tempo_inicio_execucao[tarefa], tempo, tempo - chegada, deadline,
+            tempo - chegada > deadline + TOLERANCIA_DEADLINE,
+        )
+        self._n += 1
+        if self._n == len(self._bloco):
+            self.descarregar()
+
+    # --- Escrita em disco ---
+
+    def descarregar(self):
+        linhas = self._bloco[:self._n]
+        if self.formato == "csv":
+            self._escrever_csv(linhas)
+        else:
+            self._escrever_colunas(linhas)
+        self._n = 0
+
+    def _escrever_csv(self, linhas):
+        caminho = self._caminho("metricas.csv")
+        novo = not os.path.exists(caminho)
+        with open(caminho, "a", newline="") as arquivo_csv:
+            writer = csv.writer(arquivo_csv)
+            if novo:
+                writer.writerow(DTYPE_LINHA_METRICAS.names)
+            writer.writerows(linhas.tolist())
+
+    def _escrever_colunas(self, linhas):
+        for nome in DTYPE_LINHA_METRICAS.names:
+            with open(self._caminho(f"{nome}.bin"), "ab") as arquivo:
+                np.ascontiguousarray(linhas[nome]).tofile(arquivo)
+
+    def fechar(self):
+        self.descarregar()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excecao):
+        self.fechar()
+
+
+def ocupacao_processadores(bursts, processadores, horizonte=None):
+    """
+    Fração do horizonte (padrão: fim do último burst) em que cada processador
+    executou, lida direto do log de bursts (RegistroBursts).
+    """
+    linhas = bursts.bursts()
+    ocupado = np.bincount(linhas["processador"], weights=linhas["fim"] - linhas["inicio"], minlength=processadores)
+    if horizonte is None:
+        horizonte = linhas["fim"].max().item() if len(linhas) else 0
+    return ocupado / horizonte if horizonte > 0 else np.zeros(processadores)
+
+
+def ler_metricas_colunares(diretorio):
+    """Abre um conjunto gravado no formato "colunar" como colunas np.memmap."""
+    with open(os.path.join(diretorio, "esquema.json")) as arquivo:
+        esquema = json.load(arquivo)
+    colunas = {}
+    for nome, tipo in esquema.items():
+        caminho = os.path.join(diretorio, f"{nome}.bin")
+        vazio = not os.path.exists(caminho) or os.path.getsize(caminho) == 0
+        colunas[nome] = np.zeros(0, dtype=tipo) if vazio else np.memmap(caminho, dtype=tipo, mode="r")
+    return colunas
+
+
+# --- Métricas em fluxo (memória O(1) por simulação) ---
+
+# Conclusões acumuladas antes de cada atualização vetorizada dos agregadores
+BLOCO_ESTATISTICAS = 4096
+QUANTIS = (0.5, 0.95, 0.99)
+
+
+class EstatisticaContinua:
+    """Média, variância (Welford/Chan, combinando blocos), mínimo e máximo de uma série."""
+    def __init__(self):
+        self.n = 0
+        self.media = 0.0
+        self._m2 = 0.0
+        self.minimo = math.inf
+        self.maximo = -math.inf
+
+    def atualizar(self, valores):
+        n_bloco = len(valores)
+        if not n_bloco:
+            return
+        media_bloco = valores.mean().item()
+        m2_bloco = np.square(valores - media_bloco).sum().item()
+        n = self.n + n_bloco
+        delta = media_bloco - self.media
+        self.media += delta * n_bloco / n
+        self._m2 += m2_bloco + delta * delta * self.n * n_bloco / n
+        self.n = n
+        self.minimo = min(self.minimo, valores.min().item())
+        self.maximo = max(self.maximo, valores.max().item())
+
+    @property
+    def variancia(self):
+        return self._m2 / (self.n - 1) if self.n > 1 else 0.0
+
+    @property
+    def desvio(self):
+        return math.sqrt(self.variancia)
+
+
+class EsbocoQuantis:
+    """
+    Esboço de quantis de valores não negativos com faixas logarítmicas (como o
+    DDSketch): memória fixa e erro relativo de até 'precisao' em qualquer
+    quantil, o que preserva a cauda (p99). Valores abaixo de 'minimo' contam
+    como zero e acima de 'maximo' vão para a última faixa.
+    """
+    def __init__(self, precisao=0.01, minimo=1e-6, maximo=1e9):
+        self._gama = (1 + precisao) / (1 - precisao)
+        self._log_gama = math.log(self._gama)
+        self._deslocamento = math.ceil(math.log(minimo) / self._log_gama)
+        self._minimo = minimo
+        n_faixas = math.ceil(math.log(maximo) / self._log_gama) - self._deslocamento + 1
+        self.contagens = np.zeros(n_faixas, dtype=np.int64)
+        self.zeros = 0
+        self.n = 0
+
+    def atualizar(self, valores):
+        positivos = valores[valores >= self._minimo]
+        self.zeros += len(valores) - len(positivos)
+        faixas = np.ceil(np.log(positivos) / self._log_gama).astype(np.int64) - self._deslocamento
+        np.clip(faixas, 0, len(self.contagens) - 1, out=faixas)
+        self.contagens += np.bincount(faixas, minlength=len(self.contagens))
+        self.n += len(valores)
+
+    def quantil(self, q):
+        if not self.n:
+            return math.nan
+        posicao = max(math.ceil(q * self.n) - 1, 0)  # Posto mais próximo
+        if posicao < self.zeros:
+            return 0.0
+        faixa = int(np.searchsorted(np.cumsum(self.contagens), posicao - self.zeros, side="right"))
+        # Valor representativo da faixa (gama^(i-1), gama^i]: erro relativo de até 'precisao'
+        return 2 * self._gama ** (faixa + self._deslocamento) / (self._gama + 1)
+
+
+class AgregadorMetrica:
+    """
+    Estatística contínua e esboço de quantis de uma métrica por tarefa. Os
+    quantis contam valores negativos como zero (no atraso, a folga de quem
+    cumpriu o deadline); média, desvio e máximo usam os valores exatos.
+    """
+    def __init__(self):
+        self.estatistica = EstatisticaContinua()
+        self.esboco = EsbocoQuantis()
+
+    def copiar(self):
+        copia = copy.copy(self)
+        copia.estatistica = copy.copy(self.estatistica)
+        copia.esboco = copy.copy(self.esboco)
+        copia.esboco.contagens = self.esboco.contagens.copy()
+        return copia
+
+    def atualizar(self, valores):
+        if len(valores):
+            self.estatistica.atualizar(valores)
+            self.esboco.atualizar(np.maximum(valores, 0.0))
+
+    def resumo(self):
+        estatistica = self.estatistica
+        resumo = {"media": estatistica.media if estatistica.n else math.nan, "desvio": estatistica.desvio}
+        for q in QUANTIS:
+            # O esboço só aproxima o valor: limitado à faixa observada, uma série
+            # constante reporta o próprio valor em todos os quantis
+            resumo[f"p{round(q * 100)}"] = min(max(self.esboco.quantil(q), estatistica.minimo, 0.0),
+                                               max(estatistica.maximo, 0.0))
+        resumo["max"] = estatistica.maximo if estatistica.n else math.nan
+        return resumo
+
+
+class EstatisticasSimulacao:
+    """
+    Métricas de uma simulação atualizadas a cada conclusão, com memória O(1)
+    no número de tarefas: turnaround, espera (turnaround - duração), resposta
+    (primeira execução - chegada) e atraso (turnaround - deadline), com média,
+    desvio, p50/p95/p99 e máximo, além da taxa de deadlines perdidos.
+
+    As conclusões são acumuladas em blocos de BLOCO_ESTATISTICAS e os
+    agregadores são atualizados de forma vetorizada a cada bloco (e ao ler).
+    """
+    METRICAS = ("turnaround", "espera", "resposta", "atraso")
+
+    def __init__(self):
+        self.agregadores = {nome: AgregadorMetrica() for nome in self.METRICAS}
+        self._pendentes = []  # (turnaround, duracao, resposta, deadline) ainda não agregados
+        self._compartilhados = False  # Agregadores em uso também por uma cópia (ver copiar)
+        self.concluidas = 0
+        self._com_deadline = 0
+        self._perdidas = 0
+
+    def registrar(self, turnaround, duracao, resposta, deadline):
+        pendentes = self._pendentes
+        pendentes.append((turnaround, duracao, resposta, deadline))
+        self.concluidas += 1
+        if len(pendentes) >= BLOCO_ESTATISTICAS:
+            self._consolidar()
+
+    def copiar(self):
+        """
+        Cópia independente (para os ramos de EscalonadorCAV.bifurcar). Os
+        agregadores são compartilhados até que um dos lados precise alterá-los.
+        """
+        copia = copy.copy(self)
+        copia._pendentes = list(self._pendentes)
+        self._compartilhados = copia._compartilhados = True
+        return copia
+
+    def _consolidar(self):
+        if not self._pendentes:
+            return
+        if self._compartilhados:
+            self.agregadores = {nome: agregador.copiar() for nome, agregador in self.agregadores.items()}
+            self._compartilhados = False
+        turnaround, duracao, resposta, deadline = np.array(self._pendentes, dtype=np.float64).T
+        self._pendentes.clear()
+        atraso = (turnaround - deadline)[~np.isnan(deadline)]  # NaN = sem deadline
+        self._com_deadline += len(atraso)
+        self._perdidas += np.count_nonzero(atraso > TOLERANCIA_DEADLINE)
+        agregadores = self.agregadores
+        agregadores["turnaround"].atualizar(turnaround)
+        agregadores["espera"].atualizar(turnaround - duracao)
+        agregadores["resposta"].atualizar(resposta)
+        agregadores["atraso"].atualizar(atraso)
+
+    @property
+    def com_deadline(self):
+        self._consolidar()
+        return self._com_deadline
+
+    @property
+    def perdidas(self):
+        self._consolidar()
+        return self._perdidas
+
+    @property
+    def atraso_maximo(self):
+        """Maior atraso (turnaround - deadline) entre as concluídas com deadline; negativo se nenhuma perdeu."""
+        self._consolidar()
+        return self.agregadores["atraso"].estatistica.maximo
+
+    @property
+    def taxa_perda(self):
+        """Fração das tarefas concluídas com deadline que o perderam."""
+        com_deadline = self.com_deadline
+        return self._perdidas / com_deadline if com_deadline else 0.0
+
+    def estado(self):
+        """Estado completo em arrays, para gravar em .npz (ver cache_resultados.py)."""
+        self._consolidar()
+        estado = {"contadores": np.array([self.concluidas, self._com_deadline, self._perdidas], dtype=np.int64)}
+        for nome, agregador in self.agregadores.items():
+            estatistica, esboco = agregador.estatistica, agregador.esboco
+            estado[f"{nome}_momentos"] = np.array(
+                [estatistica.n, estatistica.media, estatistica._m2, estatistica.minimo, estatistica.maximo]
+            )
+            estado[f"{nome}_esboco"] = np.concatenate([[esboco.zeros, esboco.n], esboco.contagens])
+        return estado
+
+    @classmethod
+    def de_estado(cls, estado):
+        """Recria as estatísticas gravadas por estado()."""
+        estatisticas = cls()
+        estatisticas.concluidas, estatisticas._com_deadline, estatisticas._perdidas = estado["contadores"].tolist()
+        for nome, agregador in estatisticas.agregadores.items():
+            estatistica, esboco = agregador.estatistica, agregador.esboco
+            n, estatistica.media, estatistica._m2, estatistica.minimo, estatistica.maximo = (
+                estado[f"{nome}_momentos"].tolist()
+            )
+            estatistica.n = int(n)
+            esboco.zeros, esboco.n = estado[f"{nome}_esboco"][:2].tolist()
+            esboco.contagens = estado[f"{nome}_esboco"][2:].copy()
+        return estatisticas
+
+    def resumo(self, nome):
+        """media, desvio, p50, p95, p99 e max da métrica 'nome' (ver METRICAS)."""
+        self._consolidar()
+        return self.agregadores[nome].resumo()
+
+    def resumos(self):
+        self._consolidar()
+        return {nome: agregador.resumo() for nome, agregador in self.agregadores.items()}
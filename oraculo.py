@@ -0,0 +1,250 @@
+import hashlib
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from escalonador import (
+    EscalonadorFIFO,
+    EscalonadorSJF,
+    EscalonadorRoundRobin,
+    EscalonadorPrioridade,
+    EscalonadorEDF,
+    EscalonadorSRTF,
+    EscalonadorRoundRobinDinamico
+)
+from chaves import chave_conteudo, completar_parametros
+from escalonadorML import carregar_blocos, features
+from experimentos import criar_escalonador, gerar_carga
+
+DIRETORIO_PADRAO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "datasets_cache")
+
+# Políticas que conduzem as simulações (a trajetória); o oráculo rotula cada decisão delas
+POLITICAS = {
+    "FIFO": EscalonadorFIFO,
+    "SJF": EscalonadorSJF,
+    "RoundRobin": EscalonadorRoundRobin,
+    "Prioridade": EscalonadorPrioridade,
+    "EDF": EscalonadorEDF,
+    "SRTF": EscalonadorSRTF,
+    "RoundRobinDinamico": EscalonadorRoundRobinDinamico,
+}
+
+# Políticas que só fazem sentido com quantum: sem ele, o Round Robin vira FIFO e o
+# Round Robin Dinâmico não tem quantum base para calcular a fatia
+POLITICAS_COM_QUANTUM = {"RoundRobin", "RoundRobinDinamico"}
+
+# Cargas (quantidade, tamanho e semente do RNG), simulação e alcance do oráculo
+PARAMETROS_PADRAO = {
+    "n_cargas": 200,
+    "n_tarefas": 8,
+    "quantum": None,
+    "politicas": ["SJF", "Prioridade", "EDF"],
+    "profundidade": 1,
+    "semente": 0,
+}
+
+# Versão do formato salvo e do critério do oráculo (ver chaves.py)
+VERSAO_FORMATO = 1
+
+
+# --- Oráculo ---
+
+def _desfecho(escalonador):
+    # Menor é melhor: primeiro os deadlines perdidos, depois o turnaround médio
+    turnaround = escalonador.estatisticas.resumo("turnaround")["media"]
+    return escalonador.deadlines_perdidos, round(turnaround, 9)
+
+
+def melhor_desfecho(escalonador, profundidade=1):
+    """
+    Melhor desfecho (deadlines perdidos, turnaround médio) alcançável a partir
+    do estado atual de 'escalonador', que é consumido. As próximas
+    'profundidade' decisões com mais de uma tarefa pronta são testadas com
+    todas as candidatas (um ramo por candidata); daí em diante a própria
+    política decide até o fim. Com profundidade=None a busca é exaustiva
+    (força bruta), viável só para poucas tarefas.
+    """
+    if profundidade is not None and profundidade <= 0:
+        escalonador.continuar()
+        return _desfecho(escalonador)
+    prontas = escalonador.prontas()
+    while len(prontas) == 1:
+        escalonador.decidir()
+        prontas = escalonador.prontas()
+    if not prontas:
+        escalonador.continuar()
+        return _desfecho(escalonador)
+    instantaneo = escalonador.instantaneo()
+    return min(_avaliar(instantaneo, tarefa, profundidade) for tarefa in prontas)
+
+
+def _avaliar(instantaneo, tarefa, profundidade):
+    ramo = instantaneo.bifurcar()
+    ramo.decidir(tarefa)
+    return melhor_desfecho(ramo, None if profundidade is None else profundidade - 1)
+
+
+def rotular_decisoes(escalonador, profundidade=1):
+    """
+    Simula 'escalonador' até o fim pela sua própria política e, em cada
+    decisão com mais de uma tarefa pronta, pergunta ao oráculo (ver
+    melhor_desfecho) qual candidata leva ao melhor desfecho. Gera (X, y) por
+    decisão: uma linha de X por candidata (ver escalonadorML.features) e y = 1
+    para as melhores (todas, em caso de empate). Decisões em que todas as
+    candidatas empatam não ensinam nada e são omitidas.
+    """
+    tabela = escalonador.tarefas_para_escalonar
+    while True:
+        prontas = escalonador.prontas()
+        if not prontas:
+            break
+        if len(prontas) > 1:
+            instantaneo = escalonador.instantaneo()
+            desfechos = [_avaliar(instantaneo, tarefa, profundidade) for tarefa in prontas]
+            melhor = min(desfechos)
+            if melhor != max(desfechos):
+                # As mesmas features que o EscalonadorML calcula na simulação
+                X = features(tabela, prontas, escalonador.tempo_atual_simulacao).astype(np.float32)
+                yield X, np.array([desfecho == melhor for desfecho in desfechos], dtype=np.int8)
+        escalonador.decidir()
+    escalonador.continuar()
+
+
+def _rotular_carga(semente_carga, parametros):
+    # Executado nos processos do pool: todas as políticas sobre uma carga
+    decisoes = []
+    for estrategia, nome in enumerate(parametros["politicas"]):
+        escalonador = criar_escalonador(POLITICAS[nome], gerar_carga(semente_carga, parametros["n_tarefas"]),
+                                        quantum=parametros["quantum"])
+        escalonador.rastreio = None
+        for X, y in rotular_decisoes(escalonador, parametros["profundidade"]):
+            decisoes.append((X, y, estrategia))
+    return decisoes
+
+
+# --- Dataset em cache ---
+
+def parametros_dataset(**parametros):
+    parametros = completar_parametros(PARAMETROS_PADRAO, parametros, "dataset")
+    parametros["politicas"] = list(parametros["politicas"])
+    invalidas = [nome for nome in parametros["politicas"] if nome not in POLITICAS]
+    if invalidas:
+        raise ValueError(f"Políticas desconhecidas: {invalidas} (disponíveis: {sorted(POLITICAS)})")
+    quantum = parametros["quantum"]
+    if quantum is None:
+        sem_quantum = sorted(POLITICAS_COM_QUANTUM.intersection(parametros["politicas"]))
+        if sem_quantum:
+            raise ValueError(f"As políticas {sem_quantum} exigem um quantum (parâmetro 'quantum').")
+    elif quantum <= 0:
+        raise ValueError(f"Quantum inválido: {quantum!r}")
+    if parametros["n_cargas"] < 1 or parametros["n_tarefas"] < 1:
+        raise ValueError("n_cargas e n_tarefas devem ser positivos.")
+    profundidade = parametros["profundidade"]
+    if profundidade is not None and profundidade < 1:
+        raise ValueError(f"Profundidade inválida: {profundidade!r} (use None para a busca exaustiva)")
+    return parametros
+
+
+def chave_dataset(**parametros):
+    return chave_conteudo(VERSAO_FORMATO, parametros_dataset(**parametros))
+
+
+def gerar_dataset_oraculo(diretorio, processos=None, linhas_por_bloco=1 << 16, **parametros):
+    """
+    Rotula as decisões de todas as políticas sobre 'n_cargas' cargas (ver
+    gerar_carga) num pool de processos e grava o resultado em 'diretorio' no
+    formato de salvar_dataset_em_blocos, com 'estrategia' sendo o índice da
+    política em parametros["politicas"]. Decisões idênticas (mesmas candidatas
+    e rótulos), vindas de cargas ou políticas diferentes, entram uma vez só.
+    Devolve o número de decisões gravadas.
+    """
+    parametros = parametros_dataset(**parametros)
+    rng = np.random.default_rng(parametros["semente"])
+    sementes = rng.integers(0, 2 ** 32, parametros["n_cargas"]).tolist()
+
+    os.makedirs(diretorio, exist_ok=True)
+    vistas = set()
+    Xs, ys, estrategias = [], [], []
+    linhas = blocos = 0
+
+    def gravar():
+        nonlocal linhas, blocos
+        np.savez(os.path.join(diretorio, f"bloco_{blocos:05d}.npz"), X=np.concatenate(Xs), y=np.concatenate(ys),
+                 estrategia=np.concatenate(estrategias))
+        for lista in (Xs, ys, estrategias):
+            lista.clear()
+        linhas, blocos = 0, blocos + 1
+
+    with ProcessPoolExecutor(max_workers=processos) as pool:
+        for decisoes in pool.map(_rotular_carga, sementes, [parametros] * len(sementes)):
+            for X, y, estrategia in decisoes:
+                # A ordem das candidatas não importa para a deduplicação
+                ordem = np.lexsort(np.column_stack([X, y]).T[::-1])
+                resumo = hashlib.sha1(X[ordem].tobytes() + y[ordem].tobytes()).digest()
+                if resumo in vistas:
+                    continue
+                vistas.add(resumo)
+                Xs.append(X)
+                ys.append(y)
+                estrategias.append(np.full(len(y), estrategia, dtype=np.int8))
+                linhas += len(y)
+                if linhas >= linhas_por_bloco:
+                    gravar()
+    if Xs:
+        gravar()
+    return len(vistas)
+
+
+def obter_dataset_oraculo(diretorio=DIRETORIO_PADRAO, processos=None, **parametros):
+    """
+    Devolve o diretório com o dataset do oráculo para os parâmetros (ver
+    PARAMETROS_PADRAO), gerando-o só na primeira vez. Pode ser passado a
+    treinar_modelo_decision_tree(diretorio_blocos=...).
+    """
+    destino = os.path.join(diretorio, f"oraculo_{chave_dataset(**parametros)}")
+    if os.path.isdir(destino):
+        return destino
+    # Gera num diretório temporário e renomeia: um dataset incompleto nunca é lido
+    os.makedirs(diretorio, exist_ok=True)
+    temporario = tempfile.mkdtemp(dir=diretorio, prefix=".gerando_")
+    try:
+        gerar_dataset_oraculo(temporario, processos, **parametros)
+        os.rename(temporario, destino)
+    except OSError:
+        if not os.path.isdir(destino):
+            raise
+        shutil.rmtree(temporario)  # Outro processo gerou o mesmo dataset antes
+    except BaseException:
+        shutil.rmtree(temporario, ignore_errors=True)
+        raise
+    return destino
+
+
+# --- Exemplo de execução ---
+if __name__ == "__main__":
+    from arvore_compilada import ArvoreCompilada
+    from cache_modelos import CacheModelos
+    from escalonadorML import EscalonadorML, treinar_modelo_decision_tree
+
+    diretorio = obter_dataset_oraculo(n_cargas=100)
+    n_linhas = sum(len(y) for _, y, _ in carregar_blocos(diretorio))
+    print(f"Dataset do oráculo: {n_linhas} linhas em {diretorio}")
+    modelos = {
+        "heurísticas": CacheModelos().obter(),
+        "oráculo": ArvoreCompilada.de_modelo(treinar_modelo_decision_tree(diretorio_blocos=diretorio, semente=0)),
+    }
+
+    # Cargas que não entraram no treino
+    for nome, modelo in modelos.items():
+        perdidos = turnaround = 0
+        for semente in range(1000, 1100):
+            escalonador = EscalonadorML(gerar_carga(semente, 8), modelo)
+            escalonador.rastreio = None
+            escalonador.continuar()
+            perdidos += escalonador.deadlines_perdidos
+            turnaround += escalonador.estatisticas.resumo("turnaround")["media"]
+        print(f"Árvore treinada com {nome}: {perdidos} deadlines perdidos, "
+              f"turnaround médio {turnaround / 100:.2f}")
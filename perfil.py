@@ -0,0 +1,198 @@
+import csv
+import os
+from time import perf_counter_ns
+
+# Fases medidas pelo Perfilador. As fases se aninham: 'decisao' (um despacho
+# inteiro) inclui 'selecao', 'sobrecarga' e 'saida'; 'evento' inclui 'fila'.
+FASES = {
+    "decisao": "despacho completo de uma tarefa (EscalonadorCAV._despachar)",
+    "selecao": "escolha da próxima tarefa pela política (fila.remover)",
+    "modelo": "inferência do modelo do EscalonadorML (predict_proba)",
+    "fila": "manutenção da fila de prontos (fila.inserir)",
+    "evento": "tratamento de um evento da simulação (chegada, fim de quantum, conclusão)",
+    "sobrecarga": "contabilização de sobrecarga (registrar_sobrecarga)",
+    "saida": "envio de um evento ao destino de rastreamento",
+}
+
+COLUNAS_PERFIL = ["escalonador", "fase", "n", "p50_us", "p99_us", "max_us", "total_ms"]
+
+# Subdivisões por potência de 2 do histograma (erro relativo de até 1/16)
+SUBDIVISOES = 16
+_BITS_SUBDIVISAO = SUBDIVISOES.bit_length() - 1
+
+
+class HistogramaLatencia:
+    """
+    Histograma de latências em nanossegundos com faixas logarítmicas: memória
+    constante, máximo e total exatos, quantis com erro relativo de até 1/16.
+    """
+    def __init__(self):
+        self.contagens = [0] * (SUBDIVISOES * 64)
+        self.n = 0
+        self.total_ns = 0
+        self.maximo_ns = 0
+
+    def registrar(self, ns):
+        if ns < SUBDIVISOES:
+            faixa = ns if ns > 0 else 0
+        else:
+            expoente = ns.bit_length() - _BITS_SUBDIVISAO - 1
+            faixa = SUBDIVISOES * (expoente + 1) + (ns >> expoente) - SUBDIVISOES
+        self.contagens[faixa] += 1
+        self.n += 1
+        self.total_ns += ns
+        if ns > self.maximo_ns:
+            self.maximo_ns = ns
+
+    @staticmethod
+    def _limites(faixa):
+        if faixa < SUBDIVISOES:
+            return faixa, faixa
+        expoente, resto = divmod(faixa, SUBDIVISOES)
+        expoente -= 1
+        inicio = (SUBDIVISOES + resto) << expoente
+        return inicio, inicio + (1 << expoente) - 1
+
+    def quantil(self, q):
+        """Latência (ns) do quantil q, pelo ponto médio da faixa (limitado ao máximo)."""
+        if not self.n:
+            return 0
+        alvo = max(1, round(q * self.n))
+        acumulado = 0
+        for faixa, contagem in enumerate(self.contagens):
+            acumulado += contagem
+            if acumulado >= alvo:
+                inicio, fim = self._limites(faixa)
+                return min((inicio + fim) // 2, self.maximo_ns)
+        return self.maximo_ns
+
+
+class EnvoltorioCronometrado:
+    """
+    Repassa tudo ao objeto original, cronometrando os métodos indicados. Os
+    métodos especiais usados nas filas (len, iter) são repassados à parte: o
+    Python não os procura via __getattr__.
+    """
+    def __init__(self, original, metodos):
+        self.original = original
+        for nome, histograma in metodos.items():
+            setattr(self, nome, _cronometrado(getattr(original, nome), histograma))
+
+    def __getattr__(self, nome):
+        if nome == "original":
+            raise AttributeError(nome)
+        return getattr(self.original, nome)
+
+    def __len__(self):
+        return len(self.original)
+
+    def __iter__(self):
+        return iter(self.original)
+
+
+def _cronometrado(funcao, histograma):
+    registrar = histograma.registrar
+
+    def cronometrar(*args):
+        inicio = perf_counter_ns()
+        resultado = funcao(*args)
+        registrar(perf_counter_ns() - inicio)
+        return resultado
+
+    return cronometrar
+
+
+class Perfilador:
+    """
+    Mede cada fase das decisões de escalonamento com perf_counter_ns. Para usar,
+    atribua a EscalonadorCAV.perfil antes de escalonar(); a cada simulação o
+    escalonador troca os métodos medidos da instância (e as filas, o modelo e o
+    destino de rastreamento) por versões cronometradas. Sem perfil, nada é
+    trocado e o custo é zero.
+
+    As latências são agregadas por classe de escalonador e fase (ver FASES).
+    """
+    def __init__(self):
+        self.histogramas = {}  # (escalonador, fase) -> HistogramaLatencia
+
+    def histograma(self, escalonador, fase):
+        chave = (escalonador.__class__.__name__, fase)
+        if chave not in self.histogramas:
+            self.histogramas[chave] = HistogramaLatencia()
+        return self.histogramas[chave]
+
+    def cronometrar(self, escalonador, fase, funcao):
+        """Versão de 'funcao' que registra a duração de cada chamada na fase."""
+        return _cronometrado(funcao, self.histograma(escalonador, fase))
+
+    def envolver(self, escalonador, objeto, fases):
+        """Envoltório de 'objeto' que cronometra os métodos de 'fases' ({metodo: fase})."""
+        if isinstance(objeto, EnvoltorioCronometrado):
+            objeto = objeto.original
+        metodos = {nome: self.histograma(escalonador, fase) for nome, fase in fases.items()}
+        return EnvoltorioCronometrado(objeto, metodos)
+
+    def resumo(self):
+        """Linhas (dicionários com COLUNAS_PERFIL) por escalonador e fase, latências em µs."""
+        return [
+            {
+                "escalonador": escalonador,
+                "fase": fase,
+                "n": histograma.n,
+                "p50_us": histograma.quantil(0.5) / 1e3,
+                "p99_us": histograma.quantil(0.99) / 1e3,
+                "max_us": histograma.maximo_ns / 1e3,
+                "total_ms": histograma.total_ns / 1e6,
+            }
+            for (escalonador, fase), histograma in sorted(self.histogramas.items())
+        ]
+
+    def exportar(self, diretorio):
+        """Grava o resumo em <diretorio>/perfil.csv (por exemplo, junto das métricas)."""
+        os.makedirs(diretorio, exist_ok=True)
+        caminho = os.path.join(diretorio, "perfil.csv")
+        with open(caminho, "w", newline="") as arquivo_csv:
+            writer = csv.DictWriter(arquivo_csv, fieldnames=COLUNAS_PERFIL)
+            writer.writeheader()
+            writer.writerows(self.resumo())
+        return caminho
+
+    def imprimir(self):
+        print(f"{'Escalonador':<32} {'Fase':<11} {'n':>9} {'p50 (µs)':>10} {'p99 (µs)':>10} {'máx (µs)':>10}")
+        for linha in self.resumo():
+            print(f"{linha['escalonador']:<32} {linha['fase']:<11} {linha['n']:>9} "
+                  f"{linha['p50_us']:>10.2f} {linha['p99_us']:>10.2f} {linha['max_us']:>10.1f}")
+
+
+# --- Exemplo de execução ---
+if __name__ == "__main__":
+    from benchmark import gerar_carga_benchmark
+    from cache_modelos import CacheModelos
+    from escalonador import EscalonadorEDF, EscalonadorRoundRobin
+    from escalonadorML import EscalonadorML
+    from metricas import EscritorMetricas
+
+    tarefas = gerar_carga_benchmark(semente=0, n_tarefas=5000, carga=0.95)
+    perfil = Perfilador()
+    with EscritorMetricas("metricas_perfil") as escritor:
+        for escalonador in (EscalonadorEDF(tarefas, quantum=1), EscalonadorRoundRobin(4, tarefas),
+                            EscalonadorML(tarefas, CacheModelos().obter(), quantum=4)):
+            escalonador.rastreio = escritor
+            escalonador.perfil = perfil
+            escalonador.escalonar()
+    perfil.imprimir()
+    print(f"Perfil salvo em {perfil.exportar('metricas_perfil')}")
+
+    # A API passo a passo (prontas/decidir) também funciona com as filas cronometradas
+    referencia = EscalonadorEDF(tarefas, quantum=1)
+    referencia.rastreio = None
+    referencia.escalonar()
+    passo_a_passo = EscalonadorEDF(tarefas, quantum=1)
+    passo_a_passo.rastreio = None
+    passo_a_passo.perfil = Perfilador()
+    while passo_a_passo.prontas():
+        passo_a_passo.decidir()
+    passo_a_passo.continuar()
+    if passo_a_passo.estatisticas.resumos() != referencia.estatisticas.resumos():
+        raise AssertionError("A simulação passo a passo com perfil divergiu da simulação direta.")
+    print(f"Passo a passo com perfil: {passo_a_passo.decisoes} decisões, mesmas métricas")
@@ -0,0 +1,135 @@
+import numpy as np
+
+# Tipos de evento de rastreamento emitidos pelo núcleo de simulação
+DESPACHO = 0          # valor = tempo de execução concedido
+PREEMPCAO = 1         # valor = tempo restante da tarefa interrompida
+CONCLUSAO = 2
+DEADLINE_PERDIDO = 3  # valor = atraso em relação ao deadline
+TROCA_CONTEXTO = 4    # valor = sobrecarga cobrada
+MIGRACAO = 5          # valor = sobrecarga cobrada (tarefa retomada em outro processador)
+REJEICAO = 6          # chegada recusada pelo controle de admissão
+ADIAMENTO = 7         # valor = instante da nova chegada
+
+NOMES_EVENTOS = [
+    "despacho", "preempcao", "conclusao", "deadline_perdido", "troca_contexto", "migracao", "rejeicao", "adiamento"
+]
+
+# Registro binário compacto (25 bytes por evento)
+DTYPE_EVENTO = np.dtype([("tipo", "u1"), ("tarefa", "i8"), ("tempo", "f8"), ("valor", "f8")])
+
+
+# Mensagens do console de cada política (ver EscalonadorCAV.FORMATO_CONSOLE), as mesmas
+# que os escalonadores imprimiam antes do núcleo de eventos. Campos: tempo, nome,
+# valor (do evento), fim (do burst) e resta (tempo restante após o burst).
+# "parcial" substitui DESPACHO nos bursts que não concluem a tarefa; "cumprido" é
+# impresso na conclusão de quem não perdeu o deadline. Mensagens ausentes não são impressas.
+FORMATOS_CONSOLE = {
+    "tarefa": {
+        DESPACHO: "Tempo: {tempo:.2f}s - Executando tarefa {nome}...",
+        CONCLUSAO: "Tarefa {nome} finalizada em {tempo:.2f}s.\n",
+    },
+    "fatia": {
+        DESPACHO: "Tempo: {tempo:.2f}s - Executando {nome} por {valor:.2f}s.",
+        CONCLUSAO: "-> Tarefa {nome} finalizada em {tempo:.2f}s.\n",
+    },
+    "deadline": {
+        DESPACHO: "Tempo: {tempo:.2f}s - Executando {nome} por {valor:.2f}s.",
+        CONCLUSAO: "   -> Tarefa {nome} finalizada em {tempo:.2f}s.",
+        "cumprido": "   -> Deadline cumprido.\n",
+        DEADLINE_PERDIDO: "   -> DEADLINE PERDIDO!\n",
+    },
+    "restante": {
+        DESPACHO: "Tempo: {tempo:.2f}s - Assumindo tarefa {nome} (Restante: {valor:.2f}s)",
+        CONCLUSAO: "-> Tarefa {nome} finalizada em {tempo:.2f}s.\n",
+    },
+    "burst": {
+        DESPACHO: "Tempo: {tempo:.2f}s - Executou {nome} até {fim:.2f}s. Finalizada.",
+        "parcial": "Tempo: {tempo:.2f}s - Executou {nome} até {fim:.2f}s. (resta {resta:.2f}s)",
+        "cumprido": "   -> Deadline cumprido para {nome}.",
+        DEADLINE_PERDIDO: "   -> DEADLINE PERDIDO para {nome}!",
+    },
+}
+
+
+class RenderizadorConsole:
+    """Imprime os eventos no formato textual que cada escalonador usava originalmente (ver FORMATOS_CONSOLE)."""
+    def __init__(self, arquivo=None):
+        self.arquivo = arquivo  # None = sys.stdout do momento da impressão
+        self._escalonador = None
+        self._nomes = ()
+        self._formatos = FORMATOS_CONSOLE["fatia"]
+
+    def iniciar(self, escalonador):
+        self._escalonador = escalonador
+        self._nomes = escalonador.tarefas_para_escalonar.nomes
+        self._formatos = FORMATOS_CONSOLE[escalonador.FORMATO_CONSOLE]
+        print(escalonador.cabecalho(), file=self.arquivo)
+
+    def _imprimir(self, chave, tempo, tarefa, valor, **campos):
+        formato = self._formatos.get(chave)
+        if formato is not None:
+            print(formato.format(tempo=tempo, nome=self._nomes[tarefa], valor=valor, **campos), file=self.arquivo)
+
+    def registrar(self, tipo, tempo, tarefa, valor):
+        if tipo == DESPACHO:
+            # tempo_restante só é atualizado no fim do burst: aqui ainda é o de antes dele
+            resta = self._escalonador.tarefas_para_escalonar.tempo_restante.item(tarefa) - valor
+            chave = DESPACHO if resta <= 0 or "parcial" not in self._formatos else "parcial"
+            self._imprimir(chave, tempo, tarefa, valor, fim=tempo + valor, resta=resta)
+        elif tipo == CONCLUSAO:
+            self._imprimir(CONCLUSAO, tempo, tarefa, valor)
+            if "cumprido" in self._formatos and not self._escalonador.deadline_perdido(tarefa):
+                self._imprimir("cumprido", tempo, tarefa, valor)
+        elif tipo == DEADLINE_PERDIDO:
+            self._imprimir(DEADLINE_PERDIDO, tempo, tarefa, valor)
+        elif tipo == REJEICAO:
+            print(f"-> Tarefa {self._nomes[tarefa]} rejeitada em {tempo:.2f}s (controle de admissão).\n", file=self.arquivo)
+        elif tipo == ADIAMENTO:
+            print(f"-> Tarefa {self._nomes[tarefa]} adiada para {valor:.2f}s (controle de admissão).\n", file=self.arquivo)
+
+
+class BufferCircular:
+    """
+    Guarda os últimos 'capacidade' eventos num array binário pré-alocado, para
+    inspeção depois da simulação (post-mortem).
+    """
+    def __init__(self, capacidade=1 << 16):
+        self._eventos = np.zeros(capacidade, dtype=DTYPE_EVENTO)
+        self._total = 0
+
+    def iniciar(self, escalonador):
+        self._total = 0
+
+    def registrar(self, tipo, tempo, tarefa, valor):
+        self._eventos[self._total % len(self._eventos)] = (tipo, tarefa, tempo, valor)
+        self._total += 1
+
+    @property
+    def total_registrado(self):
+        """Quantidade de eventos registrados, inclusive os já sobrescritos."""
+        return self._total
+
+    def eventos(self):
+        """Eventos retidos, do mais antigo ao mais recente."""
+        capacidade = len(self._eventos)
+        if self._total <= capacidade:
+            return self._eventos[:self._total].copy()
+        inicio = self._total % capacidade
+        return np.concatenate([self._eventos[inicio:], self._eventos[:inicio]])
+
+    def salvar(self, caminho):
+        np.save(caminho, self.eventos())
+
+
+class RastreioMultiplo:
+    """Repassa cada evento para vários destinos (ex.: console e buffer)."""
+    def __init__(self, *destinos):
+        self.destinos = destinos
+
+    def iniciar(self, escalonador):
+        for destino in self.destinos:
+            destino.iniciar(escalonador)
+
+    def registrar(self, tipo, tempo, tarefa, valor):
+        for destino in self.destinos:
+            destino.registrar(tipo, tempo, tarefa, valor)
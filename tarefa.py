@@ -1,16 +1,382 @@
+import copy
+import hashlib
+import json
+import os
+import tempfile
+import weakref
+from collections import namedtuple
+
+import numpy as np
+
+from bursts import RegistroBursts
+
+# Registro de uma tarefa num fluxo (ver cargas.py); deadline None = sem deadline
+RegistroTarefa = namedtuple(
+    "RegistroTarefa", ["nome", "duracao", "prioridade", "tempo_chegada", "deadline"], defaults=(1, 0, None)
+)
+
+
+# Uma conclusão até TOLERANCIA_DEADLINE depois do deadline ainda o cumpre (erro de ponto
+# flutuante). Vale para o simulador, as métricas e os testes de escalonabilidade.
+TOLERANCIA_DEADLINE = 1e-9
+
+
+def _coluna(valores):
+    """Converte uma sequência em coluna NumPy somente leitura (None vira NaN)."""
+    coluna = np.array(valores)
+    if coluna.dtype.kind in "biu":
+        coluna = coluna.astype(np.int64)
+    elif coluna.dtype.kind != "f":
+        coluna = np.array([np.nan if v is None else v for v in valores], dtype=np.float64)
+    coluna.setflags(write=False)
+    return coluna
+
+
+# Abaixo deste número de tarefas, congelar() copia o estado em memória: o
+# arquivo mapeado com cópia na escrita só compensa quando o estado é grande
+TAREFAS_MINIMAS_MAPEAMENTO = 1 << 14
+
+
+def _remover_arquivo(caminho):
+    try:
+        os.remove(caminho)
+    except OSError:
+        pass  # No Windows, o arquivo ainda mapeado por um ramo fica para a limpeza do sistema
+
+
+class _NomesAutomaticos:
+    """Nomes 'T0', 'T1', ... gerados sob demanda para tabelas grandes."""
+    def __init__(self, quantidade):
+        self._quantidade = quantidade
+
+    def __len__(self):
+        return self._quantidade
+
+    def __getitem__(self, indice):
+        return f"T{indice}"
+
+
+class TabelaTarefas:
+    """
+    Conjunto de tarefas armazenado em colunas NumPy (struct-of-arrays).
+
+    A especificação (nomes, duracao, prioridade, tempo_chegada, deadline) é
+    imutável e pode ser compartilhada entre tabelas. O estado de execução fica
+    em arrays pré-alocados que resetar() reinicia sem realocar, e os bursts de
+    execução num RegistroBursts ('bursts'), que pode ser trocado por um
+    apoiado em arquivo.
+
+    congelar() e bifurcar() sustentam os instantâneos de simulação (ver
+    EscalonadorCAV.instantaneo): o estado congelado fica num arquivo
+    temporário que cada ramo mapeia com cópia na escrita.
+    """
+    # Colunas do estado de execução, na ordem em que congelar() as grava
+    COLUNAS_ESTADO = ("tempo_restante", "tempo_inicio_execucao", "tempo_final", "processador")
+    _arquivo_estado = None  # Arquivo com o estado, só nas tabelas congeladas
+    _impressao = None  # Calculada uma vez: a especificação não muda
+
+    def __init__(self, nomes, duracao, prioridade, tempo_chegada, deadline):
+        self.duracao = _coluna(duracao)
+        self.prioridade = _coluna(prioridade)
+        self.tempo_chegada = _coluna(tempo_chegada)
+        self.deadline = _coluna(deadline)
+        self.nomes = _NomesAutomaticos(len(self.duracao)) if nomes is None else tuple(nomes)
+
+        tamanhos = {len(self.nomes), len(self.prioridade), len(self.tempo_chegada), len(self.deadline)}
+        if tamanhos != {len(self.duracao)}:
+            raise ValueError("Todas as colunas da tabela de tarefas devem ter o mesmo tamanho.")
+
+        self._alocar_estado()
+
+    @classmethod
+    def de_tarefas(cls, tarefas):
+        """Cria uma tabela a partir de uma lista de TarefaCAV (ou de outra tabela)."""
+        if isinstance(tarefas, TabelaTarefas):
+            return tarefas.copiar()
+        tarefas = list(tarefas)
+        return cls(
+            nomes=[t.nome for t in tarefas],
+            duracao=[t.duracao for t in tarefas],
+            prioridade=[t.prioridade for t in tarefas],
+            tempo_chegada=[t.tempo_chegada for t in tarefas],
+            deadline=[t.deadline for t in tarefas],
+        )
+
+    def copiar(self):
+        """Nova tabela que compartilha a especificação imutável, com estado próprio."""
+        nova = copy.copy(self)
+        nova._arquivo_estado = None
+        nova._alocar_estado()
+        return nova
+
+    def impressao_digital(self):
+        """
+        Hash estável (SHA-256) da especificação das tarefas: nomes, duracao,
+        prioridade, tempo_chegada e deadline, com os tipos das colunas.
+        """
+        if self._impressao is None:
+            hash_ = hashlib.sha256()
+            nomes = f"automaticos:{len(self.nomes)}" if isinstance(self.nomes, _NomesAutomaticos) else list(self.nomes)
+            hash_.update(json.dumps(nomes).encode())
+            for coluna in (self.duracao, self.prioridade, self.tempo_chegada, self.deadline):
+                hash_.update(coluna.dtype.str.encode())
+                hash_.update(np.ascontiguousarray(coluna).tobytes())
+            self._impressao = hash_.hexdigest()
+        return self._impressao
+
+    def congelar(self):
+        """
+        Tabela somente leitura com o estado de execução atual, gravado uma única
+        vez num arquivo temporário (removido quando a tabela congelada for
+        descartada). Serve de origem para bifurcar().
+        """
+        if len(self) < TAREFAS_MINIMAS_MAPEAMENTO:
+            return self.bifurcar()
+        congelada = copy.copy(self)
+        descritor, caminho = tempfile.mkstemp(prefix="estado_", suffix=".bin")
+        with os.fdopen(descritor, "wb") as arquivo:
+            for nome in self.COLUNAS_ESTADO:
+                getattr(self, nome).tofile(arquivo)
+        congelada._arquivo_estado = caminho
+        weakref.finalize(congelada, _remover_arquivo, caminho)
+        congelada._mapear_estado("r")
+        congelada.bursts = None if self.bursts is None else self.bursts.bifurcar()
+        return congelada
+
+    def _mapear_estado(self, modo):
+        deslocamento = 0
+        for nome in self.COLUNAS_ESTADO:
+            coluna = getattr(self, nome)
+            mapa = np.memmap(self._arquivo_estado, dtype=coluna.dtype, mode=modo, offset=deslocamento,
+                             shape=coluna.shape)
+            setattr(self, nome, mapa.view(np.ndarray))  # ndarray comum: indexar um memmap é mais lento
+            deslocamento += coluna.nbytes
+
+    def bifurcar(self):
+        """
+        Nova tabela que continua do estado atual, compartilhando a especificação.
+        De uma tabela congelada, o estado é mapeado com cópia na escrita ("c"):
+        as páginas que o ramo não altera continuam compartilhadas.
+        """
+        nova = copy.copy(self)
+        if self._arquivo_estado is None:
+            for nome in self.COLUNAS_ESTADO:
+                setattr(nova, nome, getattr(self, nome).copy())
+        else:
+            nova._mapear_estado("c")
+            nova._arquivo_estado = None
+        nova.bursts = None if self.bursts is None else self.bursts.bifurcar()
+        return nova
+
+    def _alocar_estado(self):
+        n = len(self.duracao)
+        self.tempo_restante = np.empty(n, dtype=np.float64)
+        self.tempo_inicio_execucao = np.empty(n, dtype=np.float64)
+        self.tempo_final = np.empty(n, dtype=np.float64)
+        self.processador = np.empty(n, dtype=np.int64)
+        self.bursts = RegistroBursts()
+        self.resetar()
+
+    def resetar(self):
+        self.tempo_restante[:] = self.duracao
+        self.tempo_inicio_execucao.fill(-1)
+        self.tempo_final.fill(-1)
+        self.processador.fill(-1)
+        self.bursts.resetar()
+
+    def identificador(self, indice):
+        """Identificador estável da tarefa da linha 'indice' (aqui, o próprio índice)."""
+        return indice
+
+    def __len__(self):
+        return len(self.duracao)
+
+    def __getitem__(self, indice):
+        return TarefaCAV._vista(self, indice)
+
+    def __iter__(self):
+        return (TarefaCAV._vista(self, i) for i in range(len(self)))
+
+    def __repr__(self):
+        return f"TabelaTarefas({len(self)} tarefas)"
+
+
+class TabelaFluxo(TabelaTarefas):
+    """
+    Tabela alimentada por um fluxo de tarefas durante a simulação. Cada tarefa
+    ocupa uma linha da chegada até a conclusão; depois a linha é liberada e
+    reaproveitada, então a memória acompanha as tarefas presentes no sistema,
+    não o tamanho do fluxo.
+
+    len() e a iteração cobrem só as linhas ocupadas. O identificador de uma
+    tarefa é a sua posição no fluxo (coluna 'sequencia').
+
+    Para manter a memória limitada, os bursts não são guardados por padrão
+    (bursts = None); atribua um RegistroBursts, de preferência com arquivo,
+    para guardá-los.
+    """
+    _COLUNAS = {
+        "duracao": np.float64,
+        "prioridade": np.int64,
+        "tempo_chegada": np.float64,
+        "deadline": np.float64,
+        "sequencia": np.int64,
+        "tempo_restante": np.float64,
+        "tempo_inicio_execucao": np.float64,
+        "tempo_final": np.float64,
+        "processador": np.int64,
+    }
+
+    def __init__(self, capacidade=1024):
+        self.nomes = []
+        for nome, tipo in self._COLUNAS.items():
+            setattr(self, nome, np.empty(0, dtype=tipo))
+        self.bursts = None
+        self._livres = []
+        self._crescer(capacidade)
+        self.resetar()
+
+    @property
+    def capacidade(self):
+        return len(self.nomes)
+
+    def _crescer(self, capacidade):
+        anterior = self.capacidade
+        for nome, tipo in self._COLUNAS.items():
+            coluna = np.empty(capacidade, dtype=tipo)
+            coluna[:anterior] = getattr(self, nome)
+            setattr(self, nome, coluna)
+        self.nomes.extend([None] * (capacidade - anterior))
+        # Pilha de linhas livres: as de menor índice saem primeiro
+        self._livres[:0] = range(capacidade - 1, anterior - 1, -1)
+
+    def copiar(self):
+        return TabelaFluxo(self.capacidade)
+
+    def impressao_digital(self):
+        # As tarefas de um fluxo só são conhecidas durante a simulação
+        return None
+
+    def congelar(self):
+        # Só as tarefas presentes no sistema ocupam linhas: a cópia direta é pequena
+        return self.bifurcar()
+
+    def bifurcar(self):
+        nova = copy.copy(self)
+        for nome in self._COLUNAS:
+            setattr(nova, nome, getattr(self, nome).copy())
+        nova.nomes = list(self.nomes)
+        nova._livres = list(self._livres)
+        nova.bursts = None if self.bursts is None else self.bursts.bifurcar()
+        return nova
+
+    def resetar(self):
+        self._livres[:] = range(self.capacidade - 1, -1, -1)
+        if self.bursts is not None:
+            self.bursts.resetar()
+        self.admitidas = 0
+        self.prioridade_maxima = 0  # Maior prioridade numérica admitida até agora
+
+    def admitir(self, registro):
+        """Ocupa uma linha com a tarefa descrita por 'registro' (RegistroTarefa) e devolve o índice."""
+        nome, duracao, prioridade, tempo_chegada, deadline = registro
+        if not self._livres:
+            self._crescer(2 * self.capacidade)
+        i = self._livres.pop()
+
+        self.nomes[i] = f"T{self.admitidas}" if nome is None else nome
+        self.duracao[i] = duracao
+        self.prioridade[i] = prioridade
+        self.tempo_chegada[i] = tempo_chegada
+        self.deadline[i] = np.nan if deadline is None else deadline
+        self.sequencia[i] = self.admitidas
+        self.tempo_restante[i] = duracao
+        self.tempo_inicio_execucao[i] = -1
+        self.tempo_final[i] = -1
+        self.processador[i] = -1
+        if self.admitidas == 0 or prioridade > self.prioridade_maxima:
+            self.prioridade_maxima = prioridade
+        self.admitidas += 1
+        return i
+
+    def liberar(self, indice):
+        """Devolve a linha de uma tarefa concluída para reaproveitamento."""
+        self._livres.append(indice)
+
+    def identificador(self, indice):
+        return self.sequencia[indice].item()
+
+    def _ocupadas(self):
+        return sorted(set(range(self.capacidade)) - set(self._livres))
+
+    def __len__(self):
+        return self.capacidade - len(self._livres)
+
+    def __iter__(self):
+        return (TarefaCAV._vista(self, i) for i in self._ocupadas())
+
+    def __repr__(self):
+        return f"TabelaFluxo({len(self)} tarefas no sistema, {self.admitidas} admitidas)"
+
+
+def _campo(coluna, gravavel=False):
+    """Propriedade de TarefaCAV que lê (e opcionalmente escreve) uma coluna da tabela."""
+    def ler(self):
+        valor = getattr(self._tabela, coluna)[self._indice].item()
+        return None if valor != valor else valor  # NaN representa deadline ausente
+
+    def escrever(self, valor):
+        getattr(self._tabela, coluna)[self._indice] = valor
+
+    return property(ler, escrever if gravavel else None)
+
+
 class TarefaCAV:
-    """Representa uma tarefa a ser executada por um Veículo Autônomo Conectado (CAV)."""
+    """
+    Representa uma tarefa a ser executada por um Veículo Autônomo Conectado (CAV).
+
+    É uma visão leve sobre uma linha de TabelaTarefas. Criada diretamente, a
+    tarefa fica numa tabela própria de uma linha.
+    """
+    __slots__ = ("_tabela", "_indice")
+
     def __init__(self, nome, duracao, prioridade=1, tempo_chegada=0, deadline=0):
-        self.nome = nome
-        self.duracao = duracao
-        self.prioridade = prioridade
-        self.deadline = deadline
-        self.tempo_restante = duracao
-        self.tempo_chegada = tempo_chegada  # Hora em que a tarefa começa
-        self.tempo_inicio_execucao = -1   # Tempo da primeira execução
-        self.tempo_final = -1           # Tempo final de conclusão
-        self.tempos_execucao = []         # Lista de tuplas (inicio, fim) de cada burst de execução
-        self.foi_executada = False        # Flag para controle do tempo_inicio_execucao
+        self._tabela = TabelaTarefas([nome], [duracao], [prioridade], [tempo_chegada], [deadline])
+        self._indice = 0
+
+    @classmethod
+    def _vista(cls, tabela, indice):
+        tarefa = cls.__new__(cls)
+        tarefa._tabela = tabela
+        tarefa._indice = indice
+        return tarefa
+
+    duracao = _campo("duracao")
+    prioridade = _campo("prioridade")
+    tempo_chegada = _campo("tempo_chegada")  # Hora em que a tarefa começa
+    deadline = _campo("deadline")
+    tempo_restante = _campo("tempo_restante", gravavel=True)
+    tempo_inicio_execucao = _campo("tempo_inicio_execucao", gravavel=True)  # Tempo da primeira execução
+    tempo_final = _campo("tempo_final", gravavel=True)  # Tempo final de conclusão
+    processador = _campo("processador", gravavel=True)  # Último processador em que executou (-1 = nenhum)
+
+    @property
+    def nome(self):
+        return self._tabela.nomes[self._indice]
+
+    @property
+    def tempos_execucao(self):
+        """Lista de tuplas (inicio, fim) de cada burst de execução, lida do RegistroBursts da tabela."""
+        bursts = self._tabela.bursts
+        return [] if bursts is None else bursts.da_tarefa(self._tabela.identificador(self._indice))
+
+    @property
+    def foi_executada(self):
+        return self.tempo_inicio_execucao >= 0
+
+    def __reduce__(self):
+        # Serializa só a especificação da linha, não a tabela inteira
+        return (TarefaCAV, (self.nome, self.duracao, self.prioridade, self.tempo_chegada, self.deadline))
 
     def __str__(self):
         return f"Tarefa {self.nome} (Prioridade {self.prioridade}): {self.duracao} segundos"
@@ -22,4 +388,4 @@ class TarefaCAV:
         """Executa a tarefa por um tempo de 'quantum' ou até terminar."""
         tempo_exec = min(self.tempo_restante, quantum)
         self.tempo_restante -= tempo_exec
-        return tempo_exec
\ No newline at end of file
+        return tempo_exec
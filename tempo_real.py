@@ -0,0 +1,111 @@
+import asyncio
+import inspect
+
+
+class ExecutorTempoReal:
+    """
+    Conduz um escalonador online (criado com tarefas_iniciais = None) em tempo
+    real: o tempo simulado acompanha o relógio do event loop, multiplicado por
+    'escala' (segundos simulados por segundo real), e as tarefas chegam por uma
+    asyncio.Queue, no instante simulado em que são recebidas.
+
+    Cada Decisao é repassada a 'ao_decidir' (função comum ou corrotina) assim
+    que é tomada. Colocar None na fila encerra a execução depois que as tarefas
+    já recebidas terminam.
+    """
+    def __init__(self, escalonador, fila, escala=1.0, ao_decidir=None):
+        if not escalonador.online:
+            raise ValueError("O executor em tempo real exige um escalonador online (tarefas_iniciais = None).")
+        if escala <= 0:
+            raise ValueError("A escala de tempo deve ser positiva.")
+        self.escalonador = escalonador
+        self.fila = fila
+        self.escala = escala
+        self.ao_decidir = ao_decidir
+        self.atraso_maximo = 0.0  # Maior atraso (s reais) entre o instante previsto de um evento e o seu tratamento
+        self._relogio = None
+        self._inicio = 0.0
+
+    def tempo_simulado(self):
+        return (self._relogio() - self._inicio) * self.escala
+
+    async def _repassar(self, decisoes):
+        for decisao in decisoes:
+            if self.ao_decidir is not None:
+                resultado = self.ao_decidir(decisao)
+                if inspect.isawaitable(resultado):
+                    await resultado
+
+    async def executar(self):
+        escalonador = self.escalonador
+        loop = asyncio.get_running_loop()
+        self._relogio = loop.time
+        escalonador.proximo_evento()  # Inicia a simulação online, se ainda não iniciada
+        # Continua do tempo simulado em que o escalonador está
+        self._inicio = loop.time() - escalonador.tempo_atual_simulacao / self.escala
+
+        recebendo = True
+        leitura = asyncio.ensure_future(self.fila.get())
+        try:
+            while recebendo or escalonador.proximo_evento() is not None:
+                proximo = escalonador.proximo_evento()
+                espera = None if proximo is None else max(0.0, (proximo - self.tempo_simulado()) / self.escala)
+                if recebendo:
+                    await asyncio.wait({leitura}, timeout=espera)
+                else:
+                    await asyncio.sleep(espera)
+
+                agora = self.tempo_simulado()
+                if proximo is not None and proximo <= agora:
+                    self.atraso_maximo = max(self.atraso_maximo, (agora - proximo) / self.escala)
+                await self._repassar(escalonador.avancar(agora))
+
+                if recebendo and leitura.done():
+                    tarefa = leitura.result()
+                    if tarefa is None:
+                        recebendo = False
+                    else:
+                        escalonador.submeter(tarefa)
+                        leitura = asyncio.ensure_future(self.fila.get())
+                        await self._repassar(escalonador.avancar(agora))
+        finally:
+            leitura.cancel()
+
+
+async def executar_em_tempo_real(escalonador, fila, escala=1.0, ao_decidir=None):
+    """Atalho para ExecutorTempoReal(...).executar(); devolve o executor ao terminar."""
+    executor = ExecutorTempoReal(escalonador, fila, escala, ao_decidir)
+    await executor.executar()
+    return executor
+
+
+# --- Exemplo de execução ---
+if __name__ == "__main__":
+    import random
+
+    from escalonador import EscalonadorEDF
+    from tarefa import RegistroTarefa
+
+    async def sensores(fila, n_tarefas=20):
+        # Simula o pipeline de sensores entregando tarefas em intervalos aleatórios
+        for i in range(n_tarefas):
+            await asyncio.sleep(random.expovariate(4.0))
+            duracao = random.randint(1, 4)
+            await fila.put(RegistroTarefa(f"Leitura {i}", duracao, random.randint(1, 5), 0, duracao + random.randint(2, 8)))
+        await fila.put(None)
+
+    async def principal():
+        escalonador = EscalonadorEDF(None, quantum=1)
+        escalonador.rastreio = None
+        fila = asyncio.Queue()
+
+        def ao_decidir(decisao):
+            print(f"Tempo: {decisao.tempo:6.2f}s - Executando {decisao.nome} por {decisao.fatia:.2f}s")
+
+        produtor = asyncio.create_task(sensores(fila))
+        executor = await executar_em_tempo_real(escalonador, fila, escala=10.0, ao_decidir=ao_decidir)
+        await produtor
+        print(f"Deadlines perdidos: {escalonador.deadlines_perdidos}; "
+              f"atraso máximo do laço: {executor.atraso_maximo * 1000:.2f} ms")
+
+    asyncio.run(principal())
@@ -1,66 +1,211 @@
+import os
+import threading
 import tkinter as tk
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import matplotlib.pyplot as plt
-import matplotlib.cm as cm
+
 import numpy as np
+import matplotlib.cm as cm
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+from matplotlib.figure import Figure
 
 from escalonador import EscalonadorCAV
 
-import tkinter as tk
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import matplotlib.pyplot as plt
-import matplotlib.cm as cm
-import numpy as np
+ALTURA_BARRA = 0.6
+
+# Arquivo -> chave (ver cache_resultados.py) do resultado que ele contém; um
+# resultado do cache não regrava o CSV nem o PNG que já estão em dia
+_arquivos_gravados = {}
+
+
+def _precisa_gravar(caminho, chave):
+    caminho = os.path.abspath(caminho)
+    if chave is not None and _arquivos_gravados.get(caminho) == chave and os.path.exists(caminho):
+        return False
+    _arquivos_gravados[caminho] = chave
+    return True
+
+
+def bursts_por_tarefa(escalonador: EscalonadorCAV):
+    """Lista, para cada tarefa, um array (k, 2) com o (inicio, fim) de cada burst."""
+    tabela = escalonador.tarefas_para_escalonar
+    return tabela.bursts.por_tarefa(len(tabela))
+
+
+def bursts_por_processador(escalonador: EscalonadorCAV):
+    """Lista, para cada processador, um array (k, 3) com (inicio, fim, tarefa) de cada burst."""
+    return escalonador.tarefas_para_escalonar.bursts.por_processador(escalonador.processadores)
 
-from escalonador import EscalonadorCAV
 
-def visualizar_gantt(parent_window, escalonador: EscalonadorCAV, titulo: str):
+def reduzir_bursts(bursts, resolucao, devolver_grupos=False):
     """
-    Executa um escalonador, exibe os resultados e desenha o gráfico de Gantt.
+    Nível de detalhe: junta bursts separados por intervalos menores que
+    'resolucao' (a largura de um pixel, em segundos) e devolve os pares
+    (inicio, largura) esperados por broken_barh. Cada barra tem ao menos um
+    pixel de largura, para continuar visível. Com devolver_grupos, devolve
+    também o índice do primeiro burst de cada barra.
     """
-    # Executa a simulação
-    escalonador.escalonar()
-    escalonador.calcular_e_exibir_metricas()
-    escalonador.salvar_metricas_csv(f"resultados_{escalonador.__class__.__name__}.csv")
+    if len(bursts) == 0:
+        return (np.empty((0, 2)), np.empty(0, dtype=np.intp)) if devolver_grupos else []
+    inicios, fins = bursts[:, 0], bursts[:, 1]
+    grupos = np.arange(len(bursts))
+    if resolucao > 0 and len(bursts) > 1:
+        novos_grupos = np.flatnonzero(inicios[1:] - fins[:-1] > resolucao) + 1
+        grupos = np.concatenate([[0], novos_grupos])
+        inicios = inicios[grupos]
+        fins = np.maximum.reduceat(fins, grupos)
+    larguras = np.maximum(fins - inicios, resolucao)
+    barras = np.column_stack([inicios, larguras])
+    return (barras, grupos) if devolver_grupos else barras
 
-    # Cria a janela de visualização
-    janela_gantt = tk.Toplevel(parent_window)
-    janela_gantt.title(titulo)
-    janela_gantt.geometry("1000x600")
 
-    # Ajusta o tamanho vertical com base no número de tarefas (mínimo de 6 de altura)
-    altura_grafico = max(6, len(escalonador.tarefas_para_escalonar) * 0.7)
-    fig, ax = plt.subplots(figsize=(10, altura_grafico))
+def _resolucao(ax, largura_pixels=None):
+    """Quantos segundos de simulação cabem num pixel do eixo x."""
+    inicio, fim = ax.get_xlim()
+    if largura_pixels is None:
+        largura_pixels = ax.get_window_extent().width
+    return (fim - inicio) / max(largura_pixels, 1)
+
 
-    nomes_tarefas = [tarefa.nome for tarefa in escalonador.tarefas_para_escalonar]
-    colors = cm.viridis(np.linspace(0, 1, len(nomes_tarefas)))
-    color_map = {nome: color for nome, color in zip(nomes_tarefas, colors)}
+def _cores_das_barras(bursts_linha, grupos, cores_tarefas):
+    """Cor de cada barra de uma linha por processador: a da tarefa do primeiro burst agrupado."""
+    tarefas = bursts_linha[grupos, 2].astype(np.intp)
+    return cores_tarefas[tarefas % len(cores_tarefas)]
 
-    max_time = 0
 
-    for tarefa in escalonador.tarefas_para_escalonar:
-        for inicio, fim in tarefa.tempos_execucao:
-            duracao = fim - inicio
-            ax.barh(tarefa.nome, duracao, left=inicio, color=color_map[tarefa.nome],
-                    edgecolor='black', height=0.6)
-        if tarefa.tempo_final > max_time:
-            max_time = tarefa.tempo_final
+def desenhar_gantt(fig, nomes_linhas, bursts, titulo, max_time, largura_pixels=None, cores_tarefas=None):
+    """
+    Desenha o Gantt em 'fig' com uma coleção (broken_barh) por linha e devolve
+    o eixo e as coleções, para que o nível de detalhe seja refeito.
+
+    Por padrão cada linha é uma tarefa, com uma cor. Com 'cores_tarefas', cada
+    linha é um processador (bursts com a coluna de tarefa, ver
+    bursts_por_processador) e cada barra tem a cor da sua tarefa.
+    """
+    ax = fig.add_subplot(111)
+    ax.set_xlim(0, max_time * 1.05 if max_time > 0 else 10)
+    ax.set_ylim(-1, len(nomes_linhas))
+    ax.invert_yaxis()  # Primeira tarefa no topo, como no barh original
+    colors = cm.viridis(np.linspace(0, 1, len(nomes_linhas)))
 
-    ax.set_yticks(np.arange(len(nomes_tarefas)))
-    ax.set_yticklabels(nomes_tarefas)
+    resolucao = _resolucao(ax, largura_pixels)
+    colecoes = []
+    for linha, (bursts_linha, cor) in enumerate(zip(bursts, colors)):
+        barras, grupos = reduzir_bursts(bursts_linha, resolucao, devolver_grupos=True)
+        if cores_tarefas is not None:
+            cor = _cores_das_barras(bursts_linha, grupos, cores_tarefas)
+        colecoes.append(ax.broken_barh(
+            barras, (linha - ALTURA_BARRA / 2, ALTURA_BARRA),
+            facecolors=cor, edgecolor='black', linewidth=0.5,
+        ))
+
+    ax.set_yticks(np.arange(len(nomes_linhas)))
+    ax.set_yticklabels(nomes_linhas)
     ax.tick_params(axis='y', labelsize=10, pad=8)  # Aumenta o espaçamento dos nomes
 
     ax.set_xlabel("Tempo de Simulação (segundos)")
-    ax.set_ylabel("Tarefas")
+    ax.set_ylabel("Tarefas" if cores_tarefas is None else "Processadores")
     ax.set_title(f"Diagrama de Gantt - {titulo}")
-    ax.set_xlim(0, max_time * 1.05 if max_time > 0 else 10)
     ax.grid(True, which='both', linestyle='--', linewidth=0.5, axis='x')
+    fig.tight_layout()
+    return ax, colecoes
+
 
-    # Ajusta o layout e salva o gráfico
-    plt.tight_layout()
-    fig.savefig(f"gantt_{escalonador.__class__.__name__}.png", dpi=300)
-    plt.tight_layout()
+def _retangulos(barras, linha):
+    base, topo = linha - ALTURA_BARRA / 2, linha + ALTURA_BARRA / 2
+    return [[(x, base), (x, topo), (x + w, topo), (x + w, base)] for x, w in barras]
 
+
+def exportar_png_assincrono(nome_arquivo, nomes_linhas, bursts, titulo, max_time, figsize, dpi=300,
+                            cores_tarefas=None):
+    """
+    Gera o PNG em alta resolução numa thread separada, com uma figura própria
+    (sem pyplot), para não travar a interface. Devolve a thread iniciada.
+    """
+    def exportar():
+        fig = Figure(figsize=figsize)
+        FigureCanvasAgg(fig)
+        desenhar_gantt(fig, nomes_linhas, bursts, titulo, max_time, largura_pixels=figsize[0] * dpi,
+                       cores_tarefas=cores_tarefas)
+        fig.savefig(nome_arquivo, dpi=dpi)
+
+    thread = threading.Thread(target=exportar, daemon=True)
+    thread.start()
+    return thread
+
+
+def simular(escalonador: EscalonadorCAV, salvar_csv: bool = True, cache=None):
+    """
+    Executa a simulação e registra as métricas. Não usa o Tk: pode rodar em outra thread.
+    Com 'cache' (ver cache_resultados.CacheResultados), reaproveita um resultado
+    já calculado; devolve a chave do resultado (None sem cache).
+    """
+    if cache is None:
+        chave = None
+        escalonador.escalonar()
+    else:
+        chave = cache.chave(escalonador)
+        cache.escalonar(escalonador)
+    escalonador.calcular_e_exibir_metricas()
+    nome_csv = f"resultados_{escalonador.__class__.__name__}.csv"
+    if salvar_csv and _precisa_gravar(nome_csv, chave):
+        escalonador.salvar_metricas_csv(nome_csv)
+    return chave
+
+
+def visualizar_gantt(parent_window, escalonador: EscalonadorCAV, titulo: str, salvar_csv: bool = True,
+                     exportar_png: bool = True):
+    """
+    Executa um escalonador, exibe os resultados e desenha o gráfico de Gantt.
+    """
+    simular(escalonador, salvar_csv)
+    exibir_gantt(parent_window, escalonador, titulo, exportar_png)
+
+
+def exibir_gantt(parent_window, escalonador: EscalonadorCAV, titulo: str, exportar_png: bool = True, chave=None):
+    """
+    Desenha o Gantt de uma simulação já executada (deve rodar na thread do Tk).
+    Com a 'chave' devolvida por simular(), o PNG só é refeito se mudou.
+    """
+    # Cria a janela de visualização
+    janela_gantt = tk.Toplevel(parent_window)
+    janela_gantt.title(titulo)
+    janela_gantt.geometry("1000x600")
+
+    tabela = escalonador.tarefas_para_escalonar
+    max_time = max(tabela.tempo_final.max().item(), 0) if len(tabela) else 0
+    if escalonador.processadores > 1:
+        # Uma linha por processador, com as barras na cor da tarefa
+        nomes_linhas = [f"CPU {p}" for p in range(escalonador.processadores)]
+        bursts = bursts_por_processador(escalonador)
+        cores_tarefas = cm.viridis(np.linspace(0, 1, max(len(tabela), 1)))
+    else:
+        nomes_linhas = [tabela.nomes[i] for i in range(len(tabela))]
+        bursts = bursts_por_tarefa(escalonador)
+        cores_tarefas = None
+
+    # Ajusta o tamanho vertical com base no número de linhas (mínimo de 6 de altura)
+    figsize = (10, max(6, len(nomes_linhas) * 0.7))
+    fig = Figure(figsize=figsize)
     canvas = FigureCanvasTkAgg(fig, master=janela_gantt)
+    ax, colecoes = desenhar_gantt(fig, nomes_linhas, bursts, titulo, max_time, cores_tarefas=cores_tarefas)
+
+    def refazer_nivel_de_detalhe(ax):
+        # Ao dar zoom, a resolução muda: redesenha cada linha com o novo nível de detalhe
+        resolucao = _resolucao(ax)
+        for linha, (colecao, bursts_linha) in enumerate(zip(colecoes, bursts)):
+            barras, grupos = reduzir_bursts(bursts_linha, resolucao, devolver_grupos=True)
+            colecao.set_verts(_retangulos(barras, linha))
+            if cores_tarefas is not None:
+                colecao.set_facecolor(_cores_das_barras(bursts_linha, grupos, cores_tarefas))
+        canvas.draw_idle()
+
+    ax.callbacks.connect('xlim_changed', refazer_nivel_de_detalhe)
+
+    nome_png = f"gantt_{escalonador.__class__.__name__}.png"
+    if exportar_png and _precisa_gravar(nome_png, None if chave is None else (chave, titulo)):
+        exportar_png_assincrono(nome_png, nomes_linhas, bursts, titulo, max_time, figsize,
+                                cores_tarefas=cores_tarefas)
+
     canvas.draw()
-    canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=1)
\ No newline at end of file
+    NavigationToolbar2Tk(canvas, janela_gantt)  # Zoom e deslocamento
+    canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=1)